@@ -0,0 +1,124 @@
+# This source file is a part of File Find made by Pixel-Master
+#
+# Copyright 2022-2025 Pixel-Master
+#
+# This software is licensed under the "GPLv3" License as described in the "LICENSE" file,
+# which should be included with this package. The terms are also available at
+# http://www.gnu.org/licenses/gpl-3.0.html
+
+# This file contains the code for listing the members of zip and tar archives, so they can be searched like folders
+
+# Imports
+import logging
+import os
+import tarfile
+import zipfile
+from time import mktime
+
+# Separates the path of the archive from the path of the member in it, like "/deliveries/2019.zip!/report.pdf"
+ARCHIVE_SEPARATOR = "!" + os.sep
+
+# Archives, that can be listed
+ZIP_ENDINGS = (".zip",)
+TAR_ENDINGS = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+
+# The size and dates of an archive member, with the same names as os.stat_result,
+# so it can be used instead of it.
+# Archives only store the date modified, so it is also used as date created
+class MemberStat:
+    __slots__ = ("st_size", "st_mtime", "st_ctime", "st_birthtime")
+
+    def __init__(self, size: int, m_time: float):
+        self.st_size = size
+        self.st_mtime = m_time
+        self.st_ctime = m_time
+        self.st_birthtime = m_time
+
+
+# Testing if a file is an archive, that can be listed
+def is_archive(path: str) -> bool:
+    lower_path = path.lower()
+    return lower_path.endswith(ZIP_ENDINGS) or lower_path.endswith(TAR_ENDINGS)
+
+
+# Getting the archive a path is in, or the path itself if it isn't in an archive
+# Used to open or reveal archive members, as they don't exist on the disk
+def archive_of(path: str) -> str:
+    return path.partition(ARCHIVE_SEPARATOR)[0]
+
+
+# Listing all members of an archive without extracting them
+# Returns a dict with the path of every member ("archive.zip!/inner/path") and a tuple of (is_folder, MemberStat)
+# Folders, which aren't stored in the archive, but contain members are added too
+def read_members(archive_path: str) -> dict:
+    # A list of (name in the archive, is folder, size, date modified)
+    raw_members = []
+    try:
+        # Zip files are listed using the central directory at the end of the file
+        if archive_path.lower().endswith(ZIP_ENDINGS):
+            with zipfile.ZipFile(archive_path) as zip_archive:
+                for zip_info in zip_archive.infolist():
+                    try:
+                        m_time = mktime(zip_info.date_time + (0, 0, -1))
+                    except (OverflowError, ValueError):
+                        m_time = 0
+                    raw_members.append((zip_info.filename, zip_info.is_dir(), zip_info.file_size, m_time))
+
+        # Tar files have no central directory, so the headers are read as a stream,
+        # the content of the members is skipped (compressed archives still have to be decompressed)
+        else:
+            with tarfile.open(archive_path, mode="r|*") as tar_archive:
+                for tar_info in tar_archive:
+                    raw_members.append((tar_info.name, tar_info.isdir(), tar_info.size, tar_info.mtime))
+
+    # Damaged, encrypted or unreadable archives are skipped
+    except (OSError, EOFError, zipfile.BadZipFile, tarfile.TarError, NotImplementedError, RuntimeError) as error:
+        # Debug
+        logging.debug(f"Could not read archive {archive_path}: {error}")
+        return {}
+
+    # Folders, which are only implied by the paths of their members, get the date of the archive
+    try:
+        archive_m_time = os.path.getmtime(archive_path)
+    except OSError:
+        archive_m_time = 0
+
+    members = {}
+    folder_sizes = {}
+    for name, is_folder, size, m_time in raw_members:
+        # Member names always use "/" and can start with "./" in tar files
+        parts = [part for part in name.split("/") if part not in ("", ".", "..")]
+        if not parts:
+            continue
+        member_path = archive_path + ARCHIVE_SEPARATOR + os.sep.join(parts)
+
+        if is_folder:
+            members[member_path] = (True, MemberStat(0, m_time))
+        else:
+            members[member_path] = (False, MemberStat(size, m_time))
+
+        # Adding the size to all parent folders in the archive
+        for depth in range(1, len(parts)):
+            folder_path = archive_path + ARCHIVE_SEPARATOR + os.sep.join(parts[:depth])
+            folder_sizes[folder_path] = folder_sizes.get(folder_path, 0) + (0 if is_folder else size)
+
+    for folder_path, folder_size in folder_sizes.items():
+        if folder_path in members and members[folder_path][0]:
+            members[folder_path][1].st_size = folder_size
+        elif folder_path not in members:
+            members[folder_path] = (True, MemberStat(folder_size, archive_m_time))
+
+    return members
+
+
+# Converting the stats of the members to be saved with json and back
+def dump_member_stats(member_stats: dict, found_path_set: set) -> dict:
+    # Only saving paths which are also in found_path_set,
+    # as the stats could come from a cache file of a higher directory
+    return {path: [member_stat.st_size, member_stat.st_mtime]
+            for path, member_stat in member_stats.items() if path in found_path_set}
+
+
+def load_member_stats(dumped_member_stats: dict) -> dict:
+    return {path: MemberStat(*member_stat) for path, member_stat in dumped_member_stats.items()}
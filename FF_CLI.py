@@ -0,0 +1,366 @@
+# This source file is a part of File Find made by Pixel-Master
+#
+# Copyright 2022-2025 Pixel-Master
+#
+# This software is licensed under the "GPLv3" License as described in the "LICENSE" file,
+# which should be included with this package. The terms are also available at
+# http://www.gnu.org/licenses/gpl-3.0.html
+
+# This file contains the command-line interface, which searches with the cache like the user-interface
+# and writes the results to stdout, run with "File-Find.py --cli"
+
+# Imports
+import argparse
+import logging
+import os
+import re
+import socket
+import sys
+from dataclasses import asdict
+from json import dumps, load, loads, JSONDecodeError
+
+# Projects Libraries
+import FF_Content
+import FF_Engine
+import FF_Files
+import FF_Index
+import FF_Query
+
+# The sorting options of --sort
+SORT_OPTIONS = {"none": "None (fastest)", "name": "File Name", "size": "File Size", "modified": "Date Modified",
+                "created": "Date Created", "path": "Path"}
+
+# Exit codes, like grep 1 means that nothing was found
+EXIT_FOUND = 0
+EXIT_NOTHING_FOUND = 1
+EXIT_ERROR = 2
+EXIT_INTERRUPTED = 130
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="File-Find.py --cli",
+        description="Search for files with File Find, without the user-interface. "
+                    "Filters from a preset are replaced by the filters given as options.")
+    parser.add_argument("directory", nargs="?", help="the directory to search in (default: the current directory, "
+                                                     "or the directory of the preset)")
+    parser.add_argument("--filter", metavar="FILE", action="append",
+                        help="use the filters of a .FFFilter preset, given multiple times the presets are searched "
+                             "one after the other with the same scan and every result starts with the preset name")
+
+    # Basic
+    parser.add_argument("--name", help="the name, matched with --name-specifier")
+    parser.add_argument("--name-specifier", choices=FF_Engine.NAME_SPECIFIERS,
+                        type=lambda specifier: specifier if specifier.endswith(":") else f"{specifier}:",
+                        help="how the name is matched (default: contains)")
+    parser.add_argument("--consider-case", action="store_true", default=None, help="match the case of the name")
+    parser.add_argument("--similarity", type=int, help="the similarity in percent for \"is similar to\"")
+    parser.add_argument("--extension", help="file extensions, separated by semicolons (like \"pdf;docx\")")
+    parser.add_argument("--file-group", action="append", choices=FF_Files.FILE_FORMATS.keys(),
+                        help="a group of file types, can be given multiple times")
+    parser.add_argument("--query", help="a query (like \"ext:pdf AND size>10MB\")")
+
+    # Properties
+    parser.add_argument("--size-min", metavar="SIZE", help="the minimal size (like \"10MB\")")
+    parser.add_argument("--size-max", metavar="SIZE", help="the maximal size (like \"1GB\")")
+    parser.add_argument("--modified-from", metavar="DATE", help="modified on or after the date (like 2024-01-31)")
+    parser.add_argument("--modified-to", metavar="DATE", help="modified on or before the date")
+    parser.add_argument("--created-from", metavar="DATE", help="created on or after the date")
+    parser.add_argument("--created-to", metavar="DATE", help="created on or before the date")
+
+    # Advanced
+    parser.add_argument("--contains", help="the content of the files")
+    parser.add_argument("--contains-mode", choices=FF_Content.CONTENT_MODES, help="how the content is matched")
+    parser.add_argument("--contains-binary", action="store_true", default=None,
+                        help="also search in the content of binary files")
+    search_for = parser.add_mutually_exclusive_group()
+    search_for.add_argument("--only-files", action="store_const", dest="search_for", const="only Files")
+    search_for.add_argument("--only-folders", action="store_const", dest="search_for", const="only Folders")
+    parser.add_argument("--system-files", action="store_true", default=None, help="also search in system files")
+    depth = parser.add_mutually_exclusive_group()
+    depth.add_argument("--depth", type=int, help="the number of subfolders to search in")
+    depth.add_argument("--no-subfolders", action="store_true", help="don't search in subfolders")
+
+    # Results
+    parser.add_argument("--sort", choices=SORT_OPTIONS.keys(), help="sort the results, which are only written "
+                                                                    "after the search finished")
+    parser.add_argument("--reverse", action="store_true", default=None, help="reverse the results")
+    parser.add_argument("--limit", type=int, help="only write the first results")
+    parser.add_argument("--format", choices=("paths", "jsonl"), default="paths",
+                        help="write one path per line, or one JSON object per line with the path, type, size "
+                             "and date modified, the size of folders only with --sort size (default: paths)")
+
+    # Query server
+    parser.add_argument("--use-server", nargs="?", const=FF_Files.SERVER_SOCKET, metavar="SOCKET",
+                        help="search with the running query server (File-Find.py --server), which keeps the cache in "
+                             "memory, searches without it if it isn't running")
+
+    # Cache
+    cache = parser.add_mutually_exclusive_group()
+    cache.add_argument("--rebuild-cache", action="store_true", help="scan again and replace the cache")
+    cache.add_argument("--no-cache", action="store_true", help="scan again without using or saving the cache")
+
+    parser.add_argument("--verbose", action="store_true", help="log the progress to stderr")
+    return parser
+
+
+# Creating the query from a preset and the options
+def create_query(arguments: argparse.Namespace, filter_path: str | None = None) -> FF_Engine.SearchQuery:
+    if filter_path is not None:
+        try:
+            with open(filter_path) as filter_file:
+                query_fields = FF_Engine.query_fields_from_filter(load(filter_file))
+        except (OSError, JSONDecodeError) as filter_error:
+            # Debug
+            logging.error(f"Filter Error! Could not read {filter_path}: {filter_error}")
+            raise FF_Engine.QueryError("Filter Error!", f"Could not read {filter_path}: {filter_error}")
+    else:
+        query_fields = {"search_from": os.getcwd()}
+
+    # Options which weren't given are None
+    options = {"name": arguments.name,
+               "name_specifier": arguments.name_specifier,
+               "consider_case": arguments.consider_case,
+               "similarity": arguments.similarity,
+               "query": arguments.query,
+               "content": arguments.contains,
+               "content_mode": arguments.contains_mode,
+               "content_binary": arguments.contains_binary,
+               "search_for": arguments.search_for,
+               "library": arguments.system_files,
+               "reverse_sort": arguments.reverse,
+               "result_limit": arguments.limit}
+    if arguments.directory is not None:
+        options["search_from"] = os.path.abspath(arguments.directory)
+    if arguments.extension is not None:
+        options["file_type_mode"] = "custom"
+        options["filetype"] = arguments.extension
+    elif arguments.file_group is not None:
+        options["file_type_mode"] = "predefined"
+        options["file_group"] = arguments.file_group
+    if arguments.depth is not None:
+        options["folder_depth"] = "Custom"
+        options["folder_depth_custom"] = arguments.depth
+    elif arguments.no_subfolders:
+        options["folder_depth"] = "No subfolders"
+    if arguments.sort is not None:
+        options["sort_by"] = SORT_OPTIONS[arguments.sort]
+
+    try:
+        for size_limit in ("min", "max"):
+            size = getattr(arguments, f"size_{size_limit}")
+            if size is not None:
+                options[f"file_size_{size_limit}"] = FF_Query.parse_size(size)
+
+        # A date covers the whole day
+        for date_type, argument_name in (("c_date", "created"), ("m_date", "modified")):
+            date_from = getattr(arguments, f"{argument_name}_from")
+            date_to = getattr(arguments, f"{argument_name}_to")
+            if date_from is not None:
+                options[f"{date_type}_from"] = FF_Query.parse_date(date_from)[0]
+            if date_to is not None:
+                options[f"{date_type}_to"] = FF_Query.parse_date(date_to)[1]
+    except FF_Query.QuerySyntaxError as option_error:
+        # Debug
+        logging.error(f"Option Error! {option_error}")
+        raise FF_Engine.QueryError("Option Error!", str(option_error))
+
+    query_fields.update({field: value for field, value in options.items() if value is not None})
+
+    return FF_Engine.SearchQuery(
+        **query_fields,
+        new_cache_file=arguments.rebuild_cache,
+        save_cache=not arguments.no_cache,
+        excluded_files=FF_Files.load_setting("excluded_files"),
+        use_ignore_files=FF_Files.load_setting("use_ignore_files"),
+        search_in_archives=FF_Files.load_setting("search_in_archives"),
+        content_index=FF_Files.load_setting("content_index"))
+
+
+# Writing results to stdout or another text file, with the values of the paths if the output is JSON
+class ResultWriter:
+    # With a label (the name of the preset in a batch), every result starts with it
+    def __init__(self, output_format: str, output=None, label: str | None = None):
+        self.output_format = output_format
+        self.output = output if output is not None else sys.stdout
+        self.label = label
+        # Paths written while scanning, they aren't written again
+        self.written_paths = set()
+
+    # Writing the results found while scanning, they are all on the disk
+    def write_streamed(self, paths: list):
+        for path in paths:
+            self.write(path, os.path.isdir(path), FF_Index.read_range_values)
+        self.output.flush()
+
+    # Writing the results of the finished search, which weren't written yet
+    def write_result(self, search_result: FF_Engine.SearchResult):
+        paths = [path for path in search_result.found_path_list if path not in self.written_paths]
+        if self.output_format == "jsonl":
+            # Taking the values from the range indexes of the search or the cache file, archive members are only there
+            search_result.key_cache.read_missing(paths)
+        for path in paths:
+            self.write(path, path in search_result.folders, search_result.key_cache.get_values,
+                       search_result.key_cache.calculated_sizes)
+        self.output.flush()
+
+    # Writing a result sent by the query server, which sends the values of every path
+    def write_response(self, response: dict):
+        self.written_paths.add(response["path"])
+        if self.output_format == "paths":
+            self.write_line(response["path"])
+        else:
+            self.write_line(response)
+
+    # calculated_sizes are the sizes of folders, which were added up for sorting (see FF_SortKeys.SortKeyCache)
+    def write(self, path: str, is_folder: bool, get_values, calculated_sizes: dict | None = None):
+        self.written_paths.add(path)
+        if self.output_format == "paths":
+            self.write_line(path)
+        else:
+            size, m_time, c_time = get_values(path)
+            # The size of folders isn't known without adding up all files in them,
+            # so it's only written if the results were sorted by it
+            if size < 0 and calculated_sizes is not None:
+                size = calculated_sizes.get(path, size)
+            self.write_line({"path": path,
+                             "type": "folder" if is_folder else "file",
+                             "size": int(size) if size >= 0 else None,
+                             "mtime": m_time if m_time != FF_Index.MISSING_VALUE else None})
+
+    # Writing a path (separated from the label with a tab) or the values of a path as JSON
+    def write_line(self, result: str | dict):
+        if self.output_format == "paths":
+            print(result if self.label is None else f"{self.label}\t{result}", file=self.output)
+        else:
+            print(dumps(result if self.label is None else {"preset": self.label, **result}), file=self.output)
+
+
+# Results are written while scanning, if their order doesn't matter
+def is_unordered(search_query: FF_Engine.SearchQuery) -> bool:
+    return search_query.sort_by == "None (fastest)" and not search_query.reverse_sort and not search_query.result_limit
+
+
+# Sending the query to the query server (see FF_Server) and writing the results it sends.
+# Returns False if the server isn't running, raises QueryError if the server couldn't search
+def search_with_server(search_query: FF_Engine.SearchQuery, result_writer: ResultWriter, socket_path: str) -> bool:
+    # Unix sockets aren't available on every platform
+    if not hasattr(socket, "AF_UNIX"):
+        return False
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path)
+    except OSError as connection_error:
+        client.close()
+        # Debug
+        logging.info(f"The query server isn't running, searching without it: {connection_error}")
+        return False
+
+    with client, client.makefile("rw", encoding="utf-8") as connection:
+        connection.write(dumps({"options": asdict(search_query)}) + "\n")
+        connection.flush()
+
+        for line in connection:
+            response = loads(line)
+            if "path" in response:
+                result_writer.write_response(response)
+            elif response["status"] == "finished":
+                # Debug
+                logging.info(f"The query server found {response['found']} results in "
+                             f"{round(response['time']['time_total'], 3)}s")
+                result_writer.output.flush()
+                return True
+            else:
+                # Debug
+                logging.error(f"{response['title']} {response['message']}")
+                raise FF_Engine.QueryError(response["title"], response["message"])
+
+    # Debug
+    logging.error("Server Error! The query server stopped before the search finished")
+    raise FF_Engine.QueryError("Server Error!", "The query server stopped before the search finished")
+
+
+# Searching with every preset of --filter, the presets are searched with the same scan
+# and their results are written one preset after the other. Returns the exit code
+def batch_search(arguments: argparse.Namespace) -> int:
+    result_writers = {}
+    try:
+        queries = {}
+        for filter_path in arguments.filter:
+            # The name of the preset, or the path if two presets have the same name
+            preset_name = os.path.splitext(os.path.basename(filter_path))[0]
+            if preset_name in queries:
+                preset_name = filter_path
+            queries[preset_name] = create_query(arguments, filter_path)
+
+        for preset_name, search_result in FF_Engine.BatchSearch(queries).run().items():
+            result_writers[preset_name] = ResultWriter(arguments.format, label=preset_name)
+            result_writers[preset_name].write_result(search_result)
+
+    # The error was already logged
+    except FF_Engine.QueryError:
+        return EXIT_ERROR
+
+    except KeyboardInterrupt:
+        return EXIT_INTERRUPTED
+
+    except BrokenPipeError:
+        # The reader of stdout (like "head") stopped, redirecting stdout so Python doesn't fail while closing it
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return EXIT_FOUND
+
+    # The search failed, without a traceback, so it isn't mistaken for finding nothing
+    except (re.error, OSError) as search_error:
+        # Debug
+        logging.error(f"Search Error! {search_error}")
+        return EXIT_ERROR
+
+    return EXIT_FOUND if any(result_writer.written_paths for result_writer in result_writers.values()) \
+        else EXIT_NOTHING_FOUND
+
+
+# Running a search from the command-line, returns the exit code
+def main(argv: list) -> int:
+    arguments = create_parser().parse_args(argv)
+
+    # Logging to stderr, so stdout only contains the results
+    logging.basicConfig(level=logging.INFO if arguments.verbose else logging.WARNING,
+                        format="File Find: %(levelname)s: %(message)s", stream=sys.stderr, force=True)
+
+    # File Operation
+    FF_Files.setup()
+    FF_Files.cache_test(is_launching=False)
+
+    # Searching with multiple presets
+    if arguments.filter is not None and len(arguments.filter) > 1:
+        return batch_search(arguments)
+
+    result_writer = ResultWriter(arguments.format)
+    try:
+        search_query = create_query(arguments, arguments.filter[0] if arguments.filter is not None else None)
+
+        if arguments.use_server is None or not search_with_server(search_query, result_writer, arguments.use_server):
+            stream = result_writer.write_streamed if is_unordered(search_query) else None
+
+            # With a result limit, the search only returns the first results
+            result_writer.write_result(FF_Engine.SearchEngine(search_query, stream=stream).run())
+
+    # The error was already logged
+    except FF_Engine.QueryError:
+        return EXIT_ERROR
+
+    except KeyboardInterrupt:
+        return EXIT_INTERRUPTED
+
+    except BrokenPipeError:
+        # The reader of stdout (like "head") stopped, redirecting stdout so Python doesn't fail while closing it
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return EXIT_FOUND
+
+    # The search failed, without a traceback, so it isn't mistaken for finding nothing
+    except (re.error, OSError) as search_error:
+        # Debug
+        logging.error(f"Search Error! {search_error}")
+        return EXIT_ERROR
+
+    return EXIT_FOUND if result_writer.written_paths else EXIT_NOTHING_FOUND
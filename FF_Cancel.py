@@ -0,0 +1,45 @@
+# This source file is a part of File Find made by Pixel-Master
+#
+# Copyright 2022-2025 Pixel-Master
+#
+# This software is licensed under the "GPLv3" License as described in the "LICENSE" file,
+# which should be included with this package. The terms are also available at
+# http://www.gnu.org/licenses/gpl-3.0.html
+
+# This file contains the cancellation of searches, duplicated files and compares, which run in their own thread
+
+# Imports
+import threading
+
+# The number of items between two checks in CancelToken.check_iter()
+CHECK_INTERVAL = 1000
+
+
+# Raised by CancelToken.check() in the thread, after the user cancelled it
+class SearchCancelled(Exception):
+    pass
+
+
+# Shared by the thread and the UI, the thread checks it regularly and stops if it was cancelled
+class CancelToken:
+    def __init__(self):
+        self.event = threading.Event()
+
+    # Called from the UI
+    def cancel(self):
+        self.event.set()
+
+    def is_cancelled(self) -> bool:
+        return self.event.is_set()
+
+    # Stopping the thread, by raising SearchCancelled if it was cancelled
+    def check(self):
+        if self.event.is_set():
+            raise SearchCancelled
+
+    # Going through items, checking the token every CHECK_INTERVAL items
+    def check_iter(self, items):
+        for item_number, item in enumerate(items):
+            if item_number % CHECK_INTERVAL == 0:
+                self.check()
+            yield item
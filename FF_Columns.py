@@ -0,0 +1,73 @@
+# This source file is a part of File Find made by Pixel-Master
+#
+# Copyright 2022-2025 Pixel-Master
+#
+# This software is licensed under the "GPLv3" License as described in the "LICENSE" file,
+# which should be included with this package. The terms are also available at
+# http://www.gnu.org/licenses/gpl-3.0.html
+
+# This file contains the optional fast path for filtering with NumPy, which is only used if NumPy is installed
+
+# Imports
+import logging
+
+# NumPy isn't a dependency of File Find, without it the filters are evaluated one path at a time
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# Testing if the columns can be used
+def numpy_available() -> bool:
+    return numpy is not None
+
+
+# The values of all paths as NumPy arrays (columns), in the order of the list of paths.
+# Filters are evaluated on whole columns at once, which results in a boolean array (mask)
+class ColumnTable:
+    def __init__(self, path_list: list, range_indexes: dict, type_dict: dict):
+        self.path_list = path_list
+        path_count = len(path_list)
+
+        # The range indexes are sorted, so the values are put back at the position of their path.
+        # The arrays of the range indexes can be used by NumPy without copying them
+        self.columns = {}
+        for field, range_index in range_indexes.items():
+            column = numpy.empty(path_count, dtype=numpy.float64)
+            column[numpy.frombuffer(range_index.order, dtype=numpy.int64)] = numpy.frombuffer(
+                range_index.sorted_values, dtype=numpy.float64)
+            self.columns[field] = column
+
+        # Paths, which aren't in type_dict anymore (outside the searched directory), count as files,
+        # they aren't in the found files anyway
+        self.is_folder = numpy.fromiter(
+            (type_dict.get(path) == "folder" for path in path_list), dtype=numpy.bool_, count=path_count)
+
+        # Debug
+        logging.debug(f"Created columns for {path_count} paths")
+
+    # Getting all paths, which match all given filters, ranges are tuples of (lower, upper) including both
+    # Folders always match the size range, if their size isn't in the size index (see FF_Index.read_range_values()),
+    # as their size needs to be calculated separately
+    def filter(self, c_time_range=None, m_time_range=None, size_range=None, search_for=None) -> list:
+        mask = numpy.ones(len(self.path_list), dtype=numpy.bool_)
+
+        for field, value_range in (("c_time", c_time_range), ("m_time", m_time_range)):
+            if value_range is not None:
+                mask &= self.columns[field] >= value_range[0]
+                mask &= self.columns[field] <= value_range[1]
+
+        if size_range is not None:
+            size_column = self.columns["size"]
+            size_mask = (size_column >= size_range[0]) & (size_column <= size_range[1])
+            size_mask |= self.is_folder & (size_column < 0)
+            mask &= size_mask
+
+        if search_for == "only Files":
+            mask &= ~self.is_folder
+        elif search_for == "only Folders":
+            mask &= self.is_folder
+
+        # Only the matching paths are looked up
+        return [self.path_list[path_id] for path_id in numpy.flatnonzero(mask).tolist()]
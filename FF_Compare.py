@@ -17,16 +17,18 @@ import gc
 
 # PySide6 Gui Imports
 from PySide6.QtGui import Qt
-from PySide6.QtCore import QObject, Signal, QThreadPool
+from PySide6.QtCore import QObject, Signal
 from PySide6.QtWidgets import (
     QMainWindow, QFileDialog, QListWidget, QLabel, QWidget, QGridLayout, QHBoxLayout, QScrollArea,
     QSpacerItem, QSizePolicy)
 
 # Projects Libraries
 import FF_Additional_UI
+import FF_Cancel
 import FF_Files
 import FF_Main_UI
 import FF_Menubar
+import FF_Scheduler
 import FF_Search
 
 
@@ -313,16 +315,15 @@ class CompareSearches:
         try:
             # Setting the thread up with the Qt6 signals to launch the ui
             class SignalsClass(QObject):
+                started = Signal()
                 finished = Signal()
+                cancelled = Signal()
 
             self.signals = SignalsClass()
             # Connecting the signal to the user-interface class
             self.signals.finished.connect(
                 lambda: CompareUi(path_of_first_search, cache_file, to_be_marked_files, parent))
 
-            # Thread
-            comparing_thread = QThreadPool(parent)
-
             # Get the files of both searches
             self.files_of_first_search = files_of_first_search
             logging.debug("Asking for a second File Find Search file...")
@@ -333,12 +334,17 @@ class CompareSearches:
             # Update search status label
             FF_Search.ACTIVE_SEARCH_THREADS += 1
             FF_Main_UI.MainWindow.update_search_status_label()
+            # Checked while comparing, cancelled with the "Cancel" action of the ui logger
+            self.cancel_token = FF_Cancel.CancelToken()
             # Initialising the ui logger
-            self.ui_logger = FF_Main_UI.SearchUpdate(f"{path_of_first_search} and {self.path_of_second_search[0]}")
+            self.ui_logger = FF_Main_UI.SearchUpdate(
+                f"{path_of_first_search} and {self.path_of_second_search[0]}", self.cancel_token)
             # Update the logger
             self.ui_logger.update("Comparing searches...")
             # Closing the menu bar logger when finished
             self.signals.finished.connect(self.ui_logger.close)
+            self.signals.cancelled.connect(self.comparing_cancelled)
+            self.signals.started.connect(lambda: self.ui_logger.update("Comparing searches..."))
             # Saving time
             self.time_dict = {"start_time": perf_counter()}
 
@@ -348,12 +354,36 @@ class CompareSearches:
 
             # Starting the thread
             logging.debug("Starting thread...")
-            comparing_thread.start(self.compare)
+            if not FF_Scheduler.SCHEDULER.submit(
+                    f"Comparing {path_of_first_search}", self.compare_cancellable, path_of_first_search,
+                    FF_Scheduler.PRIORITY_INTERACTIVE):
+                self.ui_logger.update("Waiting for other searches on the same drive...")
         except (TypeError, UserWarning):
             # If no file was selected
             logging.info("No file was selected, when comparing files")
             pass
 
+    # Running compare(), which stops with FF_Cancel.SearchCancelled if it was cancelled
+    def compare_cancellable(self):
+        self.signals.started.emit()
+        compared = False
+        try:
+            self.compare()
+            compared = True
+        except FF_Cancel.SearchCancelled:
+            # Debug
+            logging.info("Comparing was cancelled!")
+        finally:
+            # Closing the ui logger and updating the thread count, also if comparing failed
+            if not compared:
+                self.signals.cancelled.emit()
+
+    # Closing the ui logger and updating the search status label
+    def comparing_cancelled(self):
+        self.ui_logger.close()
+        FF_Search.ACTIVE_SEARCH_THREADS -= 1
+        FF_Main_UI.MainWindow.update_search_status_label()
+
     def compare(self):
         # Debug
         logging.debug("Comparing searches, finding differences...")
@@ -362,11 +392,11 @@ class CompareSearches:
         first_search_files_set = set(self.files_of_first_search)
         second_search_files_set = set(self.files_of_second_search)
 
-        for file_in_first_search in self.files_of_first_search:
+        for file_in_first_search in self.cancel_token.check_iter(self.files_of_first_search):
             if not (file_in_first_search in second_search_files_set):
                 self.files_only_in_first_search.append(file_in_first_search)
 
-        for file_in_second_search in self.files_of_second_search:
+        for file_in_second_search in self.cancel_token.check_iter(self.files_of_second_search):
             if not (file_in_second_search in first_search_files_set):
                 self.files_only_in_second_search.append(file_in_second_search)
 
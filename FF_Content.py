@@ -0,0 +1,467 @@
+# This source file is a part of File Find made by Pixel-Master
+#
+# Copyright 2022-2025 Pixel-Master
+#
+# This software is licensed under the "GPLv3" License as described in the "LICENSE" file,
+# which should be included with this package. The terms are also available at
+# http://www.gnu.org/licenses/gpl-3.0.html
+
+# This file contains the code for searching in the content of files
+
+# Imports
+import logging
+import mmap
+import os
+import re
+import stat
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from json import dump, load
+from multiprocessing import get_context
+
+# Only the first 256 MB of a file are searched
+MAX_READ_SIZE = 256 * 1024 * 1024
+# Files smaller than this are read directly, because mapping them takes longer than reading them
+MMAP_MIN_SIZE = 64 * 1024
+# Multiple processes are only used for many files, because starting them takes some time
+PARALLEL_MIN_FILES = 500
+# The number of files sent to a process at once
+PARALLEL_CHUNK_SIZE = 64
+# The first 8 KB of a file are used to test if it is a binary file
+SNIFF_SIZE = 8 * 1024
+
+# Byte order marks of text files, which contain NUL bytes
+TEXT_BOMS = (b"\xff\xfe", b"\xfe\xff", b"\x00\x00\xfe\xff")
+# Signatures at the beginning of common binary files (images, videos, audio, archives, executables, documents)
+BINARY_SIGNATURES = (
+    b"\x89PNG", b"\xff\xd8\xff", b"GIF87a", b"GIF89a", b"II*\x00", b"MM\x00*", b"8BPS",
+    b"RIFF", b"OggS", b"fLaC", b"\x1a\x45\xdf\xa3", b"\x00\x00\x01\xba", b"\x00\x00\x01\xb3",
+    b"PK\x03\x04", b"PK\x05\x06", b"\x1f\x8b", b"7z\xbc\xaf\x27\x1c", b"Rar!\x1a\x07", b"\xfd7zXZ\x00",
+    b"\x28\xb5\x2f\xfd", b"\x7fELF", b"\xcf\xfa\xed\xfe", b"\xce\xfa\xed\xfe", b"\xca\xfe\xba\xbe",
+    b"%PDF", b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", b"SQLite format 3\x00", b"wOFF", b"wOF2")
+
+# The search modes for the content
+CONTENT_MODE_TEXT = "Text"
+CONTENT_MODE_IGNORE_CASE = "Text (ignore case)"
+CONTENT_MODE_REGEX = "RegEx"
+CONTENT_MODES = (CONTENT_MODE_TEXT, CONTENT_MODE_IGNORE_CASE, CONTENT_MODE_REGEX)
+
+# The number of bytes before and after a match saved to be displayed in the results
+SNIPPET_LENGTH = 80
+# New lines before a match are counted in chunks of 4 MB
+LINE_COUNT_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Encodings searched in files without a byte order mark
+DEFAULT_ENCODINGS = ("utf-8", "latin-1")
+# Byte order marks and the encoding they stand for
+ENCODING_BOMS = ((b"\xef\xbb\xbf", "utf-8"), (b"\xff\xfe", "utf-16-le"), (b"\xfe\xff", "utf-16-be"))
+# Encodings in which every character takes at least two bytes
+UTF_16_ENCODINGS = ("utf-16-le", "utf-16-be")
+
+# Words saved in the content index, non-ASCII characters are treated like spaces
+TOKEN_REGEX = re.compile(rb"[A-Za-z0-9_]+")
+TOKEN_TEXT_REGEX = re.compile(r"[A-Za-z0-9_]+")
+
+
+# Returns the length of the byte order mark and the encodings to search a file in, from the beginning of the file
+def detect_encodings(head: bytes):
+    # UTF-32 isn't supported, so its byte order mark (which starts like the one of UTF-16-LE) is ignored
+    if not head.startswith(b"\xff\xfe\x00\x00"):
+        for bom, encoding in ENCODING_BOMS:
+            if head.startswith(bom):
+                return len(bom), (encoding,)
+    return 0, DEFAULT_ENCODINGS
+
+
+# Testing if the beginning of a file belongs to a binary file
+def is_binary(head: bytes) -> bool:
+    # UTF-16 and UTF-32 text files contain NUL bytes
+    if head.startswith(TEXT_BOMS):
+        return False
+    # Known file formats
+    if head.startswith(BINARY_SIGNATURES) or head[4:8] == b"ftyp":
+        return True
+    # Text files never contain NUL bytes
+    return b"\x00" in head
+
+
+# The text and the RegEx used for the content search, encoded once for every encoding
+# Can be sent to other processes, as compiled RegEx patterns can be pickled
+class ContentMatcher:
+    def __init__(self, content: str, mode: str = CONTENT_MODE_TEXT):
+        if mode not in CONTENT_MODES:
+            raise ValueError(f"Unknown content search mode: {mode}")
+        self.mode = mode
+
+        # For every encoding the bytes to search for, a RegEx for bytes or (for RegEx in UTF-16) a RegEx for text
+        self.needles: dict = {}
+        self.patterns: dict = {}
+        self.text_patterns: dict = {}
+
+        for encoding in DEFAULT_ENCODINGS + UTF_16_ENCODINGS:
+            # Searching for the encoded text, so the files don't need to be decoded
+            try:
+                needle = content.encode(encoding)
+            except UnicodeEncodeError:
+                # Can't be in a file with this encoding, for example "€" in Latin-1
+                continue
+
+            if mode == CONTENT_MODE_TEXT:
+                self.needles[encoding] = needle
+            elif mode == CONTENT_MODE_IGNORE_CASE:
+                self.patterns[encoding] = re.compile(re.escape(needle), re.IGNORECASE)
+            # A RegEx can only be encoded, if every character takes one byte,
+            # UTF-16 files are decoded instead. Raises re.error for an invalid pattern
+            elif encoding in UTF_16_ENCODINGS:
+                self.text_patterns[encoding] = re.compile(content)
+            else:
+                self.patterns[encoding] = re.compile(needle)
+
+        # Files smaller than the smallest encoded needle can't contain it
+        if mode == CONTENT_MODE_REGEX:
+            self.min_size = 0
+        else:
+            self.min_size = min(len(content.encode(encoding, errors="ignore")) for encoding in DEFAULT_ENCODINGS)
+
+    # Returns the start and end of the first match in buffer[start:end] or None
+    # Works with bytes and memory-mapped files
+    def find(self, buffer, start: int, end: int, encoding: str):
+        # Decoding for a RegEx in UTF-16 and converting the position back to bytes
+        if encoding in self.text_patterns:
+            text = bytes(buffer[start:end]).decode(encoding, errors="replace")
+            match = self.text_patterns[encoding].search(text)
+            if match is None:
+                return None
+            match_start = start + len(text[:match.start()].encode(encoding))
+            return match_start, match_start + len(match.group().encode(encoding))
+
+        position = start
+        while True:
+            if encoding in self.needles:
+                match_start = buffer.find(self.needles[encoding], position, end)
+                if match_start == -1:
+                    return None
+                span = match_start, match_start + len(self.needles[encoding])
+            elif encoding in self.patterns:
+                match = self.patterns[encoding].search(buffer, position, end)
+                if match is None:
+                    return None
+                span = match.span()
+            else:
+                return None
+
+            # In UTF-16 a match must start at the beginning of a character, which takes two bytes,
+            # else searching again from the next character
+            if encoding not in UTF_16_ENCODINGS or (span[0] - start) % 2 == 0:
+                return span
+            position = span[0] + 1
+
+    # Returns the first match and the encoding it was found in, or None
+    def find_any(self, buffer, start: int, end: int, encodings):
+        first_match = None
+        for encoding in encodings:
+            # The same bytes as in UTF-8, for example only ASCII characters
+            if (encoding != "utf-8" and encoding in self.needles and
+                    self.needles[encoding] == self.needles.get("utf-8")):
+                continue
+            match = self.find(buffer, start, end, encoding)
+            if match is not None and (first_match is None or match[0] < first_match[0][0]):
+                first_match = (match, encoding)
+        return first_match
+
+
+# Getting the line number and the text around a match, so it can be displayed without reading the file again
+def describe_match(buffer, match_start: int, match_end: int, encoding: str = "utf-8") -> list:
+    new_line = "\n".encode(encoding)
+
+    # Counting the new lines before the match in chunks, so a large file isn't copied at once
+    line = 1
+    for chunk_start in range(0, match_start, LINE_COUNT_CHUNK_SIZE):
+        line += buffer[chunk_start:min(chunk_start + LINE_COUNT_CHUNK_SIZE, match_start)].count(new_line)
+
+    # The line of the match, shortened for very long lines
+    snippet_start = max(buffer.rfind(new_line, max(0, match_start - SNIPPET_LENGTH), match_start) + len(new_line),
+                        match_start - SNIPPET_LENGTH)
+    snippet_end = buffer.find(new_line, match_end, match_end + SNIPPET_LENGTH)
+    if snippet_end == -1:
+        snippet_end = min(match_end + SNIPPET_LENGTH, len(buffer))
+    snippet_bytes = buffer[snippet_start:snippet_end]
+    # Files without a byte order mark can be Latin-1 even if the match was found with the UTF-8 form
+    if encoding == "utf-8":
+        try:
+            snippet = snippet_bytes.decode(encoding)
+        except UnicodeDecodeError:
+            snippet = snippet_bytes.decode("latin-1")
+    else:
+        snippet = snippet_bytes.decode(encoding, errors="replace")
+    snippet = snippet.strip().strip("\ufeff")
+
+    return [match_start, line, snippet]
+
+
+# Searching for the first match of matcher in a file
+# Returns [offset, line number, text of the line] or None for no match, folders and files that can't be read
+# Binary files are skipped, unless search_binary is True
+# Can't be a method, because it needs to be sent to other processes
+def find_in_file(path: str, matcher: ContentMatcher, max_read_size: int = MAX_READ_SIZE,
+                 search_binary: bool = False):
+    try:
+        # Skipping folders and special files like pipes, which would block while reading
+        file_stat = os.stat(path)
+        if not stat.S_ISREG(file_stat.st_mode) or file_stat.st_size < matcher.min_size:
+            return None
+        read_size = min(file_stat.st_size, max_read_size)
+
+        with open(path, "rb") as opened_file:
+            # Reading the beginning of the file only once, to test if it's binary and to search in it
+            head = opened_file.read(min(SNIFF_SIZE, read_size))
+            if not search_binary and is_binary(head):
+                return None
+
+            # Which encodings to search in, decided by the byte order mark
+            bom_length, encodings = detect_encodings(head)
+
+            # Small files are read directly, if the whole file was read already using head
+            if read_size < MMAP_MIN_SIZE:
+                if read_size > len(head):
+                    head += opened_file.read(read_size - len(head))
+                match = matcher.find_any(head, bom_length, read_size, encodings)
+                if match is None:
+                    return None
+                return describe_match(head, *match[0], match[1])
+
+            # Large files are mapped into memory, so only the needed parts are loaded by the OS.
+            # The search runs over the whole mapping, so there are no chunk borders at which a match could be missed
+            with mmap.mmap(opened_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                match = matcher.find_any(mapped_file, bom_length, read_size, encodings)
+                if match is None:
+                    return None
+                return describe_match(mapped_file, *match[0], match[1])
+
+    # ValueError is raised by mmap, if the file was emptied in the meantime
+    except (OSError, ValueError):
+        return None
+
+
+# Returning a dict of all paths, which contain a match, with [offset, line number, text of the line]
+# The cancel_token (see FF_Cancel.CancelToken) is checked after every file
+def search_files(paths, matcher: ContentMatcher, max_read_size: int = MAX_READ_SIZE,
+                 search_binary: bool = False, cancel_token=None) -> dict:
+    paths = list(paths)
+    check_file = partial(find_in_file, matcher=matcher, max_read_size=max_read_size, search_binary=search_binary)
+
+    # For many files using one process per CPU core
+    if len(paths) >= PARALLEL_MIN_FILES and (os.cpu_count() or 1) > 1:
+        # Debug
+        logging.debug(f"Searching the content of {len(paths)} files with {os.cpu_count()} processes")
+
+        # Using "spawn" on every platform, as forking a process with running threads isn't safe
+        with ProcessPoolExecutor(mp_context=get_context("spawn")) as process_pool:
+            results = map_cancellable(process_pool, check_file, paths, cancel_token)
+            return {path: match for path, match in zip(paths, results) if match is not None}
+
+    content_matches = {}
+    for path in paths:
+        if cancel_token is not None:
+            cancel_token.check()
+        match = check_file(path)
+        if match is not None:
+            content_matches[path] = match
+    return content_matches
+
+
+# Running function on all paths in a process pool, like process_pool.map().
+# If the cancel_token is cancelled, the remaining chunks aren't started and FF_Cancel.SearchCancelled is raised
+def map_cancellable(process_pool: ProcessPoolExecutor, function, paths: list, cancel_token=None):
+    results = process_pool.map(function, paths, chunksize=PARALLEL_CHUNK_SIZE)
+    if cancel_token is None:
+        return results
+
+    checked_results = []
+    for result in results:
+        if cancel_token.is_cancelled():
+            process_pool.shutdown(wait=False, cancel_futures=True)
+            cancel_token.check()
+        checked_results.append(result)
+    return checked_results
+
+
+# Reading all words of a file for the content index
+# Returns (size, modification time, is binary, words) or None if the file can't be read
+# Can't be a method, because it needs to be sent to other processes
+def read_file_tokens(path: str, max_read_size: int = MAX_READ_SIZE):
+    try:
+        file_stat = os.stat(path)
+        if not stat.S_ISREG(file_stat.st_mode):
+            return None
+        read_size = min(file_stat.st_size, max_read_size)
+
+        with open(path, "rb") as opened_file:
+            head = opened_file.read(min(SNIFF_SIZE, read_size))
+            # The words of binary files aren't saved
+            if is_binary(head):
+                return file_stat.st_size, file_stat.st_mtime_ns, True, []
+
+            bom_length, encodings = detect_encodings(head)
+            # The words of UTF-16 files can only be found after decoding them
+            if encodings[0] in UTF_16_ENCODINGS:
+                text = (head + opened_file.read(read_size - len(head))).decode(encodings[0], errors="replace")
+                tokens = {token.encode("ascii") for token in TOKEN_TEXT_REGEX.findall(text)}
+            elif read_size <= len(head):
+                tokens = set(TOKEN_REGEX.findall(head))
+            elif read_size < MMAP_MIN_SIZE:
+                tokens = set(TOKEN_REGEX.findall(head + opened_file.read(read_size - len(head))))
+            else:
+                with mmap.mmap(opened_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                    tokens = set(TOKEN_REGEX.findall(mapped_file, 0, read_size))
+
+        return (file_stat.st_size, file_stat.st_mtime_ns, False,
+                list({token.lower().decode("ascii") for token in tokens}))
+
+    except (OSError, ValueError):
+        return None
+
+
+# A saved index of all words in the files of a directory
+# Used to only search in files, that contain all words of the searched text
+class ContentIndex:
+    VERSION = 2
+
+    def __init__(self, index_file: str):
+        self.index_file = index_file
+        # If the index needs to be saved
+        self.changed = False
+
+        # The files are referenced by a number, an outdated file is replaced by None and added again
+        # Every file is a list of [path, size, modification time, is binary]
+        self.files: list = []
+        # The word and a list of the numbers of all files containing it
+        self.tokens: dict = {}
+
+        try:
+            with open(index_file) as opened_index_file:
+                saved_index = load(opened_index_file)
+            if saved_index["VERSION"] == self.VERSION:
+                self.files = saved_index["files"]
+                self.tokens = saved_index["tokens"]
+        except (OSError, ValueError, KeyError):
+            # Debug
+            logging.debug(f"Creating new content index {index_file}")
+
+        # The number of every file, that isn't outdated
+        self.file_ids: dict = {file[0]: file_id for file_id, file in enumerate(self.files) if file is not None}
+
+    # Reading all new or changed files, found by their size and modification time
+    # The cancel_token is checked like in search_files()
+    def update(self, paths, cancel_token=None):
+        changed_paths = []
+        for path in paths:
+            file_id = self.file_ids.get(path)
+            if file_id is not None:
+                try:
+                    file_stat = os.stat(path)
+                    if (self.files[file_id][1] == file_stat.st_size and
+                            self.files[file_id][2] == file_stat.st_mtime_ns):
+                        continue
+                except OSError:
+                    pass
+                # Marking the file as outdated
+                self.files[file_id] = None
+                del self.file_ids[path]
+            changed_paths.append(path)
+
+        if not changed_paths:
+            return
+
+        # Debug
+        logging.info(f"Adding {len(changed_paths)} files to the content index...")
+        self.changed = True
+
+        # For many files using one process per CPU core, same as search_files()
+        if len(changed_paths) >= PARALLEL_MIN_FILES and (os.cpu_count() or 1) > 1:
+            with ProcessPoolExecutor(mp_context=get_context("spawn")) as process_pool:
+                results = list(map_cancellable(process_pool, read_file_tokens, changed_paths, cancel_token))
+        else:
+            results = []
+            for path in changed_paths:
+                if cancel_token is not None:
+                    cancel_token.check()
+                results.append(read_file_tokens(path))
+
+        for path, result in zip(changed_paths, results):
+            # Files that can't be read are skipped
+            if result is None:
+                continue
+
+            size, m_time, binary, tokens = result
+            file_id = len(self.files)
+            self.files.append([path, size, m_time, binary])
+            self.file_ids[path] = file_id
+            for token in tokens:
+                try:
+                    self.tokens[token].append(file_id)
+                except KeyError:
+                    self.tokens[token] = [file_id]
+
+    # Returns a set of all files, which could contain content, these still need to be searched
+    # Returns None if the index can't be used, because content contains no words
+    def candidates(self, content: str, search_binary: bool = False):
+        needle = content.encode("utf-8")
+
+        candidate_ids = None
+        for token_match in TOKEN_REGEX.finditer(needle):
+            token = token_match.group().lower().decode("ascii")
+            # A word at the beginning or the end of content could be only a part of a word in the file
+            partial_start = token_match.start() == 0
+            partial_end = token_match.end() == len(needle)
+
+            if not partial_start and not partial_end:
+                token_ids = set(self.tokens.get(token, ()))
+            else:
+                token_ids = set()
+                for indexed_token, file_ids in self.tokens.items():
+                    if ((partial_start and partial_end and token in indexed_token) or
+                            (partial_start and not partial_end and indexed_token.endswith(token)) or
+                            (partial_end and not partial_start and indexed_token.startswith(token))):
+                        token_ids.update(file_ids)
+
+            if candidate_ids is None:
+                candidate_ids = token_ids
+            else:
+                candidate_ids &= token_ids
+            # No file contains all words
+            if not candidate_ids:
+                break
+
+        # Content doesn't contain any words
+        if candidate_ids is None:
+            return None
+
+        candidates = {self.files[file_id][0] for file_id in candidate_ids if self.files[file_id] is not None}
+        # The words of binary files aren't saved, so all of them need to be searched
+        if search_binary:
+            candidates.update(file[0] for file in self.files if file is not None and file[3])
+        return candidates
+
+    # Saving the index, if something changed
+    def save(self):
+        if not self.changed:
+            return
+
+        # If more than half of the files are outdated, removing them and renumbering the others
+        if len(self.file_ids) * 2 < len(self.files):
+            new_ids = {}
+            files = []
+            for file_id, file in enumerate(self.files):
+                if file is not None:
+                    new_ids[file_id] = len(files)
+                    files.append(file)
+            self.files = files
+            self.tokens = {token: [new_ids[file_id] for file_id in file_ids if file_id in new_ids]
+                           for token, file_ids in self.tokens.items()}
+            self.tokens = {token: file_ids for token, file_ids in self.tokens.items() if file_ids}
+            self.file_ids = {file[0]: file_id for file_id, file in enumerate(self.files)}
+
+        with open(self.index_file, "w") as opened_index_file:
+            dump({"VERSION": self.VERSION, "files": self.files, "tokens": self.tokens}, opened_index_file)
+        self.changed = False
@@ -12,14 +12,13 @@
 import logging
 import os
 from json import load
-from sys import platform
 from time import perf_counter, time, ctime
 import difflib
 import gc
 import hashlib
 
 # PySide6 Gui Imports
-from PySide6.QtCore import Qt, Signal, QObject, QThreadPool
+from PySide6.QtCore import Qt, Signal, QObject
 from PySide6.QtGui import QAction
 from PySide6.QtWidgets import (QMainWindow, QWidget, QGridLayout, QHBoxLayout, QVBoxLayout, QLabel, QSlider, QSpinBox,
                                QDialogButtonBox, QSpacerItem, QSizePolicy, QTreeWidget, QTreeWidgetItem,
@@ -29,9 +28,12 @@ from PySide6.QtWidgets import (QMainWindow, QWidget, QGridLayout, QHBoxLayout, Q
 import FF_Main_UI
 import FF_Menubar
 import FF_Additional_UI
+import FF_Cancel
 import FF_Files
 import FF_About_UI
+import FF_Scheduler
 import FF_Search
+import FF_SortKeys
 
 # Global variables
 global duplicated_dict, time_dict, duplicated_parent_file_path_dict
@@ -196,8 +198,10 @@ class DuplicatedSettings:
             # Update search status label
             FF_Search.ACTIVE_SEARCH_THREADS += 1
             FF_Main_UI.MainWindow.update_search_status_label()
+            # Checked while finding duplicated files, cancelled with the "Cancel" action of the ui logger
+            cancel_token = FF_Cancel.CancelToken()
             # Initialising the ui logger
-            self.ui_logger = FF_Main_UI.SearchUpdate(search_path)
+            self.ui_logger = FF_Main_UI.SearchUpdate(search_path, cancel_token)
             # Update the logger
             self.ui_logger.update("Finding duplicated files...")
 
@@ -213,7 +217,9 @@ class DuplicatedSettings:
 
             # Events for threading
             class Events(QObject):
+                started = Signal()
                 finished = Signal()
+                cancelled = Signal()
 
             self.event_class = Events()
 
@@ -236,12 +242,40 @@ class DuplicatedSettings:
             # Closing the menu bar logger
             self.event_class.finished.connect(self.ui_logger.close)
 
-            # Starting Thread
-            QThreadPool(self.Duplicated_Settings).start(
-                lambda: FindDuplicated(
-                    criteria=criteria,
-                    matched_list=matched_list,
-                    signals=self.event_class))
+            # Closing the menu bar logger and updating the search status label, if it was cancelled
+            def duplicated_cancelled():
+                self.ui_logger.close()
+                FF_Search.ACTIVE_SEARCH_THREADS -= 1
+                FF_Main_UI.MainWindow.update_search_status_label()
+
+            self.event_class.cancelled.connect(duplicated_cancelled)
+
+            # Running the algorithm, it stops with FF_Cancel.SearchCancelled if it was cancelled
+            def find_duplicated():
+                self.event_class.started.emit()
+                found = False
+                try:
+                    FindDuplicated(
+                        criteria=criteria,
+                        matched_list=matched_list,
+                        signals=self.event_class,
+                        key_cache=FF_SortKeys.get_key_cache(cache_file),
+                        cancel_token=cancel_token)
+                    found = True
+                except FF_Cancel.SearchCancelled:
+                    # Debug
+                    logging.info("Finding duplicated files was cancelled!")
+                finally:
+                    # Closing the menu bar logger and updating the thread count, also if finding failed
+                    if not found:
+                        self.event_class.cancelled.emit()
+
+            # Hashing is background work, so searches on the same drive are started first
+            self.event_class.started.connect(lambda: self.ui_logger.update("Finding duplicated files..."))
+            if not FF_Scheduler.SCHEDULER.submit(
+                    f"Finding duplicated files in {search_path}", find_duplicated, search_path,
+                    FF_Scheduler.PRIORITY_BACKGROUND):
+                self.ui_logger.update("Waiting for searches on the same drive...")
 
         # Launch search algorithm
         self.button_box.button(
@@ -347,62 +381,26 @@ class DuplicatedUI:
 
         matched_sorted_list = list(matched_dict.keys())
 
-        # Sorting
-        if criteria["sorting"] == "File Name":
-            logging.info("Sorting list by name...")
-            # Sort the main files
-            matched_sorted_list.sort(key=FF_Search.Sort.name)
-            # Sort files in file groups
-            for sub_file_set_key in matched_sorted_list:
-                matched_dict[sub_file_set_key] = sorted(list(matched_dict[sub_file_set_key]), key=FF_Search.Sort.name)
+        # The sizes and dates are shared with the search window, so the files are only read, if they weren't before.
+        # All sizes are displayed, so they are read at once
+        key_cache = FF_SortKeys.get_key_cache(cache_file)
+        all_files = matched_sorted_list + [sub_file for sub_file_set in matched_dict.values()
+                                           for sub_file in sub_file_set]
+        key_cache.read_missing(all_files)
 
-        elif criteria["sorting"] == "File Size":
-            logging.info("Sorting list by size...")
-            # Sort the main files
-            matched_sorted_list.sort(key=FF_Search.Sort.size, reverse=True)
-            # Sort files in file groups
-            for sub_file_set_key in matched_sorted_list:
-                matched_dict[sub_file_set_key] = sorted(
-                    list(matched_dict[sub_file_set_key]), key=FF_Search.Sort.size, reverse=True)
-
-        elif criteria["sorting"] == "Date Created":
-            logging.info(f"Sorting list by creation date on {platform}...")
-            # On Windows and Linux
-            # (On Linux this currently returns the modification date,
-            # because it's impossible to access with pure python)
-            if platform == "win32" or platform == 'cygwin' or platform == "linux":
-                # Sort the main files
-                matched_sorted_list.sort(key=FF_Search.Sort.c_date_win)
-                # Sort files in file groups
-                for sub_file_set_key in matched_sorted_list:
-                    matched_dict[sub_file_set_key] = sorted(list(matched_dict[sub_file_set_key]),
-                                                            key=FF_Search.Sort.c_date_win)
-
-            # On Mac
-            if platform == "darwin":
-                # Sort the main files
-                matched_sorted_list.sort(key=FF_Search.Sort.c_date_mac)
-                # Sort files in file groups
-                for sub_file_set_key in matched_sorted_list:
-                    matched_dict[sub_file_set_key] = sorted(list(matched_dict[sub_file_set_key]),
-                                                            key=FF_Search.Sort.c_date_mac)
-
-        elif criteria["sorting"] == "Date Modified":
-            logging.info("Sorting list by modification date...")
-            # Sort the main files
-            matched_sorted_list.sort(key=FF_Search.Sort.m_date)
-            # Sort files in file groups
-            for sub_file_set_key in matched_sorted_list:
-                matched_dict[sub_file_set_key] = sorted(list(matched_dict[sub_file_set_key]), key=FF_Search.Sort.m_date)
+        # Sorting
+        if criteria["sorting"] != "None (fastest)":
+            logging.info(f"Sorting list by {criteria['sorting']}...")
+            sort_key = key_cache.sort_key(criteria["sorting"], all_files)
+            # Largest files first
+            reverse_sort = criteria["sorting"] == "File Size"
 
-        elif criteria["sorting"] == "Path":
-            logging.info("Sorting list by path...")
             # Sort the main files
-            matched_sorted_list.sort(key=lambda sort_file: sort_file.lower())
+            matched_sorted_list.sort(key=sort_key, reverse=reverse_sort)
             # Sort files in file groups
             for sub_file_set_key in matched_sorted_list:
                 matched_dict[sub_file_set_key] = sorted(
-                    list(matched_dict[sub_file_set_key]), key=lambda sort_file: sort_file.lower())
+                    list(matched_dict[sub_file_set_key]), key=sort_key, reverse=reverse_sort)
 
         else:
             logging.info("Skipping Sorting")
@@ -419,12 +417,12 @@ class DuplicatedUI:
                 sub_tree_item = QTreeWidgetItem(main_tree_item)
 
                 sub_tree_item.setText(0, sub_item)
-                sub_tree_item.setText(1, FF_Files.conv_file_size(FF_Files.get_file_size(sub_item)))
+                sub_tree_item.setText(1, FF_Files.conv_file_size(key_cache.size(sub_item)))
                 sub_tree_item.setTextAlignment(1, Qt.AlignmentFlag.AlignRight)
 
             # Set the text
             main_tree_item.setText(0, main_item)
-            main_tree_item.setText(1, FF_Files.conv_file_size(FF_Files.get_file_size(main_item)))
+            main_tree_item.setText(1, FF_Files.conv_file_size(key_cache.size(main_item)))
             main_tree_item.setTextAlignment(1, Qt.AlignmentFlag.AlignRight)
 
         # If no duplicated file was found
@@ -523,7 +521,8 @@ class DuplicatedUI:
 
 # Algorithms to find duplicated files
 class FindDuplicated:
-    def __init__(self, criteria: dict, matched_list, signals):
+    def __init__(self, criteria: dict, matched_list, signals, key_cache: FF_SortKeys.SortKeyCache,
+                 cancel_token: FF_Cancel.CancelToken):
         # Debug
         logging.info("Searching for duplicated files...")
         logging.info(f"{criteria=}")
@@ -555,7 +554,7 @@ class FindDuplicated:
             # Group by name
             if criteria["name"]["match_percentage"] == 100:
 
-                for file in found_path_set:
+                for file in cancel_token.check_iter(found_path_set):
                     # Get the basename, ignoring case
                     low_basename = os.path.basename(file).lower()
 
@@ -574,7 +573,7 @@ class FindDuplicated:
                 match_factor = criteria["name"]["match_percentage"] / 100
 
                 # Iterating through all files
-                for file in found_path_set:
+                for file in cancel_token.check_iter(found_path_set):
                     # Get the basename, ignoring case
                     low_basename = os.path.basename(file).lower()
                     # If low_basename isn't already in exist already_text if there is something in the allowed range
@@ -625,11 +624,14 @@ class FindDuplicated:
             duplicated_size_dict = {}
             duplicated_size_parent_file_path_dict = {}
 
+            # The sizes are shared with the search window, only missing sizes are read, in parallel
+            key_cache.read_missing(found_path_set, cancel_token)
+
             # If the percentage of
             if criteria["size"]["match_percentage"] == 100:
-                for file in found_path_set:
+                for file in cancel_token.check_iter(found_path_set):
                     try:
-                        size = FF_Files.get_file_size(file)
+                        size = key_cache.size(file)
                     except FileNotFoundError:
                         continue
 
@@ -653,11 +655,11 @@ class FindDuplicated:
 
                 logging.info(f"{lower_allowed_divergence_factor=}, {upper_allowed_divergence_factor=}")
 
-                for file in found_path_set:
+                for file in cancel_token.check_iter(found_path_set):
 
                     # Try getting the size
                     try:
-                        size = FF_Files.get_file_size(file)
+                        size = key_cache.size(file)
                     except OSError:
                         continue
 
@@ -719,6 +721,7 @@ class FindDuplicated:
 
                     # Iterating through all files that have the same size
                     for file in duplicated_files:
+                        cancel_token.check()
 
                         # If the file isn't a folder
                         if os.path.isfile(file):
@@ -739,6 +742,8 @@ class FindDuplicated:
                                             break
                                         # Updating hash
                                         computing_hash.update(data)
+                                        # Large files can take a while
+                                        cancel_token.check()
 
                             except OSError:
                                 continue
@@ -767,6 +772,7 @@ class FindDuplicated:
                                                     break
                                                 # Updating hash
                                                 computing_hash.update(data)
+                                                cancel_token.check()
 
                                     except OSError:
                                         continue
@@ -0,0 +1,1583 @@
+# This source file is a part of File Find made by Pixel-Master
+#
+# Copyright 2022-2025 Pixel-Master
+#
+# This software is licensed under the "GPLv3" License as described in the "LICENSE" file,
+# which should be included with this package. The terms are also available at
+# http://www.gnu.org/licenses/gpl-3.0.html
+
+# This file contains the search engine, which scans, filters, sorts and caches without Qt,
+# so it can be run by the user-interface and without one
+
+# Imports
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from json import dump, load
+from sys import platform
+from time import perf_counter, mktime
+from unicodedata import normalize
+import heapq
+from bisect import bisect_left
+
+# Projects Libraries
+import FF_Archive
+import FF_Cancel
+import FF_Columns
+import FF_Content
+import FF_Files
+import FF_Index
+import FF_Matching
+import FF_Query
+import FF_SharedScans
+import FF_SortKeys
+
+
+# Raised while creating a SearchEngine, if the filters are invalid or no files would be found.
+# Contains a title and a message, which are shown in a popup by the user-interface
+class QueryError(Exception):
+    def __init__(self, title: str, message: str):
+        super().__init__(message)
+        self.title = title
+        self.message = message
+
+
+# The filters and options of a search, with the same values as the main window.
+# Sizes are in bytes and dates are unix times, None means no limit.
+# The last options are loaded from the settings by the user-interface
+@dataclass
+class SearchQuery:
+    search_from: str
+    name: str = ""
+    name_specifier: str = "contains:"
+    consider_case: bool = False
+    # In percent
+    similarity: int = 60
+    file_type_mode: str = "predefined"
+    file_group: list = field(default_factory=lambda: list(FF_Files.FILE_FORMATS.keys()))
+    # Used with file_type_mode "custom", multiple file types are separated with semicolons
+    filetype: str = ""
+    search_for: str = "Files and Folders"
+    library: bool = False
+    folder_depth: str = "Unlimited"
+    folder_depth_custom: int = 0
+    file_size_min: float | None = None
+    file_size_max: float | None = None
+    c_date_from: float | None = None
+    c_date_to: float | None = None
+    m_date_from: float | None = None
+    m_date_to: float | None = None
+    content: str = ""
+    content_mode: str = FF_Content.CONTENT_MODE_TEXT
+    content_binary: bool = False
+    query: str = ""
+    sort_by: str = "None (fastest)"
+    reverse_sort: bool = False
+    result_limit: int = 0
+    # Scanning again, instead of using a cache file
+    new_cache_file: bool = False
+    # Saving the scan as a cache file, without it the search always scans
+    save_cache: bool = True
+    excluded_files: list = field(default_factory=list)
+    use_ignore_files: bool = False
+    search_in_archives: bool = False
+    content_index: bool = False
+
+
+# The options of the main window, which builds its comboboxes from them.
+# Filter presets save the name specifier as text and the position in the list for the other two
+NAME_SPECIFIERS = ("is:", "contains:", "begins with:", "ends with:", "is similar to:", "doesn't contain:", "in RegEx:",
+                   "is one of:", "contains one of:")
+SEARCH_FOR_MODES = ("Files and Folders", "only Files", "only Folders")
+SORT_MODES = ("None (fastest)", "File Size", "File Name", "Date Modified", "Date Created", "Path")
+SIZE_UNIT_FACTORS = {"No Limit": 1, "Bytes": 1, "KB": 1000, "MB": 1000000, "GB": 1000000000}
+
+
+# Converting an ISO date (2024-01-26) into the unix time of the start of the day, or of a later day with expand_days,
+# so the second date of a range includes the whole day
+def convert_iso_date(iso_date: str, expand_days: int = 0) -> float:
+    time_list = iso_date.split("-")
+    # Fill in hours, minutes and second with 0 because we don't have them
+    return mktime((int(time_list[0]), int(time_list[1]), int(time_list[2]) + expand_days, 0, 0, 0, 0, 0, 0))
+
+
+# Converting a filter preset (the content of a .FFFilter file, see FF_Files.DEFAULT_FILTER)
+# into the fields of a SearchQuery. Raises QueryError, if a size isn't a number
+def query_fields_from_filter(filters: dict) -> dict:
+    # Presets of older versions don't contain every filter
+    filters = {**FF_Files.DEFAULT_FILTER, **filters}
+
+    # Dates are only filtered, if they were changed
+    dates = {}
+    for date_type in ("c_date", "m_date"):
+        date_to = filters["dates"][f"{date_type}_to"]
+        if date_to == "DEFAULT_DATE":
+            date_to = FF_Files.DEFAULT_FILTER["dates"][f"{date_type}_to"]
+        if (filters["dates"][f"{date_type}_from"] == FF_Files.DEFAULT_FILTER["dates"][f"{date_type}_from"] and
+                date_to == FF_Files.DEFAULT_FILTER["dates"][f"{date_type}_to"]):
+            dates[f"{date_type}_from"] = dates[f"{date_type}_to"] = None
+        else:
+            dates[f"{date_type}_from"] = convert_iso_date(filters["dates"][f"{date_type}_from"])
+            dates[f"{date_type}_to"] = convert_iso_date(date_to, expand_days=1)
+
+    # Converting the sizes to bytes
+    sizes = {}
+    for size_limit in ("min", "max"):
+        if filters["size_unit"][size_limit] == "No Limit":
+            sizes[size_limit] = None
+        else:
+            try:
+                sizes[size_limit] = float(filters["size"][size_limit]) * SIZE_UNIT_FACTORS[
+                    filters["size_unit"][size_limit]]
+            except ValueError:
+                # Debug
+                logging.error("Size Error! File Size min is larger than File Size max or one of them is invalid!")
+                raise QueryError(
+                    "SIZE ERROR!",
+                    "Size Error!\n\nFile size min is larger than file size max or one of them is invalid!")
+
+    return {"search_from": os.path.abspath(filters["directory"].replace("USER_FOLDER", FF_Files.USER_FOLDER)),
+            "name": filters["name"],
+            "name_specifier": filters["name_specifier"],
+            "consider_case": filters["consider_case"],
+            "similarity": filters["similarity"],
+            "file_type_mode": filters["file_type_mode"],
+            "file_group": list(filters["file_types"]),
+            "filetype": filters["file_extension"],
+            "search_for": SEARCH_FOR_MODES[filters["files_folders"]],
+            "library": filters["hidden_files"],
+            "folder_depth": filters["folder_depth"],
+            "folder_depth_custom": filters["folder_depth_custom"],
+            "file_size_min": sizes["min"],
+            "file_size_max": sizes["max"],
+            **dates,
+            "content": filters["file_contains"],
+            "content_mode": filters["file_contains_mode"],
+            "content_binary": filters["file_contains_binary"],
+            "query": filters["query"],
+            "sort_by": SORT_MODES[filters["sorting"]],
+            "reverse_sort": filters["reverse_sorting"],
+            "result_limit": filters["result_limit"]}
+
+
+# Results, which are only sorted when they are shown, used with a result limit.
+# Takes a list of (sort key, path) tuples
+class LimitedResults:
+    def __init__(self, keyed_results: list, largest_first: bool):
+        self.keyed_results = keyed_results
+        self.largest_first = largest_first
+
+    # The number of results, which weren't taken yet
+    def __len__(self):
+        return len(self.keyed_results)
+
+    # Taking the next results in sorted order, only these are sorted
+    def take(self, count: int) -> list:
+        if self.largest_first:
+            taken_results = heapq.nlargest(count, self.keyed_results)
+        else:
+            taken_results = heapq.nsmallest(count, self.keyed_results)
+
+        taken_paths = {path for sort_key, path in taken_results}
+        self.keyed_results = [keyed_result for keyed_result in self.keyed_results
+                              if keyed_result[1] not in taken_paths]
+        return [path for sort_key, path in taken_results]
+
+
+# The result of a search, every search has its own,
+# so concurrent searches don't overwrite each others results
+class SearchResult:
+    def __init__(self, time_dict: dict, found_path_list: list, search_from: str, cache_file: str | None,
+                 content_matches: dict | None, more_results: LimitedResults | None, folders: set = None,
+                 key_cache: FF_SortKeys.SortKeyCache = None):
+        self.time_dict = time_dict
+        self.found_path_list = found_path_list
+        self.search_from = search_from
+        self.cache_file = cache_file
+        self.content_matches = content_matches
+        self.more_results = more_results
+        # The found folders and the sizes and dates of the found paths
+        self.folders = folders if folders is not None else set()
+        self.key_cache = key_cache if key_cache is not None else FF_SortKeys.SortKeyCache(cache_file)
+
+    # The arguments for FF_Search_UI.SearchWindow
+    def window_arguments(self, parent) -> list:
+        return [self.time_dict, self.found_path_list, self.search_from, self.cache_file, parent,
+                self.content_matches, self.more_results]
+
+
+# Loading a cache file into a scan, the same dict as the results of FF_SharedScans without the metadata
+def load_cache_file(cache_file: str) -> dict:
+    with open(cache_file) as search_results:
+        load_input = load(search_results)
+
+    return {"path_list": load_input["found_path_set"],
+            "type_dict": load_input["type_dict"],
+            "extension_index": FF_Index.load_extension_index(load_input["extension_index"]),
+            "range_indexes": FF_Index.load_range_indexes(load_input["range_indexes"]),
+            "directory_aggregates": FF_Index.load_directory_aggregates(load_input["directory_aggregates"]),
+            "member_stats": FF_Archive.load_member_stats(load_input["archive_members"])}
+
+
+# The number of cache files a CacheStore keeps in memory
+MAX_STORED_CACHES = 4
+
+
+# Cache files kept in memory after they were loaded, so a long-running process (like FF_Server)
+# doesn't load them again for every search. A cache file is loaded again, if it was changed since
+class CacheStore:
+    def __init__(self, max_caches: int = MAX_STORED_CACHES):
+        self.max_caches = max_caches
+        # The modification time of the cache file and the scan, by cache file, the oldest first
+        self.scans = {}
+        # Searches are run in different threads
+        self.lock = threading.Lock()
+
+    # Getting the scan of a cache file, the scan must not be changed
+    def load(self, cache_file: str) -> dict:
+        # Taken before loading, so the file is loaded again if it's changed while loading
+        modified_time = os.stat(cache_file).st_mtime_ns
+        with self.lock:
+            stored_scan = self.scans.pop(cache_file, None)
+            if stored_scan is not None and stored_scan[0] == modified_time:
+                self.scans[cache_file] = stored_scan
+                # Debug
+                logging.debug(f"Using {cache_file} from memory")
+                return stored_scan[1]
+
+        scan = load_cache_file(cache_file)
+        self.add(cache_file, scan, modified_time)
+        return scan
+
+    # Keeping a scan, which was saved as cache_file
+    def add(self, cache_file: str, scan: dict, modified_time: int = None):
+        if modified_time is None:
+            modified_time = os.stat(cache_file).st_mtime_ns
+        with self.lock:
+            self.scans.pop(cache_file, None)
+            self.scans[cache_file] = (modified_time, scan)
+
+            # Removing the scans, which weren't used for the longest time
+            while len(self.scans) > self.max_caches:
+                del self.scans[next(iter(self.scans))]
+
+
+# The scans of the searches of a BatchSearch, kept until the batch finished, also if they aren't saved as cache files.
+# A search uses the scan of the same or a higher directory like a cache file.
+# The searches of a batch run one after another, so no lock is needed
+class BatchScans:
+    def __init__(self):
+        # FF_SharedScans.SharedScan with the scan as result, as they are used with the same rules
+        self.scans = []
+
+    # Getting a scan, which contains everything the search needs, None if there is none.
+    # A scan without a cache file is only used by searches, which don't save the cache either,
+    # and a scan from a cache file isn't used, if the search scans again
+    def find(self, search_from: str, depth_limit: int, use_ignore_files: bool, search_in_archives: bool,
+             excluded_files: FF_Matching.PrefixSet, save_cache: bool, new_cache_file: bool) -> dict | None:
+        for batch_scan in self.scans:
+            if (batch_scan.covers(search_from, depth_limit, use_ignore_files, search_in_archives, excluded_files) and
+                    (batch_scan.result["cache_file"] is not None or not save_cache) and
+                    (batch_scan.result["scanned"] or not new_cache_file)):
+                # Debug
+                logging.info(f"Using the scan of {batch_scan.search_from} from the batch")
+                return batch_scan.result
+        return None
+
+    # Keeping the scan of a search, scanned_excluded_files were skipped while scanning. Returns the scan
+    def add(self, search_from: str, depth_limit: int, use_ignore_files: bool, search_in_archives: bool,
+            scanned_excluded_files: list, scan: dict) -> dict:
+        batch_scan = FF_SharedScans.SharedScan(
+            search_from, depth_limit, use_ignore_files, search_in_archives, scanned_excluded_files)
+        batch_scan.result = scan
+        self.scans.append(batch_scan)
+        return scan
+
+
+# Sending the results found while scanning to a callback in batches.
+# A batch is sent at most every STREAM_INTERVAL seconds, so the UI isn't flooded with signals
+class ResultStream:
+    def __init__(self, callback, stream_filter):
+        self.callback = callback
+        self.stream_filter = stream_filter
+        self.batch = []
+        # The values read by the filter, by path
+        self.range_values = {}
+        # The first result is sent immediately
+        self.last_sent = 0
+
+    # Testing the files and folders of a directory found by os.walk()
+    def add_directory(self, root: str, files: list, dirs: list):
+        for file in files:
+            if self.stream_filter(os.path.join(root, file), False, self.range_values):
+                self.batch.append(os.path.join(root, file))
+        for directory in dirs:
+            if self.stream_filter(os.path.join(root, directory), True, self.range_values):
+                self.batch.append(os.path.join(root, directory))
+
+        if self.batch and perf_counter() - self.last_sent >= STREAM_INTERVAL:
+            self.flush()
+
+    # Sending the collected results
+    def flush(self):
+        if self.batch:
+            self.callback(self.batch)
+            self.batch = []
+        self.last_sent = perf_counter()
+
+
+# Running a search, the query is tested when the engine is created and run() searches in the thread of the caller.
+# progress is called with the name of every stage (like "scanning", "indexing_name" or "caching"),
+# stream is called with lists of results found while scanning, results are only streamed if it's given
+class SearchEngine:
+    def __init__(self, query: SearchQuery, progress=None, stream=None, cancel_token: FF_Cancel.CancelToken = None,
+                 cache_store: CacheStore = None, batch_scans: BatchScans = None):
+        self.query = query
+        self.progress = progress if progress is not None else lambda stage: None
+        self.stream = stream
+        # Checked while searching, a cancelled search stops with FF_Cancel.SearchCancelled
+        self.cancel_token = cancel_token if cancel_token is not None else FF_Cancel.CancelToken()
+        # The scan of this search, if other searches can wait for it (see FF_SharedScans)
+        self.shared_scan = None
+        # Cache files kept in memory, without it they are loaded for every search
+        self.cache_store = cache_store
+        # The scans of the other searches of a batch
+        self.batch_scans = batch_scans
+
+        # Loading excluded files, sorted once so they can be checked with a binary search
+        self.excluded_files = FF_Matching.PrefixSet(query.excluded_files)
+
+        # Compiling the query, if one was entered
+        query_error = None
+        self.query_plan = None
+        if query.query.strip() != "":
+            try:
+                self.query_plan = FF_Query.compile_query(query.query, query.search_from)
+                logging.debug(f"Compiled query: {self.query_plan.syntax_tree}")
+            except FF_Query.QuerySyntaxError as query_syntax_error:
+                query_error = str(query_syntax_error)
+
+        # Compiling the content search, RegEx can be invalid
+        content_error = None
+        self.content_matcher = None
+        if query.content != "":
+            try:
+                self.content_matcher = FF_Content.ContentMatcher(query.content, query.content_mode)
+            except re.error as content_regex_error:
+                content_error = str(content_regex_error)
+
+        # Compiling the name filter, RegEx can be invalid
+        name_error = None
+        self.name_filter = None
+        if query.name != "":
+            name = query.name
+            # Lower the name to remove case sensitivity
+            if not query.consider_case or query.name_specifier == "is similar to:":
+                name = name.lower()
+            # Normalising the name like the file type (see searching())
+            if platform == "darwin":
+                name = normalize("NFD", name)
+            try:
+                # Convert percentage to ratio
+                self.name_filter = FF_Matching.compile_name_filter(
+                    name, query.name_specifier, query.consider_case, query.similarity / 100)
+            except re.error as name_regex_error:
+                name_error = str(name_regex_error)
+
+        # Fetching Errors
+        # Testing if file ending, file groups or name contains are used together with name,
+        # because if they do no file will be found
+        # Also testing if wildcard syntax is used in the name,
+        # because wildcard is supported and so no error should appear
+        wildcard_used = ("[" in query.name) or ("?" in query.name) or ("*" in query.name)
+        file_types_used = (
+                (query.file_type_mode == "custom" and query.filetype != "") or
+                (query.file_type_mode == "predefined" and query.file_group != list(FF_Files.FILE_FORMATS.keys())))
+        if query.name != "" and file_types_used and not wildcard_used and query.name_specifier == "is:":
+            # Debug
+            logging.error("File name \"is\" can't be used together with file type")
+            raise QueryError("NAME ERROR!",
+                             "Name Error!\n\nFile name \"is\" can't be used together with file type"
+                             " as there would be no files found")
+
+        # Directory not valid
+        if not os.path.isdir(query.search_from):
+            # Debug
+            logging.error("Directory Error! Given directory is not a valid folder!")
+            raise QueryError("Directory Error!", "Directory Error!\n\nGiven directory is not a valid folder!")
+
+        # File Size max must be larger than File Size min
+        if query.file_size_min is not None and query.file_size_max is not None and \
+                query.file_size_min > query.file_size_max:
+            # Debug
+            logging.error("Size Error! File Size min is larger than File Size max or one of them is invalid!")
+            raise QueryError("SIZE ERROR!",
+                             "Size Error!\n\nFile size min is larger than file size max or one of them is invalid!")
+
+        # First Date must be earlier than second Date
+        if (query.c_date_from is not None and query.c_date_to is not None and
+            query.c_date_from >= query.c_date_to) or \
+                (query.m_date_from is not None and query.m_date_to is not None and
+                 query.m_date_from >= query.m_date_to):
+            # Debug
+            logging.error("Date Error! First Date is later than second Date!")
+            raise QueryError("DATE ERROR!",
+                             "Date Error!\n\n"
+                             "First date must be earlier than second date!\n\n"
+                             "e.g.:\nvalid: 15.Feb.2022 - 17.Feb.2023\n"
+                             "invalid: 17.Feb.2023 - 15.Feb.2022")
+
+        # Search in System Files disabled, but Search path is in library Folder
+        if ((not query.library) and ("/Library" in query.search_from)) or \
+                (not query.library) and (query.search_from.startswith("/System")):
+            # Debug
+            logging.error("System Files Error! Search in System Files disabled, but Directory is in Library Folder")
+            raise QueryError("System Files Error!",
+                             "System Files Error!\n\nActivate Search in System Files!\n"
+                             "Search in system files disabled"
+                             " but search directory is in library folder!")
+
+        # If the file group is an empty list (no files would be found)
+        if not query.file_group and query.file_type_mode == "predefined":
+            # Debug
+            logging.error("File Types Error! No File Types are selected")
+            raise QueryError("File Types Error!",
+                             "File Types Error!\n\nSelect a file type!\n"
+                             "No files would be found, because no file type "
+                             "category is selected.")
+
+        # If the query can't be parsed
+        if query_error is not None:
+            # Debug
+            logging.error(f"Query Error! {query_error}")
+            raise QueryError(
+                "QUERY ERROR!",
+                f"Query Error!\n\n{query_error}\n\n"
+                "e.g.:\nname:~report AND ext:pdf,docx AND NOT path:/archive/ AND size>10MB AND mtime>2024-01-01")
+
+        # If the RegEx of the name is invalid
+        if name_error is not None:
+            # Debug
+            logging.error(f"Name Error! Invalid RegEx: {name_error}")
+            raise QueryError("NAME ERROR!", f"Name Error!\n\nInvalid RegEx: {name_error}")
+
+        # If the RegEx of file contains is invalid
+        if content_error is not None:
+            # Debug
+            logging.error(f"File contains Error! Invalid RegEx: {content_error}")
+            raise QueryError("FILE CONTAINS ERROR!", f"File contains Error!\n\nInvalid RegEx: {content_error}")
+
+        # If the search scope is an excluded file
+        if self.excluded_files.match(query.search_from):
+            # Debug
+            logging.error("Directory Error! Search in directory is in an excluded directory")
+            raise QueryError(
+                "Directory Error!",
+                "Directory Error!\n\n"
+                "The directory you searched in is in an excluded folder.\n\n"
+                "You can edit the excluded folders in the File Find Settings. \n(File Find > Preferences...)")
+
+    # Running the search, raises FF_Cancel.SearchCancelled if it was cancelled
+    def run(self) -> SearchResult:
+        try:
+            return self.searching()
+        finally:
+            # The searches waiting for the scan have to scan themselves, if it failed
+            if self.shared_scan is not None:
+                FF_SharedScans.finish(self.shared_scan)
+
+    # The search engine
+    def searching(self) -> SearchResult:
+        # Taking the filters out of the query
+        data_search_from = self.query.search_from
+        data_name_specifier = self.query.name_specifier
+        # Compiled when the engine was created
+        data_name_filter = self.name_filter
+        data_filetype = self.query.filetype
+        data_file_group = self.query.file_group
+        data_file_type_mode = self.query.file_type_mode
+        data_file_size_min = self.query.file_size_min
+        data_file_size_max = self.query.file_size_max
+        data_search_for = self.query.search_for
+        data_library = self.query.library
+        data_folder_depth = self.query.folder_depth
+        data_folder_depth_custom = self.query.folder_depth_custom
+        data_content = self.query.content
+        data_content_binary = self.query.content_binary
+        data_content_matcher = self.content_matcher
+        data_query_plan = self.query_plan
+        data_sort_by = self.query.sort_by
+        data_reverse_sort = self.query.reverse_sort
+        data_result_limit = self.query.result_limit
+        data_excluded_files = self.excluded_files
+        # Without saving the cache, no cache file is used either
+        data_save_cache = self.query.save_cache
+        new_cache_file = self.query.new_cache_file or not data_save_cache
+        # Skipping the files in .gitignore and .ffignore files while scanning
+        data_use_ignore_files = self.query.use_ignore_files
+        # Listing the members of zip and tar archives while scanning
+        data_search_in_archives = self.query.search_in_archives
+        # Using the content index for file contains
+        data_content_index = self.query.content_index
+        # Dates without a limit are replaced with the lowest or highest possible value
+        data_time = {"c_date_from": self.query.c_date_from if self.query.c_date_from is not None else float("-inf"),
+                     "c_date_to": self.query.c_date_to if self.query.c_date_to is not None else float("inf"),
+                     "m_date_from": self.query.m_date_from if self.query.m_date_from is not None else float("-inf"),
+                     "m_date_to": self.query.m_date_to if self.query.m_date_to is not None else float("inf")}
+
+        # Debug
+        logging.info("Starting Search...")
+        self.progress("starting")
+        # The search could have been cancelled while waiting
+        self.cancel_token.check()
+
+        # Saving time before scanning
+        time_before_start = perf_counter()
+
+        # Remove the "." and any star because they are added later
+        data_filetype = data_filetype.lstrip(".*")
+
+        # Lower Arguments to remove case sensitivity
+        data_filetype = data_filetype.lower()
+
+        '''
+        There are multiple possibilities in unicode on how to display some characters (for example ä, ü, ö).
+        A decomposed form NFD (normal form D) ä = a + ¨
+        and a composed one NFC (normal form C) ä = ä
+        On macOS the filesystem returns the names for files created locally as NFD while everyone else does NFC.
+        It is possible to place NFC characters in macOS file names. But not for a normal user.
+
+        If you have problems on macOS with composed/decomposed unicode character remove the lines of code below
+        and the ones normalising the name in __init__().
+        '''
+        # Normalising arguments (see above)
+        if platform == "darwin":
+            data_filetype = normalize("NFD", data_filetype)
+
+        # Checking if created time checking is needed
+        if self.query.c_date_from is None and self.query.c_date_to is None:
+            data_c_time_needed = False
+            logging.debug("Created time checking is NOT needed")
+
+        else:
+            logging.debug("Created time checking is needed")
+            data_c_time_needed = True
+
+        # Checking if modified time checking is needed
+        if self.query.m_date_from is None and self.query.m_date_to is None:
+            data_m_time_needed = False
+            logging.debug("Modified time checking is NOT needed")
+
+        else:
+            logging.debug("Modified time checking is needed")
+            data_m_time_needed = True
+
+        # Checking if the size filter is needed
+        data_file_size_needed = data_file_size_min is not None or data_file_size_max is not None
+        # Replacing no limit with fixed values, using 1 Petabyte as the upper limit
+        if data_file_size_min is None:
+            data_file_size_min = 0
+        if data_file_size_max is None:
+            data_file_size_max = 1e15
+
+        # Checking if data_search_for is needed
+        if data_search_for == "Files and Folders":
+            # needed
+            logging.debug("Files and folders checking is needed")
+            data_search_for_needed = False
+        else:
+            # not needed
+            logging.debug("Files and folders checking is NOT needed")
+            data_search_for_needed = True
+
+        # Testing if one of the excluded folder is in the search scope, if not checking isn't necessary
+        excluded_files_in_scope = data_excluded_files.prefixes_starting_with(data_search_from)
+
+        # If data_excluded_files is an empty list or no file in the excluded list is in the search scope
+        if not excluded_files_in_scope:
+            # If the list is empty
+            logging.debug("Excluded files checking is NOT needed")
+            data_excluded_files_needed = False
+
+        else:
+            logging.debug("Excluded files checking is needed")
+            data_excluded_files_needed = True
+
+        # Checking if check for file type is needed
+        if ((set(data_file_group) != set(FF_Files.FILE_FORMATS.keys()) and data_file_type_mode == "predefined") or
+                (data_filetype != "" and data_file_type_mode == "custom")):
+            logging.debug("File type checking is needed")
+
+            # Creating a set and adding every needed file format to it
+            allowed_filetypes_set = set()
+            disallowed_filetypes_set = set()  # Needed if "other" is activated and user chose "predefined"
+
+            if data_file_type_mode == "predefined":
+                # Iterating through the list of file group type
+                for file_group in FF_Files.FILE_FORMATS.keys():
+                    # Needing two lists because of "other",
+                    # when it's activated all groups, which are not allowed are collected
+                    # Else all allowed groups are collected
+                    # This is because "other" is everything else, which isn't in a group.
+                    if file_group in data_file_group:
+                        for file in FF_Files.FILE_FORMATS[file_group]:
+                            allowed_filetypes_set.add(file)
+                    else:
+                        for file in FF_Files.FILE_FORMATS[file_group]:
+                            disallowed_filetypes_set.add(file)
+
+            elif data_file_type_mode == "custom":
+                # Semicolons can be used for entering multiple possible file types,
+                # removing all spaces as filetypes have none (at least sane people don't use them)
+                # removing all the dots (the most left on already has been removed)
+                allowed_filetypes_set = data_filetype.replace(" ", "").replace(";.", ";").split(";")
+
+            # Making tuples out of the sets for better performance
+            allowed_filetypes = tuple(allowed_filetypes_set)
+            disallowed_filetypes = tuple(disallowed_filetypes_set)
+
+        else:
+            logging.debug("File type checking is NOT needed")
+            # Because checking isn't needed and wwe don't want automated tools to flag this as "possibly unassigned"
+            allowed_filetypes = None
+            disallowed_filetypes = None
+
+        # Processing folder depth input
+        if data_folder_depth == "Unlimited":
+            # folder_depth_global_limit is basically just the amount of "/" (on macOS)
+            # that are allowed in the path of a file
+            # -1 means infinite
+            folder_depth_global_limit = -1
+        elif data_folder_depth == "No subfolders":
+            folder_depth_global_limit = data_search_from.count(os.sep)
+        elif data_folder_depth == "Custom":
+            # Using data_search_from.count(os.sep) as the depth is relative to the directory that is searched in
+            folder_depth_global_limit = data_search_from.count(os.sep) + data_folder_depth_custom
+        else:
+            # Shouldn't be reached
+            logging.fatal("Error in code while processing folder depth limit")
+            raise ValueError
+
+        # Debug
+        logging.info("Starting Scanning...")
+        # Update the menu-bar status
+        self.progress("scanning")
+
+        '''Checking, if a Cache File exists in any fitting directory'''
+        newest_fitting_cache_file = None
+        newest_fitting_cache_file_c_date = 0
+        newest_fitting_cache_file_excluded_files = []
+
+        # On Windows the "C:\" has to be stripped
+        if platform == "win32" or platform == "cyqwin":
+            comparable_data_search_from = data_search_from[2:].replace(os.sep, "-") + "-"
+        else:
+            comparable_data_search_from = data_search_from.replace(os.sep, "-") + "-"
+
+        for cache_file in os.listdir(FF_Files.CACHED_SEARCHES_FOLDER):
+            # Looks if there is a cache file for a higher directory add a folder separator ("-") so that files
+            # from the same directory with a similar name aren't mistaken for files from a parent directory
+            # A dollar sign marks the beginning of the absolute depth limit of the cache file
+            # "-" marks a folder separator
+            # comparable_cache_file is basically the original search path but all "/" are replaced with "-"
+            comparable_cache_file = ((cache_file.removesuffix(".FFCache")[:cache_file.rfind("$")]) + "-")
+
+            if comparable_data_search_from.startswith(comparable_cache_file):
+                # Date created and global folder depth (which must match) from separate file
+                with open(os.path.join(FF_Files.CACHE_METADATA_FOLDER, cache_file)) as time_file:
+                    metadata = load(time_file)
+                    cache_file_c_date = metadata["c_time"]
+                    cache_file_depth = metadata["global_depth_limit"]
+                    # Excluded files, that were skipped while scanning for this cache
+                    cache_file_excluded_files = metadata.get("excluded_files", [])
+                    # If the ignore files were used while scanning for this cache
+                    cache_file_use_ignore_files = metadata.get("use_ignore_files", False)
+                    # If the members of archives were listed while scanning for this cache
+                    cache_file_search_in_archives = metadata.get("search_in_archives", False)
+
+                # Looks if the creation time is newer than the current best fitting file
+                # Also check if the global depth, the use of ignore files and the listing of archives matches up and
+                # that everything skipped while scanning is still excluded
+                if ((cache_file_c_date > newest_fitting_cache_file_c_date) and
+                        (cache_file_depth == folder_depth_global_limit) and
+                        (cache_file_use_ignore_files == data_use_ignore_files) and
+                        (cache_file_search_in_archives == data_search_in_archives) and
+                        all(data_excluded_files.match(excluded_file) for excluded_file in cache_file_excluded_files)):
+                    newest_fitting_cache_file_c_date = cache_file_c_date
+                    newest_fitting_cache_file = os.path.join(FF_Files.CACHED_SEARCHES_FOLDER, cache_file)
+                    newest_fitting_cache_file_excluded_files = cache_file_excluded_files
+
+        # In a batch, the scan of a previous search in the same or a higher directory is used like a cache file,
+        # also if it wasn't saved
+        batch_scan = None
+        if self.batch_scans is not None:
+            batch_scan = self.batch_scans.find(
+                data_search_from, folder_depth_global_limit, data_use_ignore_files, data_search_in_archives,
+                data_excluded_files, data_save_cache, new_cache_file)
+        shared_scan_result = batch_scan
+
+        # A running scan of the same or a higher directory is used instead of scanning again,
+        # its result is sent as soon as it was cached, so it's used like a cache file
+        if shared_scan_result is None and data_save_cache and (newest_fitting_cache_file is None or new_cache_file):
+            while True:
+                shared_scan, scan_leader = FF_SharedScans.find_or_start(
+                    data_search_from, folder_depth_global_limit, data_use_ignore_files, data_search_in_archives,
+                    data_excluded_files, excluded_files_in_scope if data_excluded_files_needed else [])
+                if scan_leader:
+                    self.shared_scan = shared_scan
+                    break
+
+                self.progress("waiting_for_scan")
+                shared_scan_result = shared_scan.wait(self.cancel_token)
+                if shared_scan_result is not None:
+                    break
+                # The other search was cancelled, so the waiting searches look again,
+                # the first one scans and the others wait for it
+
+        if shared_scan_result is not None:
+            newest_fitting_cache_file = shared_scan_result["cache_file"]
+            newest_fitting_cache_file_c_date = shared_scan_result["cache_c_time"]
+            newest_fitting_cache_file_excluded_files = shared_scan_result["excluded_files"]
+
+        # If there is a fitting cache file and user didn't request new cache file to be created
+        if shared_scan_result is not None or (newest_fitting_cache_file is not None and not new_cache_file):
+            # Debug
+            logging.info(f"Scanning using cached data from {newest_fitting_cache_file or 'a scan of the batch'}"
+                         f" created at {time.ctime(newest_fitting_cache_file_c_date)}")
+
+            used_cache = True
+            # The cache keeps the excluded files of the scan it originated from
+            scanned_excluded_files = newest_fitting_cache_file_excluded_files
+
+            if shared_scan_result is not None:
+                cached_scan = shared_scan_result
+            elif self.cache_store is not None:
+                cached_scan = self.cache_store.load(newest_fitting_cache_file)
+            else:
+                cached_scan = load_cache_file(newest_fitting_cache_file)
+
+            path_list = cached_scan["path_list"]
+            type_dict = cached_scan["type_dict"]
+            # The indexes can contain paths outside the searched directory,
+            # that doesn't matter as they are only used to intersect or subtract from found_path_set
+            extension_index = cached_scan["extension_index"]
+            range_indexes = cached_scan["range_indexes"]
+            directory_aggregates = cached_scan["directory_aggregates"]
+            # The same goes for the stats of archive members
+            member_stats = cached_scan["member_stats"]
+            del cached_scan
+            found_path_set = set(path_list)
+
+            # If the found cache file is form the same directory as the one the search was for,
+            # a scan of the batch without a cache file only contains the directory it was scanned for
+            if (newest_fitting_cache_file == FF_Files.path_to_cache_file(data_search_from, folder_depth_global_limit) or
+                    batch_scan is not None and batch_scan["scanned"] and batch_scan["search_from"] == data_search_from):
+                # Debug
+                logging.debug("Cache file from the same directory as search")
+
+            # If it's a cache file from a parent dir
+            else:
+                # Debug
+                logging.debug("Cache file from an higher directory, sorting out unnecessary files")
+
+                keep_time = time.perf_counter()
+
+                # The other searches don't change the scan, but paths are removed from type_dict
+                if shared_scan_result is not None or self.cache_store is not None:
+                    type_dict = type_dict.copy()
+
+                # Remove irrelevant paths, with a separator at the end, so "/folder2" isn't in "/folder"
+                search_from_prefix = os.path.join(data_search_from, "")
+                for found_item in found_path_set.copy():
+                    if not found_item.startswith(search_from_prefix):
+                        found_path_set.remove(found_item)
+                        del type_dict[found_item]
+
+                # make sure the path isn't in the list
+                try:
+                    found_path_set.remove(data_search_from)
+                except (KeyError, NameError):
+                    pass
+                try:
+                    del type_dict[data_search_from]
+                except KeyError:
+                    pass
+
+                logging.debug(f"Sorting out unnecessary files took {perf_counter() - keep_time} sec.")
+
+        # If there is no newer cache file
+        else:
+
+            # Create empty lists for the files
+            found_path_set: set = set()
+            type_dict: dict = {}
+
+            used_cache = False
+
+            # Excluded folders are skipped while scanning, so they don't need to be filtered out later.
+            # They are saved in the cache metadata, so the cache is only used again if they are still excluded
+            if data_excluded_files_needed:
+                scanned_excluded_files = excluded_files_in_scope
+            else:
+                scanned_excluded_files = []
+
+            # Reading the ignore files of the parent folders
+            if data_use_ignore_files:
+                ignore_tree = FF_Matching.IgnoreTree(data_search_from)
+            else:
+                ignore_tree = None
+
+            # Sending the results found while scanning to the search window.
+            # The content of files is only searched after scanning, so "File contains" can't be streamed
+            if self.stream is not None and data_content_matcher is None:
+                result_stream = ResultStream(self.stream, self.compile_stream_filter(
+                    data_name_filter, data_library, data_search_for, allowed_filetypes, disallowed_filetypes,
+                    data_time, data_c_time_needed, data_m_time_needed, data_file_size_min, data_file_size_max,
+                    data_file_size_needed, data_query_plan))
+            else:
+                result_stream = None
+
+            # Going through every file and every folder using the os.walk() method
+            # Saving every file to found_path_set and the type (file or folder) to found_path_dict
+            # Only running this if folder_depth_global_limit == -1 which means that the folder depth is unlimited
+            if folder_depth_global_limit == -1:
+                # Not putting this into its own function as it would be noticeably slower
+                for (root, dirs, files) in os.walk(data_search_from):
+                    self.cancel_token.check()
+                    if data_excluded_files_needed:
+                        files, dirs[:] = self.remove_excluded(root, files, dirs, data_excluded_files)
+                    if ignore_tree is not None:
+                        files, dirs[:] = ignore_tree.remove_ignored(root, files, dirs)
+                    for file in files:
+                        # Saving types to the dictionaries
+                        type_dict[os.path.join(root, file)] = "file"
+                        # Saving the path to a list for fast access
+                        found_path_set.add(os.path.join(root, file))
+
+                    for directory in dirs:
+                        # Saving types to the dictionaries
+                        type_dict[os.path.join(root, directory)] = "folder"
+
+                        # Saving the path to a list for fast access
+                        found_path_set.add(os.path.join(root, directory))
+
+                    if result_stream is not None:
+                        result_stream.add_directory(root, files, dirs)
+            # If folder depth is used
+            else:
+                # Not putting this into its own function as it would be noticeably slower
+                for (root, dirs, files) in os.walk(data_search_from):
+                    self.cancel_token.check()
+                    if data_excluded_files_needed:
+                        files, dirs[:] = self.remove_excluded(root, files, dirs, data_excluded_files)
+                    if ignore_tree is not None:
+                        files, dirs[:] = ignore_tree.remove_ignored(root, files, dirs)
+                    if root.count(os.sep) <= folder_depth_global_limit:
+                        # If depth is in range
+                        for file in files:
+                            # Saving types to the dictionaries
+                            type_dict[os.path.join(root, file)] = "file"
+                            # Saving the path to a list for fast access
+                            found_path_set.add(os.path.join(root, file))
+                        for directory in dirs:
+                            # Saving types to the dictionaries
+                            type_dict[os.path.join(root, directory)] = "folder"
+
+                            # Saving the path to a list for fast access
+                            found_path_set.add(os.path.join(root, directory))
+
+                        if result_stream is not None:
+                            result_stream.add_directory(root, files, dirs)
+                    else:
+                        # Removing element from this list prevent python from visiting these directories
+                        for directory in dirs:
+                            dirs.remove(directory)
+
+            # Sending the remaining results
+            if result_stream is not None:
+                result_stream.flush()
+                # The values already read for the stream are used for the range indexes
+                streamed_range_values = result_stream.range_values
+            else:
+                streamed_range_values = {}
+
+            # The size and dates of archive members, as they can't be read from the disk
+            member_stats: dict = {}
+
+            # Adding the members of zip and tar archives like files and folders
+            if data_search_in_archives:
+                # Debug
+                logging.info("Reading archives...")
+                self.progress("scanning_archives")
+
+                for archive_file in [archive_file for archive_file in found_path_set
+                                     if type_dict[archive_file] == "file" and FF_Archive.is_archive(archive_file)]:
+                    self.cancel_token.check()
+                    for member_path, (member_is_folder, member_stat) in FF_Archive.read_members(archive_file).items():
+                        # The archive counts as a folder for the folder depth
+                        if folder_depth_global_limit == -1 or \
+                                member_path.count(os.sep) <= folder_depth_global_limit + 1:
+                            type_dict[member_path] = "folder" if member_is_folder else "file"
+                            found_path_set.add(member_path)
+                            member_stats[member_path] = member_stat
+
+            # Creating the index of all file extensions
+            extension_index = FF_Index.build_extension_index(found_path_set)
+
+            # Reading the size and dates of every path once and saving them sorted in the range indexes,
+            # so the size and date filters don't need to access the disk when using the cache
+            path_list = list(found_path_set)
+            range_values = [(member_stats[path].st_size, member_stats[path].st_mtime, member_stats[path].st_ctime)
+                            if path in member_stats else
+                            streamed_range_values.pop(path, None) or FF_Index.read_range_values(path)
+                            for path in self.cancel_token.check_iter(path_list)]
+            del streamed_range_values
+            range_indexes = FF_Index.build_range_indexes(range_values)
+
+            # Adding up the files of every folder and its subfolders, so folders can be skipped while filtering
+            # Archive members aren't added, as the size of the archive is already added
+            directory_aggregates = FF_Index.build_directory_aggregates(
+                [(path, path_values[0], path_values[1]) for path, path_values in zip(path_list, range_values)
+                 if type_dict[path] == "file" and path not in member_stats],
+                data_search_from)
+            del range_values
+
+        # Caching Results with json
+        # Testing if cache file exist, if it doesn't or isn't from the exact directory exist it caches scanned files
+        if not data_save_cache:
+            logging.info("Caching is turned off, skipping caching...")
+
+        elif (not used_cache or
+                newest_fitting_cache_file != FF_Files.path_to_cache_file(data_search_from, folder_depth_global_limit)):
+            # Debug and menu-bar log
+            logging.info("Caching Search Results...")
+            self.progress("caching")
+
+            # Creating file
+            with open(FF_Files.path_to_cache_file(data_search_from, folder_depth_global_limit), "w") as result_file:
+                # Dumping with json
+                # The range indexes refer to the positions in the list of paths, so both are saved together
+                cache_path_list, cache_range_indexes = FF_Index.dump_range_indexes(
+                    range_indexes, path_list, found_path_set)
+                dump({
+                    "found_path_set": cache_path_list,
+                    "range_indexes": cache_range_indexes,
+                    "directory_aggregates": FF_Index.dump_directory_aggregates(
+                        directory_aggregates, found_path_set),
+                    "type_dict": type_dict,
+                    "extension_index": FF_Index.dump_extension_index(extension_index, found_path_set),
+                    "archive_members": FF_Archive.dump_member_stats(member_stats, found_path_set)},
+                    result_file)
+
+            # Saving the cache creation time in a separate file for faster access
+            with open(FF_Files.path_to_cache_file(data_search_from, folder_depth_global_limit, metadata=True),
+                      "w") as time_write_file:
+                if used_cache:
+                    # Determining the number of parent directories by counting the default separators in the path
+                    # and then adding this value to the c_Time so the more specified cache gets used rather than
+                    # the broader cache which originated from the broader one.
+                    # Dividing by 10 so to only add fractions of a seconds to the c_time as
+                    # to not get ranked over newer caches.
+                    # Doing this so the already specialized cache gets used preferably
+                    c_time_adjust = data_search_from.count(os.sep) / 10
+                    logging.debug(f"Cache time {newest_fitting_cache_file_c_date} + adjuster: {c_time_adjust} "
+                                  f"= {newest_fitting_cache_file_c_date + c_time_adjust}")
+
+                    # Used old cache, save old time
+                    dump({"c_time": newest_fitting_cache_file_c_date + c_time_adjust,
+                          "cache_version": FF_Files.FF_CACHE_VERSION,
+                          "original_cache_file": newest_fitting_cache_file,
+                          "global_depth_limit": folder_depth_global_limit,
+                          "excluded_files": scanned_excluded_files,
+                          "use_ignore_files": data_use_ignore_files,
+                          "search_in_archives": data_search_in_archives,
+                          "path": data_search_from}, time_write_file)
+
+                else:
+                    logging.debug("Created brand new cache..")
+                    # New cache created
+                    new_cache_c_time = time.time()
+                    dump({"c_time": new_cache_c_time,
+                          "cache_version": FF_Files.FF_CACHE_VERSION,
+                          "original_cache_file": FF_Files.path_to_cache_file(data_search_from,
+                                                                             folder_depth_global_limit),
+                          "global_depth_limit": folder_depth_global_limit,
+                          "excluded_files": scanned_excluded_files,
+                          "use_ignore_files": data_use_ignore_files,
+                          "search_in_archives": data_search_in_archives,
+                          "path": data_search_from}, time_write_file)
+                    newest_fitting_cache_file = FF_Files.path_to_cache_file(data_search_from, folder_depth_global_limit)
+
+        else:
+            logging.info("Cache file already exist, skipping caching...")
+
+        # Sending the scan to the searches waiting for it, before filtering, as they filter it themselves
+        scan = {"path_list": path_list,
+                "type_dict": type_dict,
+                "extension_index": extension_index,
+                "range_indexes": range_indexes,
+                "directory_aggregates": directory_aggregates,
+                "member_stats": member_stats}
+        if self.shared_scan is not None:
+            FF_SharedScans.finish(self.shared_scan, {
+                "cache_file": newest_fitting_cache_file,
+                "cache_c_time": new_cache_c_time,
+                "excluded_files": scanned_excluded_files,
+                **scan})
+
+        # Keeping a new scan in memory, a scan from a cache file of a parent directory also contains other paths
+        if self.cache_store is not None and not used_cache and data_save_cache:
+            self.cache_store.add(newest_fitting_cache_file, scan)
+
+        # Keeping the scan for the other searches of the batch, with the paths left after the filters,
+        # which don't depend on the preset. Without saving the cache, there is no cache file and creation time
+        if self.batch_scans is not None and batch_scan is None:
+            batch_scan = self.batch_scans.add(
+                data_search_from, folder_depth_global_limit, data_use_ignore_files, data_search_in_archives,
+                scanned_excluded_files, {
+                    "cache_file": newest_fitting_cache_file if data_save_cache else None,
+                    "cache_c_time": (newest_fitting_cache_file_c_date if used_cache else
+                                     new_cache_c_time if data_save_cache else time.time()),
+                    "excluded_files": scanned_excluded_files,
+                    "search_from": data_search_from,
+                    "scanned": not used_cache,
+                    "entries": {},
+                    **scan})
+        del scan
+
+        # Saving time
+        time_after_searching = perf_counter() - time_before_start
+
+        # Debug
+        logging.info("Starting Indexing...")
+        # Update the menu-bar status
+        self.progress("indexing")
+
+        # The excluded files are only filtered out, if the scan didn't skip all of them
+        excluded_files_check_needed = data_excluded_files_needed and scanned_excluded_files != excluded_files_in_scope
+
+        # In a batch, the system files, dump files and excluded files are only removed once for every directory,
+        # so every preset only runs its own filters
+        if batch_scan is not None:
+            entries_key = (data_search_from, data_library,
+                           tuple(excluded_files_in_scope) if excluded_files_check_needed else ())
+            if entries_key not in batch_scan["entries"]:
+                batch_scan["entries"][entries_key] = self.remove_unwanted_files(
+                    found_path_set, data_library, excluded_files_check_needed)
+            found_path_set = batch_scan["entries"][entries_key]
+
+        # Creating a copy because items can't be removed while iterating over a set
+        copy_found_path_set = found_path_set.copy()
+
+        # If NumPy is installed, the date, size and files or folders filters are evaluated on all paths at once,
+        # so the following filters (like the name) only have to look at the remaining paths
+        columns_used = FF_Columns.numpy_available() and (
+                data_c_time_needed or data_m_time_needed or data_file_size_needed or data_search_for_needed)
+        if columns_used:
+            # Debug
+            logging.info("Filtering sizes and dates with columns...")
+            self.progress("indexing_columns")
+
+            column_table = FF_Columns.ColumnTable(path_list, range_indexes, type_dict)
+            copy_found_path_set.intersection_update(column_table.filter(
+                c_time_range=(data_time["c_date_from"], data_time["c_date_to"]) if data_c_time_needed else None,
+                m_time_range=(data_time["m_date_from"], data_time["m_date_to"]) if data_m_time_needed else None,
+                size_range=(data_file_size_min, data_file_size_max) if data_file_size_needed else None,
+                search_for=data_search_for if data_search_for_needed else None))
+            del column_table
+
+            # Making the copy and the original the same
+            found_path_set = copy_found_path_set.copy()
+
+        # Applies filters, when they don't match the function remove them from the found_path_dict
+        # Name
+        logging.info(f"Indexing Name \"{data_name_specifier}\"...")
+        self.progress("indexing_name")
+        if data_name_filter is not None:
+            # Scan every file
+            for name_file in self.cancel_token.check_iter(found_path_set):
+                if not data_name_filter(os.path.basename(name_file)):
+                    copy_found_path_set.remove(name_file)
+
+        # Making the copy and the original the same
+        found_path_set = copy_found_path_set.copy()
+
+        # System files, dump files and excluded files, in a batch they were already removed
+        if batch_scan is None:
+            found_path_set = self.remove_unwanted_files(found_path_set, data_library, excluded_files_check_needed)
+            copy_found_path_set = found_path_set.copy()
+
+        # Exclude or Include Folders or Files
+        logging.info("Indexing Exclude or Include Folders or Files...")
+        self.progress("indexing_files_folders")
+        # Already done with the columns
+        if data_search_for_needed and not columns_used:
+
+            # Checks for File
+            if data_search_for == "only Files":
+                for file_file in found_path_set:
+                    if type_dict[file_file] != "file":
+                        copy_found_path_set.remove(file_file)
+            # Checks for Directories
+            elif data_search_for == "only Folders":
+                for folder_file in found_path_set:
+                    if type_dict[folder_file] != "folder":
+                        copy_found_path_set.remove(folder_file)
+
+        # Making the copy and the original the same
+        found_path_set = copy_found_path_set.copy()
+        # Filter some unnecessary System Files
+        logging.info("Filtering for file types...")
+        self.progress("indexing_file_groups")
+
+        # Checking is not needed
+        if allowed_filetypes is not None:
+            # Using the extension index, so only the paths with fitting extensions have to be looked at
+            # if "other" files is activated
+            if "*" in allowed_filetypes:
+                copy_found_path_set.difference_update(
+                    FF_Index.paths_with_extensions(extension_index, disallowed_filetypes))
+
+            else:
+                copy_found_path_set.intersection_update(
+                    FF_Index.paths_with_extensions(extension_index, allowed_filetypes))
+
+        # Making the copy and the original the same
+        found_path_set = copy_found_path_set.copy()
+
+        # The aggregates of a folder only contain all files in it, if no file was skipped while scanning.
+        # With a separator at the end, so "/folder2" isn't in "/folder"
+        directory_aggregates_complete = (directory_aggregates is not None and
+                                         folder_depth_global_limit == -1 and not data_use_ignore_files and
+                                         not any(excluded_file.startswith(os.path.join(data_search_from, ""))
+                                                 for excluded_file in scanned_excluded_files))
+
+        # The date and size filters are answered with the range indexes, which return the positions in path_list.
+        # The positions of both date filters are intersected first, so the paths only have to be looked up once
+        range_matching_ids = None
+
+        # Checking for Date Created
+        # Checking if File Date is between Filter Dates
+        logging.info("Indexing Date created...")
+        self.progress("indexing_c_date")
+        if data_c_time_needed and not columns_used:
+            # (On Linux this currently returns the modification date,
+            # because it's impossible to access with pure python)
+            range_matching_ids = range_indexes["c_time"].query(data_time["c_date_from"], data_time["c_date_to"])
+
+        # Checking for Date Modified
+        logging.info("Indexing date modified...")
+        self.progress("indexing_m_date")
+        if data_m_time_needed and not columns_used:
+            m_time_matching_ids = range_indexes["m_time"].query(data_time["m_date_from"], data_time["m_date_to"])
+            if range_matching_ids is None:
+                range_matching_ids = m_time_matching_ids
+            else:
+                range_matching_ids &= m_time_matching_ids
+
+        if range_matching_ids is not None:
+            copy_found_path_set.intersection_update([path_list[path_id] for path_id in range_matching_ids])
+        del range_matching_ids
+
+        # Making the copy and the original the same
+        found_path_set = copy_found_path_set.copy()
+
+        # File Size
+        logging.info("Indexing file size...")
+        self.progress("indexing_file_size")
+        if data_file_size_needed:
+            # Files and archive members with the size index, if not already done with the columns
+            # Folders aren't in the size index, as their size is calculated from all files in them
+            if not columns_used:
+                size_matching_paths = {path_list[path_id] for path_id in
+                                       range_indexes["size"].query(data_file_size_min, data_file_size_max)}
+                size_matching_paths.update(size_folder for size_folder in found_path_set
+                                           if type_dict[size_folder] == "folder" and size_folder not in member_stats)
+                copy_found_path_set.intersection_update(size_matching_paths)
+                del size_matching_paths
+
+            # Archive members are in the size index with the size of all members in them
+            for size_folder in self.cancel_token.check_iter(found_path_set):
+                if type_dict[size_folder] == "folder" and size_folder not in member_stats:
+                    # Using the aggregates, so the folder doesn't have to be walked through again
+                    if directory_aggregates_complete:
+                        try:
+                            folder_size = directory_aggregates[size_folder].total_size
+                        except KeyError:
+                            # Folders without any files
+                            folder_size = 0
+                    else:
+                        folder_size = FF_Files.get_file_size(size_folder)
+                    if not data_file_size_max >= folder_size >= data_file_size_min:
+                        copy_found_path_set.remove(size_folder)
+
+        # Making the copy and the original the same
+        found_path_set = copy_found_path_set.copy()
+
+        # Query, all terms are evaluated in one pass, cheap terms first
+        logging.info("Filtering with query...")
+        self.progress("indexing_query")
+        if data_query_plan is not None:
+
+            # Folders, in which no file can match the query, according to their aggregates.
+            # Only the highest ones are kept, the aggregates of their subfolders can't match either
+            pruned_folders = set()
+            if directory_aggregates is not None:
+                pruned_folders = {folder for folder, aggregate in directory_aggregates.items()
+                                  if not data_query_plan.subtree_may_match(aggregate)}
+                pruned_folders = {folder for folder in pruned_folders
+                                  if not self.has_parent_in(folder, pruned_folders, data_search_from)}
+
+            # Removing the files in these folders at once, they are next to each other in the sorted paths.
+            # Folders are still tested, as their own values aren't in the aggregates,
+            # and so are archive members, as only the archive is added to the aggregates
+            query_paths = found_path_set
+            if pruned_folders:
+                sorted_paths = sorted(found_path_set)
+                for pruned_folder in pruned_folders:
+                    prefix = os.path.join(pruned_folder, "")
+                    # All paths starting with prefix, the last character is replaced with the next one
+                    pruned_paths = sorted_paths[bisect_left(sorted_paths, prefix):
+                                                bisect_left(sorted_paths, prefix[:-1] + chr(ord(prefix[-1]) + 1))]
+                    copy_found_path_set.difference_update(
+                        [pruned_path for pruned_path in pruned_paths
+                         if type_dict[pruned_path] != "folder" and pruned_path not in member_stats])
+                del sorted_paths
+                query_paths = copy_found_path_set.copy()
+
+            # The sizes and dates are taken from the scan, like for the other filters and the aggregates,
+            # so a file matches with the same values whether its folder was pruned or not
+            range_stats = {}
+            if data_query_plan.uses_stat:
+                sizes, m_times, c_times = (range_indexes[field].values_by_position()
+                                           for field in FF_Index.RANGE_INDEX_FIELDS)
+                for path_id, path in enumerate(path_list):
+                    if path in query_paths:
+                        # Paths, which couldn't be read while scanning, don't match like deleted files
+                        range_stats[path] = FF_Query.RangeStat(sizes[path_id], m_times[path_id], c_times[path_id]) \
+                            if m_times[path_id] != FF_Index.MISSING_VALUE else False
+                del sizes, m_times, c_times
+
+            # Looping through every file
+            for query_file in self.cancel_token.check_iter(query_paths):
+                query_stat = member_stats.get(query_file) or range_stats.get(query_file)
+                if type_dict[query_file] == "folder":
+                    # The size of folders is known from the aggregates
+                    if directory_aggregates_complete and query_file in directory_aggregates:
+                        query_folder_size = directory_aggregates[query_file].total_size
+                    else:
+                        query_folder_size = None
+                    if not data_query_plan.match(query_file, True, query_stat, query_folder_size):
+                        copy_found_path_set.remove(query_file)
+
+                elif not data_query_plan.match(query_file, False, query_stat):
+                    copy_found_path_set.remove(query_file)
+            del pruned_folders, query_paths, range_stats
+
+        # Making the copy and the original the same
+        found_path_set = copy_found_path_set.copy()
+
+        # File contains
+        logging.info("Indexing file contains...")
+        self.progress("indexing_file_content")
+        if data_content != "":
+            # Only files can contain something, archive members can't be read without extracting them
+            content_files = [content_file for content_file in found_path_set
+                             if type_dict[content_file] == "file" and content_file not in member_stats]
+
+            # Using the content index, if activated in the settings
+            # The index only contains words, so it can't be used for RegEx
+            if (data_content_index and
+                    data_content_matcher.mode != FF_Content.CONTENT_MODE_REGEX):
+                logging.info("Updating content index...")
+                self.progress("updating_content_index")
+
+                # Only new or changed files are read
+                content_index = FF_Content.ContentIndex(FF_Files.path_to_content_index(data_search_from))
+                content_index.update(content_files, self.cancel_token)
+                content_index.save()
+
+                # Only searching in the files, which contain all words of data_content
+                index_candidates = content_index.candidates(data_content, data_content_binary)
+                if index_candidates is not None:
+                    logging.debug(f"Content index found {len(index_candidates)} candidates")
+                    content_files = [content_file for content_file in content_files
+                                     if content_file in index_candidates]
+                del content_index
+
+                self.progress("indexing_file_content")
+
+            # The files are searched in parallel for many files
+            # Binary files (like images or archives) are skipped, unless searching in them was selected
+            # The first match of every file is kept, to display it in the results
+            content_matches = FF_Content.search_files(
+                content_files, data_content_matcher, search_binary=data_content_binary,
+                cancel_token=self.cancel_token)
+            copy_found_path_set.intersection_update(content_matches)
+        else:
+            content_matches = None
+
+        # Making the copy and the original the same and deleting the copy
+        found_path_set = copy_found_path_set.copy()
+        del copy_found_path_set
+
+        # Prints out files found
+        logging.info(f"Found {len(found_path_set)} Files and Folders")
+
+        # Creating a list for sorting from set and creating a backup for caching
+        found_path_list = list(found_path_set)
+
+        # Saving time
+        time_after_indexing = perf_counter() - (time_after_searching + time_before_start)
+
+        # Last chance to cancel, sorting and caching can't be stopped
+        self.cancel_token.check()
+
+        # The sort keys are saved in a key cache, which is shared with the duplicated and compare windows.
+        # The sizes and dates are taken from the range indexes, so no file has to be read again
+        key_cache = FF_SortKeys.SortKeyCache()
+        sort_key = None
+        if data_sort_by in ("File Size", "Date Modified", "Date Created"):
+            key_cache.add_range_indexes(path_list, range_indexes, found_path_set)
+            # Folders aren't in the size index, their size is taken from the aggregates if possible
+            if data_sort_by == "File Size" and directory_aggregates_complete:
+                for sort_folder in found_path_set:
+                    if type_dict[sort_folder] == "folder" and sort_folder not in member_stats:
+                        try:
+                            key_cache.add_size(sort_folder, directory_aggregates[sort_folder].total_size)
+                        except KeyError:
+                            # Folders without any files
+                            key_cache.add_size(sort_folder, 0)
+        if data_sort_by != "None (fastest)":
+            sort_key = key_cache.sort_key(data_sort_by, found_path_list)
+
+        # With a result limit only the first results are sorted and the others are kept to be loaded later
+        more_results = None
+        if data_result_limit and len(found_path_list) > data_result_limit:
+            logging.info(f"Sorting the first {data_result_limit} of {len(found_path_list)} results "
+                         f"by {data_sort_by}...")
+            self.progress("sorting_limited")
+
+            if sort_key is None:
+                # Not sorted, so the results keep their order
+                keyed_results = list(zip(range(len(found_path_list)), found_path_list))
+                largest_first = data_reverse_sort
+            else:
+                keyed_results = [(sort_key(path), path) for path in found_path_list]
+                # Sizes and dates are sorted with the largest first
+                largest_first = data_reverse_sort != (data_sort_by in ("File Size", "Date Modified", "Date Created"))
+
+            more_results = LimitedResults(keyed_results, largest_first)
+            del keyed_results
+            found_path_list = more_results.take(data_result_limit)
+
+        # Sorting
+        elif data_sort_by == "File Name":
+            logging.info("Sorting list by name...")
+            self.progress("sorting_name")
+            found_path_list.sort(key=sort_key, reverse=data_reverse_sort)
+
+        elif data_sort_by == "File Size":
+            logging.info("Sorting list by size...")
+            self.progress("sorting_size")
+            found_path_list.sort(key=sort_key, reverse=not data_reverse_sort)
+
+        elif data_sort_by == "Date Created":
+            logging.info(f"Sorting list by creation date on {platform}...")
+            self.progress("sorting_c_date")
+            found_path_list.sort(key=sort_key, reverse=not data_reverse_sort)
+
+        elif data_sort_by == "Date Modified":
+            logging.info("Sorting list by modification date...")
+            self.progress("sorting_m_date")
+            found_path_list.sort(key=sort_key, reverse=not data_reverse_sort)
+
+        elif data_sort_by == "Path":
+            logging.info("Sorting list by path...")
+            self.progress("sorting_path")
+            found_path_list.sort(key=sort_key, reverse=data_reverse_sort)
+
+        else:
+            logging.info("Skipping Sorting")
+            if data_reverse_sort:
+                logging.debug("Reversing Results...")
+                self.progress("sorting_reversed")
+                found_path_list = list(reversed(found_path_list))
+
+        # Sharing the sort keys with the other windows, missing keys are loaded from the cache file
+        key_cache.cache_file = newest_fitting_cache_file
+        if newest_fitting_cache_file is not None:
+            FF_SortKeys.set_key_cache(newest_fitting_cache_file, key_cache)
+
+        # The found folders, for showing the type without testing every path
+        found_folders = {found_path for found_path in found_path_set if type_dict[found_path] == "folder"}
+
+        # Calculating time
+        time_after_sorting = perf_counter() - (time_after_indexing + time_after_searching + time_before_start)
+        time_total = perf_counter() - time_before_start
+
+        # Cleaning Memory
+        del type_dict, extension_index, range_indexes, directory_aggregates, path_list, member_stats
+        del found_path_set
+
+        # Debug
+        logging.info("Finished Searching!")
+
+        # The result with the timing of this search
+        return SearchResult({"time_total": time_total,
+                             "time_searching": time_after_searching,
+                             "time_indexing": time_after_indexing,
+                             "time_sorting": time_after_sorting},
+                            found_path_list, data_search_from, newest_fitting_cache_file, content_matches, more_results,
+                            found_folders, key_cache)
+
+    # Removing the system files (if they aren't searched in), the dump files and the excluded files,
+    # which weren't skipped while scanning. Returns the paths left, found_path_set isn't changed
+    def remove_unwanted_files(self, found_path_set: set, library: bool, excluded_files_needed: bool) -> set:
+        # Creating a copy because items can't be removed while iterating over a set
+        copy_found_path_set = found_path_set.copy()
+
+        # Search in System Files
+        logging.info("Indexing System Files...")
+        self.progress("indexing_system_files")
+        if not library:
+            # Scan every file
+            for library_file in self.cancel_token.check_iter(found_path_set):
+                if FF_Files.is_system_file(library_file):
+                    # Remove the file
+                    copy_found_path_set.remove(library_file)
+
+        # Making the copy and the original the same
+        found_path_set = copy_found_path_set.copy()
+
+        # Filter some unnecessary System Files
+        logging.info("Removing dump files...")
+        self.progress("indexing_dump_files")
+
+        for system_file in self.cancel_token.check_iter(found_path_set):
+            if os.path.basename(system_file).lower() in FF_Files.DUMP_FILE_NAMES:
+                copy_found_path_set.remove(system_file)
+
+        # Making the copy and the original the same
+        found_path_set = copy_found_path_set.copy()
+
+        # Excluded Files
+        logging.info("Filtering excluded files...")
+        self.progress("indexing_excluded")
+        # Only needed if the cache was scanned without all of these files excluded
+        if excluded_files_needed:
+            for test_file in found_path_set:
+                if self.excluded_files.match(test_file):
+                    copy_found_path_set.remove(test_file)
+
+        return copy_found_path_set
+
+    # Testing if a parent folder of path, up to the searched directory, is in folders
+    @staticmethod
+    def has_parent_in(path: str, folders: set, search_from: str) -> bool:
+        while path != search_from:
+            parent_path = os.path.dirname(path)
+            # The root directory is its own parent
+            if parent_path == path:
+                return False
+            path = parent_path
+            if path in folders:
+                return True
+        return False
+
+    # Removing excluded files and folders while scanning with os.walk(),
+    # os.walk() doesn't go into the folders that are removed from dirs
+    @staticmethod
+    def remove_excluded(root: str, files: list, dirs: list, excluded_files: FF_Matching.PrefixSet):
+        kept_files = [file for file in files if not excluded_files.match(os.path.join(root, file))]
+        kept_dirs = [directory for directory in dirs if not excluded_files.match(os.path.join(root, directory))]
+        return kept_files, kept_dirs
+
+    # Creating the filter for the results sent while scanning, it applies the same filters as the search,
+    # one path at a time. The size and dates read are saved in range_values, so they aren't read again.
+    # Folders aren't sent, if their size is needed, as it is only known after scanning
+    @staticmethod
+    def compile_stream_filter(name_filter, data_library, data_search_for, allowed_filetypes, disallowed_filetypes,
+                              data_time, data_c_time_needed, data_m_time_needed, data_file_size_min, data_file_size_max,
+                              data_file_size_needed, data_query_plan):
+        # The file types, like with the extension index
+        if allowed_filetypes is None:
+            file_endings = None
+        elif "*" in allowed_filetypes:
+            file_endings = tuple(f".{file_ending}" for file_ending in disallowed_filetypes)
+        else:
+            file_endings = tuple(f".{file_ending}" for file_ending in allowed_filetypes)
+
+        def stream_filter(path: str, is_folder: bool, range_values: dict) -> bool:
+            basename = os.path.basename(path)
+            if name_filter is not None and not name_filter(basename):
+                return False
+            if not data_library and FF_Files.is_system_file(path):
+                return False
+            if (data_search_for == "only Files" and is_folder) or (data_search_for == "only Folders" and not is_folder):
+                return False
+            if file_endings is not None and path.lower().endswith(file_endings) == ("*" in allowed_filetypes):
+                return False
+            if basename.lower() in FF_Files.DUMP_FILE_NAMES:
+                return False
+            if is_folder and (data_file_size_needed or data_query_plan is not None):
+                return False
+
+            if data_c_time_needed or data_m_time_needed or data_file_size_needed:
+                size, m_time, c_time = range_values[path] = FF_Index.read_range_values(path)
+                if data_c_time_needed and not data_time["c_date_from"] <= c_time <= data_time["c_date_to"]:
+                    return False
+                if data_m_time_needed and not data_time["m_date_from"] <= m_time <= data_time["m_date_to"]:
+                    return False
+                if data_file_size_needed and not data_file_size_min <= size <= data_file_size_max:
+                    return False
+
+            return data_query_plan is None or data_query_plan.match(path, is_folder)
+
+        return stream_filter
+
+
+# Running the searches of several queries (like filter presets) one after the other, loading the scope only once:
+# the scan or cache file used by a search is kept in memory (see BatchScans) and used by the following searches,
+# which only run their own filters on it.
+# Searches in higher directories are run first, so the searches in their subfolders use their scan.
+# queries is a dict of queries by name, progress is called with the name and the stage
+class BatchSearch:
+    def __init__(self, queries: dict, progress=None, cancel_token: FF_Cancel.CancelToken = None):
+        self.names = list(queries.keys())
+        progress = progress if progress is not None else lambda name, stage: None
+        self.cancel_token = cancel_token if cancel_token is not None else FF_Cancel.CancelToken()
+        # Shared by the searches
+        self.cache_store = CacheStore()
+        self.batch_scans = BatchScans()
+
+        # Testing every query before searching, raises QueryError with the name of the invalid query
+        self.engines = {}
+        # A directory is only scanned again once, the searches in it and its subfolders use the new scan
+        for name, query in sorted(queries.items(), key=lambda named_query: named_query[1].search_from.count(os.sep)):
+            try:
+                self.engines[name] = SearchEngine(
+                    query, progress=lambda stage, query_name=name: progress(query_name, stage),
+                    cancel_token=self.cancel_token, cache_store=self.cache_store, batch_scans=self.batch_scans)
+            except QueryError as query_error:
+                # Debug
+                logging.error(f"The filters of {name} are invalid")
+                raise QueryError(query_error.title, f"{name}\n\n{query_error.message}")
+
+    # Running the searches, returns a SearchResult for every query by name, in the order of the queries.
+    # Raises FF_Cancel.SearchCancelled, if it was cancelled
+    def run(self) -> dict:
+        search_results = {}
+        for name, engine in self.engines.items():
+            # Debug
+            logging.info(f"Searching with {name}...")
+            search_results[name] = engine.run()
+
+        return {name: search_results[name] for name in self.names}
+
+
+# The minimal time between two batches of results sent while scanning, in seconds
+STREAM_INTERVAL = 0.25
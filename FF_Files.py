@@ -14,18 +14,17 @@ import logging
 from json import load, dump, JSONDecodeError
 from sys import platform
 from time import time
+from datetime import date
 import hashlib
 
-from PySide6.QtCore import QDate, Qt
-
 # Versions
 VERSION: str = "21-june-2025"
 VERSION_SHORT: str = "2.0"
 # Versions of file formats
-FF_FILTER_VERSION = 2
+FF_FILTER_VERSION = 3
 FF_SEARCH_VERSION = 2
 FF_SETTINGS_VERSION = 1
-FF_CACHE_VERSION = 3
+FF_CACHE_VERSION = 7
 
 # Defining folder variables and font sizes
 USER_FOLDER = os.path.expanduser("~")
@@ -44,7 +43,10 @@ else:
 
 CACHED_SEARCHES_FOLDER = os.path.join(FF_LIB_FOLDER, "Cached Searches")
 CACHE_METADATA_FOLDER = os.path.join(FF_LIB_FOLDER, "Cache Metadata")
+CONTENT_INDEX_FOLDER = os.path.join(FF_LIB_FOLDER, "Content Index")
 ASSETS_FOLDER = os.path.join(FF_LIB_FOLDER, "assets")
+# The Unix socket of the query server (see FF_Server)
+SERVER_SOCKET = os.path.join(FF_LIB_FOLDER, "Server.sock")
 
 SELECTED_DIR = USER_FOLDER
 
@@ -98,6 +100,10 @@ DEFAULT_SETTINGS = {"settings_version": FF_SETTINGS_VERSION,
                     "version": f"{VERSION_SHORT}[{VERSION}]",
                     "cache_version": FF_CACHE_VERSION,
                     "excluded_files": [],
+                    "use_ignore_files": False,
+                    "content_index": False,
+                    "search_in_archives": False,
+                    "stream_results": False,
                     "cache": "after two hours",
                     "popup":
                         {"FF_ver_welcome": False,
@@ -112,14 +118,33 @@ DEFAULT_FILTER = {"VERSION": FF_FILTER_VERSION,
                   "name": "", "name_specifier": "contains:", "consider_case": False, "similarity": 60,
                   "file_types": FILE_FORMATS.keys(),
                   "file_extension": "", "file_type_mode": "predefined",
-                  "directory": USER_FOLDER,
+                  "directory": USER_FOLDER, "query": "",
                   "dates": {"m_date_from": "2000-01-01", "c_date_from": "2000-01-01",
-                            "m_date_to": QDate.currentDate().toString(Qt.DateFormat.ISODate),
-                            "c_date_to": QDate.currentDate().toString(Qt.DateFormat.ISODate)},
+                            "m_date_to": date.today().isoformat(),
+                            "c_date_to": date.today().isoformat()},
                   "size": {"min": "", "max": ""}, "size_unit": {"min": "No Limit", "max": "No Limit"},
                   "folder_depth": "Unlimited", "folder_depth_custom": 0,
-                  "file_contains": "", "hidden_files": False,
-                  "files_folders": 0, "sorting": 0, "reverse_sorting": False}
+                  "file_contains": "", "file_contains_binary": False, "file_contains_mode": "Text",
+                  "hidden_files": False,
+                  "files_folders": 0, "sorting": 0, "reverse_sorting": False, "result_limit": 0}
+
+# System files, which are only searched if "Search for system files" is activated,
+# paths starting with one of the prefixes or containing one of the parts
+if platform == "darwin":
+    SYSTEM_FILE_PREFIXES = ("/private", "/var", "/System")
+    SYSTEM_FILE_PARTS = ("/Library", "/.")
+elif platform == "win32" or platform == "cygwin":
+    SYSTEM_FILE_PREFIXES = ("C:\\Windows", "C:\\ProgramData")
+    SYSTEM_FILE_PARTS = ("\\AppData",)
+elif platform == "linux":
+    SYSTEM_FILE_PREFIXES = ("/var", "/lib")
+    SYSTEM_FILE_PARTS = ("/.",)
+else:
+    SYSTEM_FILE_PREFIXES = ()
+    SYSTEM_FILE_PARTS = ()
+
+# Files created by the operating system, which are never shown (lowercase)
+DUMP_FILE_NAMES = (".ds_store", ".localized", "desktop.ini", "thumbs.db")
 
 # Color schemes
 RED_LIGHT_THEME_COLOR = "#b1100c"
@@ -151,11 +176,31 @@ def path_to_cache_file(path, depth, metadata=False):
         return logging.fatal("Wrong arguments used with the convert_path_to_cache_file() function in FF_Files.py")
 
 
+# Returns the path to the content index of a directory
+# If a parent directory already has an index, it is used instead
+def path_to_content_index(path):
+    folder = path
+    while True:
+        index_file = os.path.join(CONTENT_INDEX_FOLDER, folder.replace(os.sep, "-") + ".FFIndex")
+        if os.path.exists(index_file):
+            return index_file
+        # Reached the top most folder
+        if os.path.dirname(folder) == folder:
+            return os.path.join(CONTENT_INDEX_FOLDER, path.replace(os.sep, "-") + ".FFIndex")
+        folder = os.path.dirname(folder)
+
+
 # Takes a path to a cache file and returns the path to the metadata file
 def get_metadata_file_from_cache_file(cache_file):
     return CACHE_METADATA_FOLDER + (cache_file.removeprefix(CACHED_SEARCHES_FOLDER))
 
 
+# Loading the value of a setting, without the user-interface (see FF_Settings.SettingsWindow.load_setting())
+def load_setting(setting_key):
+    with open(os.path.join(FF_LIB_FOLDER, "Settings")) as read_file:
+        return load(read_file)[setting_key]
+
+
 # Test if Cache should be deleted
 def cache_test(is_launching):
     logging.debug("Testing if cache should be deleted..")
@@ -218,6 +263,11 @@ def cache_test(is_launching):
     logging.debug("Finished Cache Testing!\n")
 
 
+# Testing if a path is a system file (see SYSTEM_FILE_PREFIXES)
+def is_system_file(path: str) -> bool:
+    return path.startswith(SYSTEM_FILE_PREFIXES) or any(part in path for part in SYSTEM_FILE_PARTS)
+
+
 # Function to get the File Size of a directory
 def get_file_size(input_file: str) -> int:
     if os.path.islink(input_file):
@@ -278,6 +328,7 @@ def setup():
     # Creating necessary directories
     os.makedirs(CACHED_SEARCHES_FOLDER, exist_ok=True)
     os.makedirs(CACHE_METADATA_FOLDER, exist_ok=True)
+    os.makedirs(CONTENT_INDEX_FOLDER, exist_ok=True)
     os.makedirs(ASSETS_FOLDER, exist_ok=True)
 
     # Setting up Settings File
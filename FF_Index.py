@@ -0,0 +1,257 @@
+# This source file is a part of File Find made by Pixel-Master
+#
+# Copyright 2022-2025 Pixel-Master
+#
+# This software is licensed under the "GPLv3" License as described in the "LICENSE" file,
+# which should be included with this package. The terms are also available at
+# http://www.gnu.org/licenses/gpl-3.0.html
+
+# This file contains the indexes, which are saved together with the cache, to speed up filtering
+
+# Imports
+import os
+import stat
+from array import array
+from bisect import bisect_left, bisect_right
+from sys import platform
+
+# Saved instead of a size or date for paths, which couldn't be read while scanning, so they are in no range
+MISSING_VALUE = float("-inf")
+
+# The values of every path, which are saved in the range indexes
+RANGE_INDEX_FIELDS = ("size", "m_time", "c_time")
+
+
+# Getting the lowercase file extension (without the dot) from a path
+# Returns None if the name has no dot at all
+def get_extension(path: str):
+    basename = os.path.basename(path)
+    if "." not in basename:
+        return None
+    return basename.rpartition(".")[2].lower()
+
+
+# Building a dict with every extension and a set of all paths with this extension
+# Paths without an extension aren't added to the index
+def build_extension_index(paths) -> dict:
+    extension_index = {}
+    for path in paths:
+        extension = get_extension(path)
+        if extension is not None:
+            try:
+                extension_index[extension].add(path)
+            except KeyError:
+                extension_index[extension] = {path}
+    return extension_index
+
+
+# Converting the extension index to be saved with json and back
+def dump_extension_index(extension_index: dict, found_path_set: set) -> dict:
+    # Only saving paths which are also in found_path_set,
+    # as the index could come from a cache file of a higher directory
+    return {extension: [path for path in paths if path in found_path_set]
+            for extension, paths in extension_index.items()}
+
+
+def load_extension_index(dumped_extension_index: dict) -> dict:
+    return {extension: set(paths) for extension, paths in dumped_extension_index.items()}
+
+
+# Getting all paths which end with one of the file endings (without the leading dot)
+# Does the same as path.lower().endswith(f".{file_ending}") for every path, but only looks at the matching buckets
+def paths_with_extensions(extension_index: dict, file_endings) -> set:
+    matching_paths = set()
+    for file_ending in file_endings:
+        # Endings with a dot, like "tar.gz", are stored under the last part "gz",
+        # so the paths in there need to be checked again
+        bucket = extension_index.get(file_ending.rpartition(".")[2], ())
+        if "." in file_ending:
+            for path in bucket:
+                if path.lower().endswith(f".{file_ending}"):
+                    matching_paths.add(path)
+        else:
+            matching_paths.update(bucket)
+    return matching_paths
+
+
+# Reading the size, date modified and date created of a path for the range indexes
+# Folders, links and special files get a size of -1,
+# as FF_Files.get_file_size() calculates the size of folders from all files in them and doesn't follow links
+def read_range_values(path: str) -> tuple:
+    try:
+        path_stat = os.lstat(path)
+        if stat.S_ISREG(path_stat.st_mode):
+            size = path_stat.st_size
+        else:
+            size = -1
+            # The dates of links are the ones of the file they link to
+            if stat.S_ISLNK(path_stat.st_mode):
+                path_stat = os.stat(path)
+    except OSError:
+        return MISSING_VALUE, MISSING_VALUE, MISSING_VALUE
+
+    # On macOS using st_birthtime, because os.path.getctime returns a wrong date
+    if platform == "darwin":
+        return size, path_stat.st_mtime, path_stat.st_birthtime
+    else:
+        return size, path_stat.st_mtime, path_stat.st_ctime
+
+
+# Values of every path sorted in an array, together with the position of the path in the list of all paths.
+# A range of values can then be found with two binary searches
+class RangeIndex:
+    def __init__(self, sorted_values: array, order: array):
+        self.sorted_values = sorted_values
+        # order[i] is the position of the path with the value sorted_values[i]
+        self.order = order
+
+    # Building the index from a value for every path
+    @staticmethod
+    def build(values) -> "RangeIndex":
+        order = array("q", sorted(range(len(values)), key=values.__getitem__))
+        return RangeIndex(array("d", (values[path_id] for path_id in order)), order)
+
+    # Getting the positions of all paths with lower <= value <= upper
+    def query(self, lower: float, upper: float) -> set:
+        return set(self.order[bisect_left(self.sorted_values, lower):bisect_right(self.sorted_values, upper)])
+
+    # Getting the value of every path at the position of the path, like before sorting
+    def values_by_position(self) -> array:
+        values = array("d", bytes(8 * len(self.order)))
+        for value, path_id in zip(self.sorted_values, self.order):
+            values[path_id] = value
+        return values
+
+    # Only keeping some paths, new_ids maps the old positions of the kept paths to their new positions
+    # The values stay sorted, so sorting again isn't needed
+    def subset(self, new_ids: dict) -> "RangeIndex":
+        sorted_values = array("d")
+        order = array("q")
+        for value, path_id in zip(self.sorted_values, self.order):
+            if path_id in new_ids:
+                sorted_values.append(value)
+                order.append(new_ids[path_id])
+        return RangeIndex(sorted_values, order)
+
+
+# Building the range indexes from a list of paths and a tuple of values for every path (see read_range_values())
+def build_range_indexes(range_values: list) -> dict:
+    return {field: RangeIndex.build([path_values[field_number] for path_values in range_values])
+            for field_number, field in enumerate(RANGE_INDEX_FIELDS)}
+
+
+# Converting the range indexes to be saved with json and back
+# The indexes refer to the positions in path_list, so only the paths in found_path_set are kept
+# and the new list of paths is returned as well
+def dump_range_indexes(range_indexes: dict, path_list: list, found_path_set: set) -> tuple:
+    kept_path_list = [path for path in path_list if path in found_path_set]
+    if len(kept_path_list) != len(path_list):
+        new_ids = {}
+        for path_id, path in enumerate(path_list):
+            if path in found_path_set:
+                new_ids[path_id] = len(new_ids)
+        range_indexes = {field: range_index.subset(new_ids) for field, range_index in range_indexes.items()}
+
+    return kept_path_list, {field: {"values": range_index.sorted_values.tolist(), "order": range_index.order.tolist()}
+                            for field, range_index in range_indexes.items()}
+
+
+def load_range_indexes(dumped_range_indexes: dict) -> dict:
+    return {field: RangeIndex(array("d", dumped_range_index["values"]), array("q", dumped_range_index["order"]))
+            for field, dumped_range_index in dumped_range_indexes.items()}
+
+
+# Removing paths from the content of a loaded cache file, while keeping the range indexes valid
+def remove_from_cache(cached_content: dict, removed_paths) -> None:
+    removed_paths = set(removed_paths).intersection(cached_content["found_path_set"])
+    if not removed_paths:
+        return
+    kept_paths = set(cached_content["found_path_set"]).difference(removed_paths)
+    cached_content["found_path_set"], cached_content["range_indexes"] = dump_range_indexes(
+        load_range_indexes(cached_content["range_indexes"]), cached_content["found_path_set"], kept_paths)
+
+
+# Values of all files in a folder and its subfolders, used to skip folders in which no file can match
+class DirectoryAggregate:
+    __slots__ = ("file_count", "total_size", "min_m_time", "max_m_time", "extensions")
+
+    def __init__(self, file_count: int = 0, total_size: int = 0, min_m_time: float = float("inf"),
+                 max_m_time: float = float("-inf"), extensions=()):
+        self.file_count = file_count
+        self.total_size = total_size
+        self.min_m_time = min_m_time
+        self.max_m_time = max_m_time
+        self.extensions = set(extensions)
+
+    # Adding the values of a subfolder
+    def merge(self, other: "DirectoryAggregate"):
+        self.file_count += other.file_count
+        self.total_size += other.total_size
+        self.min_m_time = min(self.min_m_time, other.min_m_time)
+        self.max_m_time = max(self.max_m_time, other.max_m_time)
+        self.extensions.update(other.extensions)
+
+
+# Building the aggregates of every folder from a list of (path, size, date modified) of all files.
+# Every file is added to its folder first, then the folders are added to their parent folders,
+# starting with the deepest ones, so every file is only looked at once
+def build_directory_aggregates(file_values, search_from: str) -> dict:
+    directory_aggregates = {}
+    for path, size, m_time in file_values:
+        directory = os.path.dirname(path)
+        try:
+            aggregate = directory_aggregates[directory]
+        except KeyError:
+            aggregate = directory_aggregates[directory] = DirectoryAggregate()
+
+        aggregate.file_count += 1
+        # Sizes and dates of files, which couldn't be read, aren't added
+        if size > 0:
+            aggregate.total_size += size
+        if m_time != MISSING_VALUE:
+            aggregate.min_m_time = min(aggregate.min_m_time, m_time)
+            aggregate.max_m_time = max(aggregate.max_m_time, m_time)
+        extension = get_extension(path)
+        if extension is not None:
+            aggregate.extensions.add(extension)
+
+    # Sorting the folders by their depth
+    search_from_depth = search_from.rstrip(os.sep).count(os.sep)
+    directories_by_depth = {}
+    for directory in directory_aggregates:
+        directories_by_depth.setdefault(directory.count(os.sep), []).append(directory)
+
+    # Adding every folder to its parent, until the searched directory is reached
+    # Parents, which don't contain files directly, are created on the way
+    for depth in range(max(directories_by_depth, default=0), search_from_depth, -1):
+        for directory in directories_by_depth.get(depth, ()):
+            parent_directory = os.path.dirname(directory)
+            # The root directory is its own parent
+            if parent_directory == directory:
+                continue
+            try:
+                directory_aggregates[parent_directory].merge(directory_aggregates[directory])
+            except KeyError:
+                parent_aggregate = directory_aggregates[parent_directory] = DirectoryAggregate()
+                parent_aggregate.merge(directory_aggregates[directory])
+                directories_by_depth.setdefault(depth - 1, []).append(parent_directory)
+
+    return directory_aggregates
+
+
+# Converting the aggregates to be saved with json and back
+# None is used for caches without aggregates, like the ones created from saved searches
+def dump_directory_aggregates(directory_aggregates: dict | None, found_path_set: set) -> dict | None:
+    if directory_aggregates is None:
+        return None
+    # Only saving folders which are also in found_path_set,
+    # as the aggregates could come from a cache file of a higher directory
+    return {directory: [aggregate.file_count, aggregate.total_size, aggregate.min_m_time, aggregate.max_m_time,
+                        list(aggregate.extensions)]
+            for directory, aggregate in directory_aggregates.items() if directory in found_path_set}
+
+
+def load_directory_aggregates(dumped_directory_aggregates: dict | None) -> dict | None:
+    if dumped_directory_aggregates is None:
+        return None
+    return {directory: DirectoryAggregate(*aggregate) for directory, aggregate in dumped_directory_aggregates.items()}
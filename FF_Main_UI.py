@@ -24,8 +24,11 @@ from PySide6.QtWidgets import QWidget, QLabel, QPushButton, QRadioButton, QFileD
 
 # Projects Libraries
 import FF_Additional_UI
+import FF_Content
+import FF_Engine
 import FF_Files
 import FF_About_UI
+import FF_Matching
 import FF_Search
 import FF_Settings
 
@@ -105,7 +108,10 @@ class MainWindow:
                 "Matching percentage can be set separately.\n\n"
                 "Name \"doesn't contain\":\n  Input must not be included in its entirety in the file name.\n\n"
                 "Name \"in RegEx\":\n  Does a regular expression pattern matching. For a detailed explanation refer to:"
-                " https://regular-expressions.info",
+                " https://regular-expressions.info\n\n"
+                "Name \"is one of\" and \"contains one of\":\n  Input can be a list of names separated by a semicolon "
+                "or new lines (for example: \"a.txt;b.txt\"). The file name must be or contain one of them.\n"
+                "  A list can also be pasted or loaded from a text file (File > Load list of names...).",
                 "Name \"is:\", Example.txt",
                 os.path.join(FF_Files.USER_FOLDER, "Example.txt")))
         self.basic_search_widget_layout.addWidget(label_name, 0, 1)
@@ -140,6 +146,24 @@ class MainWindow:
                                      "example.pdf")))
         self.basic_search_widget_layout.addWidget(label_directory, 3, 1)
 
+        label_query = self.generate_large_filter_label(
+            "Query:",
+            self.basic_search_widget,
+            self.generic_tooltip(
+                "Query",
+                "Combine multiple conditions with AND, OR, NOT and parentheses. Used together with the other filters."
+                "\n\nname:report.txt / name:~report / name:^report  Name is / contains / begins with report"
+                "\npath:/archive/  Path contains /archive/"
+                "\next:pdf,docx  File extension is pdf or docx"
+                "\ntype:file / type:folder  Only files / folders"
+                "\nsize>10MB  Size is larger than 10 MB (units: B, KB, MB, GB, TB)"
+                "\nmtime>2024-01-01 / ctime<-7d  Modified after 1.Jan.2024 / created more than seven days ago"
+                "\ndepth<=1  At most in the first subfolder"
+                "\ncontent:\"foo bar\"  File contains foo bar",
+                "name:~report AND ext:pdf,docx AND NOT path:/archive/ AND size>10MB AND mtime>2024-01-01",
+                os.path.join(FF_Files.USER_FOLDER, "Documents", "Report 2024.pdf")))
+        self.basic_search_widget_layout.addWidget(label_query, 4, 1)
+
         # -----File Content-----
         # Tab and Label
         # Creating a new QWidget for the properties tab
@@ -238,10 +262,10 @@ class MainWindow:
             self.generic_tooltip(
                 "File contains:",
                 "Allows you to search in files. Input must be in the file content."
-                "\nInput is case-sensitive."
+                "\nInput is case-sensitive, unless \"Text (ignore case)\" is selected. Can also be a RegEx."
+                "\nHover over a result to see the line of the first match."
                 "\nOnly allows raw text files such as .txt or source code, MS-Office or PDFs are not supported."
-                "\n\n"
-                "This option can take really long.\n",
+                "\nBinary files are skipped, unless \"Search in binary files\" is selected.\n",
                 "This is an example file!",
                 os.path.join(FF_Files.USER_FOLDER, "example.txt (which contains: \"This is an example file!\")")))
         self.advanced_search_widget_layout.addWidget(label_file_contains, 3, 1)
@@ -267,7 +291,7 @@ class MainWindow:
         self.sorting_widget_layout.addItem(QSpacerItem(600, 0, hData=QSizePolicy.Policy.Expanding), 1, 0)
         self.sorting_widget_layout.addItem(QSpacerItem(600, 0, hData=QSizePolicy.Policy.Expanding), 1, 6)
         self.sorting_widget_layout.addItem(QSpacerItem(0, 10, vData=QSizePolicy.Policy.Expanding), 0, 0)
-        self.sorting_widget_layout.addItem(QSpacerItem(0, 10, vData=QSizePolicy.Policy.Expanding), 3, 0)
+        self.sorting_widget_layout.addItem(QSpacerItem(0, 10, vData=QSizePolicy.Policy.Expanding), 4, 0)
         # Add Tab
         self.tabbed_widget.addTab(self.sorting_widget, "Sorting")
 
@@ -280,6 +304,16 @@ class MainWindow:
                                  "Results sorted by file size"))
         self.sorting_widget_layout.addWidget(label_sort_by, 1, 1)
 
+        label_result_limit = self.generate_large_filter_label(
+            "Result limit:",
+            self.sorting_widget,
+            self.generic_tooltip("Result limit",
+                                 "Only show the first results, more can be loaded in the results window.\n"
+                                 "Only the shown results are sorted, which is much faster for large searches.",
+                                 "100",
+                                 "The 100 largest files, if sorted by file size"))
+        self.sorting_widget_layout.addWidget(label_result_limit, 3, 1)
+
         # -----Terminal Command-----
         # Label, saying command
         label_command_title = QLabel(self.Root_Window)
@@ -344,10 +378,35 @@ class MainWindow:
         # Place in layout
         self.basic_search_widget_layout.addWidget(self.edit_directory, 3, 2, 1, 3)
 
+        # Query
+        self.edit_query = self.generate_filter_entry(self.basic_search_widget)
+        self.edit_query.setPlaceholderText("e.g. name:~report AND ext:pdf,docx AND size>10MB")
+        # Place
+        self.basic_search_widget_layout.addWidget(self.edit_query, 4, 2, 1, 5)
+
         # File contains
         self.edit_file_contains = self.generate_filter_entry(self.properties_widget)
         self.advanced_search_widget_layout.addWidget(self.edit_file_contains, 3, 2)
 
+        # Content search mode
+        self.combobox_content_mode = QComboBox(self.advanced_search_widget)
+        self.combobox_content_mode.addItems(FF_Content.CONTENT_MODES)
+        self.combobox_content_mode.setToolTip(
+            "Text: The file must contain the input, case-sensitive\n"
+            "Text (ignore case): The file must contain the input, ignoring the case of A-Z\n"
+            "RegEx: The file must match the regular expression, refer to: https://regular-expressions.info")
+        self.advanced_search_widget_layout.addWidget(self.combobox_content_mode, 3, 3)
+
+        # Search in binary files
+        self.content_binary_check_box = QCheckBox(" Search in binary files", self.Root_Window)
+        self.content_binary_check_box.setToolTip(
+            self.generic_tooltip("Search in binary files",
+                                 "Toggle to also search the content of binary files like images, videos, archives "
+                                 "or executables.\nOtherwise they are skipped, which is a lot faster.",
+                                 "Yes",
+                                 os.path.join(FF_Files.USER_FOLDER, "example.bin")))
+        self.advanced_search_widget_layout.addWidget(self.content_binary_check_box, 3, 4)
+
         # File size
 
         # File size min
@@ -464,6 +523,14 @@ class MainWindow:
         # Add the button to the layout
         self.sorting_widget_layout.addWidget(self.reverse_sorting_check_box, 2, 2)
 
+        # Result limit, 0 means all results are shown
+        self.result_limit_spinbox = QSpinBox(self.sorting_widget)
+        self.result_limit_spinbox.setMaximum(1000000)
+        self.result_limit_spinbox.setSingleStep(100)
+        self.result_limit_spinbox.setSpecialValueText("No limit")
+        self.result_limit_spinbox.setFixedWidth(150)
+        self.sorting_widget_layout.addWidget(self.result_limit_spinbox, 3, 2, 1, 4)
+
         # Hide when "None" is selected because there is no value in having it around
         def hide_show_reverse_sort():
             if self.combobox_sorting.currentText() == "None (fastest)":
@@ -487,15 +554,7 @@ class MainWindow:
         # Name specifier
         self.name_specifier = QComboBox(self.basic_search_widget)
         # Possible options
-        self.name_specifier.addItems([
-            "is:",
-            "contains:",
-            "begins with:",
-            "ends with:",
-            "is similar to:",
-            "doesn't contain:",
-            "in RegEx:",
-        ])
+        self.name_specifier.addItems(FF_Engine.NAME_SPECIFIERS)
         # Set a fixed width
         self.name_specifier.setFixedWidth(145)
         # Display
@@ -510,13 +569,7 @@ class MainWindow:
         # Connecting to the checkbox
         self.combobox_sorting.currentTextChanged.connect(hide_show_reverse_sort)
         # Adding Options
-        self.combobox_sorting.addItems(
-            ["None (fastest)",
-             "File Size",
-             "File Name",
-             "Date Modified",
-             "Date Created",
-             "Path"])
+        self.combobox_sorting.addItems(FF_Engine.SORT_MODES)
         # Set a fixed width
         self.combobox_sorting.setFixedWidth(150)
         # Display
@@ -527,10 +580,7 @@ class MainWindow:
         # Defining
         self.combobox_search_for = QComboBox(self.advanced_search_widget)
         # Adding Options
-        self.combobox_search_for.addItems(
-            ["Files and Folders",
-             "only Files",
-             "only Folders"])
+        self.combobox_search_for.addItems(FF_Engine.SEARCH_FOR_MODES)
         # Display
         self.combobox_search_for.setFixedWidth(235)
         self.advanced_search_widget_layout.addWidget(self.combobox_search_for, 5, 2)
@@ -681,18 +731,22 @@ class MainWindow:
                 f"File Ending: {self.edit_file_extension.text()}\n"
                 f"File Groups: {self.combobox_file_types.all_checked_items()}\n"
                 f"File Type mode: {self.file_type_mode}\n\n"
-                f"Search from: {os.path.abspath(FF_Files.SELECTED_DIR)}\n\n"
+                f"Search from: {os.path.abspath(FF_Files.SELECTED_DIR)}\n"
+                f"Query: {self.edit_query.text()}\n\n"
                 f"File size: min: {self.edit_size_min.text()} ({self.unit_selector_min.currentText()})"
                 f" max: {self.edit_size_max.text()} ({self.unit_selector_min.currentText()})\n"
                 f"Date modified from: {self.m_date_from_drop_down.text()} to: {self.m_date_to_drop_down.text()}\n"
                 f"Date created from: {self.c_date_from_drop_down.text()} to: {self.c_date_to_drop_down.text()}\n"
                 f"Folder depth: {self.combobox_folder_depth.currentText()} (Custom: {self.edit_folder_depth.value()})"
                 "\n\n"
-                f"Content: {self.edit_file_contains.text()}\n\n"
+                f"Content: {self.edit_file_contains.text()}"
+                f" (Mode: {self.combobox_content_mode.currentText()},"
+                f" Search in binary files: {self.content_binary_check_box.isChecked()})\n\n"
                 f"Search for system files: {self.library_check_box.isChecked()}\n"
                 f"Search for: {self.combobox_search_for.currentText()}\n\n"
                 f"Sort results by: {self.combobox_sorting.currentText()}\n"
-                f"Reverse results: {self.reverse_sorting_check_box.isChecked()}\n")
+                f"Reverse results: {self.reverse_sorting_check_box.isChecked()}\n"
+                f"Result limit: {self.result_limit_spinbox.value()}\n")
 
         # Start Search with args locally
         def search_entry(new_cache_file=False):
@@ -715,6 +769,8 @@ class MainWindow:
                 data_search_from_valid=os.path.abspath(FF_Files.SELECTED_DIR),
                 data_search_from_unchecked=self.edit_directory.text(),
                 data_content=self.edit_file_contains.text(),
+                data_content_binary=self.content_binary_check_box.isChecked(),
+                data_content_mode=self.combobox_content_mode.currentText(),
                 data_search_for=self.combobox_search_for.currentText(),
                 data_date_edits={"c_date_from": self.c_date_from_drop_down,
                                  "c_date_to": self.c_date_to_drop_down,
@@ -722,10 +778,12 @@ class MainWindow:
                                  "m_date_to": self.m_date_to_drop_down},
                 data_sort_by=self.combobox_sorting.currentText(),
                 data_reverse_sort=self.reverse_sorting_check_box.isChecked(),
+                data_result_limit=self.result_limit_spinbox.value(),
                 data_file_group=self.combobox_file_types.all_checked_items(),
                 data_file_type_mode=self.file_type_mode,
                 data_folder_depth=self.combobox_folder_depth.currentText(),
                 data_folder_depth_custom=self.edit_folder_depth.value(),
+                data_query=self.edit_query.text(),
                 new_cache_file=new_cache_file,
                 parent=self.Root_Window)
 
@@ -944,6 +1002,7 @@ class MainWindow:
 
         directory = filters["directory"].replace("USER_FOLDER", FF_Files.USER_FOLDER)
         self.edit_directory.setText(directory)
+        self.edit_query.setText(filters["query"])
 
         # Properties
         self.m_date_from_drop_down.setDate(QDate.fromString(filters["dates"]["m_date_from"], Qt.DateFormat.ISODate))
@@ -968,12 +1027,15 @@ class MainWindow:
         self.combobox_folder_depth.setCurrentText(filters["folder_depth"])
         self.edit_folder_depth.setValue(filters["folder_depth_custom"])
         self.edit_file_contains.setText(filters["file_contains"])
+        self.content_binary_check_box.setChecked(filters["file_contains_binary"])
+        self.combobox_content_mode.setCurrentText(filters["file_contains_mode"])
         self.library_check_box.setChecked(filters["hidden_files"])
         self.combobox_search_for.setCurrentIndex(filters["files_folders"])
 
         # Sorting
         self.combobox_sorting.setCurrentIndex(filters["sorting"])
         self.reverse_sorting_check_box.setChecked(filters["reverse_sorting"])
+        self.result_limit_spinbox.setValue(filters["result_limit"])
 
         # Debug
         logging.info("Imported all filters\n")
@@ -1025,6 +1087,7 @@ class MainWindow:
                    "file_extension": self.edit_file_extension.text(),
                    "file_type_mode": self.file_type_mode,
                    "directory": directory,
+                   "query": self.edit_query.text(),
 
                    "dates": {"m_date_from": self.m_date_from_drop_down.date().toString(Qt.DateFormat.ISODate),
                              "c_date_from": self.c_date_from_drop_down.date().toString(Qt.DateFormat.ISODate),
@@ -1038,11 +1101,14 @@ class MainWindow:
                    "folder_depth": self.combobox_folder_depth.currentText(),
                    "folder_depth_custom": self.edit_folder_depth.value(),
                    "file_contains": self.edit_file_contains.text(),
+                   "file_contains_binary": self.content_binary_check_box.isChecked(),
+                   "file_contains_mode": self.combobox_content_mode.currentText(),
                    "hidden_files": self.library_check_box.isChecked(),
                    "files_folders": self.combobox_search_for.currentIndex(),
 
                    "sorting": self.combobox_sorting.currentIndex(),
-                   "reverse_sorting": self.reverse_sorting_check_box.isChecked()}
+                   "reverse_sorting": self.reverse_sorting_check_box.isChecked(),
+                   "result_limit": self.result_limit_spinbox.value()}
 
         # Try opening the file, crashes if user pressed "Cancel"
         try:
@@ -1054,6 +1120,44 @@ class MainWindow:
             # Debug
             logging.info("Exported all filters\n")
 
+    # Searching with multiple filter presets, every preset gets its own search window
+    def search_with_filter_presets(self):
+        # Debug
+        logging.info("Asking for location of filter presets")
+        preset_paths = QFileDialog.getOpenFileNames(parent=self.Root_Window,
+                                                    dir=FF_Files.USER_FOLDER,
+                                                    caption="Search with Filter Presets",
+                                                    filter="File Find Filter Preset (*.FFFilter)")[0]
+        # If User pressed cancel
+        if not preset_paths:
+            return
+
+        FF_Search.SearchPresets([os.path.normpath(preset_path) for preset_path in preset_paths], self.Root_Window)
+
+    # Loading a list of names from a text file (one name per line) into the name field
+    def load_name_list(self):
+        # Debug
+        logging.info("Asking for location of name list")
+        import_path = QFileDialog.getOpenFileName(parent=self.Root_Window,
+                                                  dir=FF_Files.USER_FOLDER,
+                                                  caption="Load list of names",
+                                                  filter="Text File (*.txt);;All Files (*)")[0]
+        # If User pressed cancel
+        if import_path == "":
+            return
+
+        with open(os.path.normpath(import_path), errors="replace") as name_list_file:
+            name_patterns = FF_Matching.split_name_patterns(name_list_file.read())
+
+        # Putting the names into the name field, separated with semicolons
+        self.edit_name.setText(";".join(name_patterns))
+        # A list of names only makes sense with one of the multi name modes
+        if self.name_specifier.currentText() not in ("is one of:", "contains one of:"):
+            self.name_specifier.setCurrentText("is one of:")
+
+        # Debug
+        logging.info(f"Loaded {len(name_patterns)} names from {import_path}")
+
     # Switch file type selection mode between custom and predefined
     def change_file_type_mode(self, set_to=None):
         if set_to is None:
@@ -1105,6 +1209,18 @@ class MainWindow:
         export_filter_action.setShortcut("Ctrl+S")
         file_menu.addAction(export_filter_action)
 
+        # Search with multiple filter presets
+        search_presets_action = QAction("&Search with Filter Presets...", self.Root_Window)
+        search_presets_action.triggered.connect(self.search_with_filter_presets)
+        search_presets_action.setShortcut("Ctrl+B")
+        file_menu.addAction(search_presets_action)
+
+        # Load list of names
+        load_name_list_action = QAction("&Load list of names...", self.Root_Window)
+        load_name_list_action.triggered.connect(self.load_name_list)
+        load_name_list_action.setShortcut("Ctrl+L")
+        file_menu.addAction(load_name_list_action)
+
         # Separator
         file_menu.addSeparator()
 
@@ -1290,7 +1406,8 @@ class MainWindow:
 
 
 class SearchUpdate:
-    def __init__(self, path: str):
+    # With a cancel_token (see FF_Cancel.CancelToken), a "Cancel" action is added
+    def __init__(self, path: str, cancel_token=None):
         # Updating Label
         MainWindow.update_search_status_label()
 
@@ -1312,12 +1429,31 @@ class SearchUpdate:
         search_status_menu.addAction(self.search_path)
         search_status_menu.addAction(self.search_status)
 
+        # Cancel action
+        if cancel_token is not None:
+            self.cancel_action: QAction | None = QAction("Cancel")
+            self.cancel_action.triggered.connect(lambda: self.cancel(cancel_token))
+            search_status_menu.addAction(self.cancel_action)
+        else:
+            self.cancel_action = None
+
     def update(self, text: str):
         self.search_status.setText(text)
 
+    # Cancelling, the thread stops the next time it checks the token
+    def cancel(self, cancel_token):
+        # Debug
+        logging.info("Cancelling...")
+
+        cancel_token.cancel()
+        self.update("Cancelling...")
+        self.cancel_action.setDisabled(True)
+
     def close(self):
         self.search_status_menu.removeAction(self.search_status)
         self.search_status_menu.removeAction(self.search_path)
+        if self.cancel_action is not None:
+            self.search_status_menu.removeAction(self.cancel_action)
 
 
 global menu_bar_icon_menu, search_status_menu, menu_bar_icon, search_status_label
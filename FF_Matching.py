@@ -0,0 +1,393 @@
+# This source file is a part of File Find made by Pixel-Master
+#
+# Copyright 2022-2025 Pixel-Master
+#
+# This software is licensed under the "GPLv3" License as described in the "LICENSE" file,
+# which should be included with this package. The terms are also available at
+# http://www.gnu.org/licenses/gpl-3.0.html
+
+# This file contains the pattern matching algorithms used by the search engine
+
+# Imports
+import difflib
+import os
+import re
+from bisect import bisect_left, bisect_right
+from collections import deque
+from fnmatch import fnmatch, translate
+
+
+# Splitting the input of the name field into single patterns
+# Patterns can be separated with semicolons or new lines (for example when a list was pasted)
+def split_name_patterns(name_input: str) -> list:
+    patterns = []
+    for pattern in re.split(r"[;\r\n]", name_input):
+        # Removing surrounding spaces and skipping empty lines
+        pattern = pattern.strip()
+        if pattern != "":
+            patterns.append(pattern)
+
+    # Removing duplicates while keeping the order
+    return list(dict.fromkeys(patterns))
+
+
+# Compiling the name filter into a function, which tests the name of a file or folder
+# The name input has to be lowered already, if the case isn't considered or the specifier is "is similar to:"
+def compile_name_filter(name: str, specifier: str, consider_case: bool, similarity: float):
+    # Name is equal
+    if specifier == "is:":
+        if consider_case:
+            return lambda file_name: fnmatch(file_name, name)
+        return lambda file_name: fnmatch(file_name.lower(), name)
+
+    # Name contains
+    elif specifier == "contains:":
+        if consider_case:
+            return lambda file_name: name in file_name
+        return lambda file_name: name in file_name.lower()
+
+    # Name starts with
+    elif specifier == "begins with:":
+        if consider_case:
+            return lambda file_name: file_name.startswith(name)
+        return lambda file_name: file_name.lower().startswith(name)
+
+    # Name (without file extension) ends with
+    elif specifier == "ends with:":
+        if consider_case:
+            return lambda file_name: file_name[:file_name.find(".")].endswith(name)
+        return lambda file_name: file_name[:file_name.find(".")].lower().endswith(name)
+
+    # Fuzzy search, using difflib.SequenceMatcher to get a matching ratio,
+    # based on the gestalt pattern matching algorithm.
+    elif specifier == "is similar to:":
+        return lambda file_name: difflib.SequenceMatcher(None, name, file_name.lower()).ratio() >= similarity
+
+    # Doesn't contain
+    elif specifier == "doesn't contain:":
+        if consider_case:
+            return lambda file_name: name not in file_name
+        return lambda file_name: name not in file_name.lower()
+
+    # RegEx
+    elif specifier == "in RegEx:":
+        name_regex = re.compile(name, 0 if consider_case else re.IGNORECASE)
+        return lambda file_name: name_regex.match(file_name) is not None
+
+    # Name is one of multiple names, using a set (and one combined RegEx for wildcards)
+    elif specifier == "is one of:":
+        name_set_matcher = NameSetMatcher(split_name_patterns(name))
+        if consider_case:
+            return name_set_matcher.match
+        return lambda file_name: name_set_matcher.match(file_name.lower())
+
+    # Name contains one of multiple names, using an Aho-Corasick automaton
+    elif specifier == "contains one of:":
+        name_automaton = AhoCorasick(split_name_patterns(name))
+        if consider_case:
+            return name_automaton.search
+        return lambda file_name: name_automaton.search(file_name.lower())
+
+    else:
+        raise ValueError(f"Unknown name specifier: {specifier}")
+
+
+# Matching a name against a set of names in one step
+# Used for name "is one of", exact names are looked up in a set,
+# names with wildcards are combined into a single regular expression
+class NameSetMatcher:
+    def __init__(self, patterns):
+        self.names = set()
+        wildcard_patterns = []
+
+        for pattern in patterns:
+            # Using the same wildcards as name "is"
+            if ("[" in pattern) or ("?" in pattern) or ("*" in pattern):
+                wildcard_patterns.append(translate(pattern))
+            else:
+                self.names.add(pattern)
+
+        # Combining all wildcard patterns, so every name only needs to be matched once
+        if wildcard_patterns:
+            self.wildcard_regex = re.compile("|".join(wildcard_patterns))
+        else:
+            self.wildcard_regex = None
+
+    def match(self, name: str) -> bool:
+        if name in self.names:
+            return True
+        return self.wildcard_regex is not None and self.wildcard_regex.match(name) is not None
+
+
+# Aho-Corasick automaton, used for name "contains one of"
+# Tests if any of the patterns is contained in a text while only going through the text once,
+# no matter how many patterns there are
+class AhoCorasick:
+    def __init__(self, patterns):
+        # Every state has a dict with the transitions to the next states, state 0 is the root
+        self.goto: list[dict] = [{}]
+        # The state to fall back to, if there is no transition for a character
+        self.fail: list[int] = [0]
+        # If a pattern ends in this state (or in one of the states reached through fail)
+        self.output: list[bool] = [False]
+
+        # Building the trie of all patterns
+        for pattern in patterns:
+            state = 0
+            for char in pattern:
+                next_state = self.goto[state].get(char)
+                # Adding a new state
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(False)
+                state = next_state
+            self.output[state] = True
+
+        # Computing the fail transitions, going through the trie breadth-first
+        # States directly under the root always fall back to the root
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+
+                # Following the fail transitions of the parent, until a state has a transition for char
+                fail_state = self.fail[state]
+                while fail_state and char not in self.goto[fail_state]:
+                    fail_state = self.fail[fail_state]
+                self.fail[next_state] = self.goto[fail_state].get(char, 0)
+
+                # If a shorter pattern ends at the fail state it is contained as well
+                if self.output[self.fail[next_state]]:
+                    self.output[next_state] = True
+
+    # Returns True if at least one pattern is in text
+    def search(self, text: str) -> bool:
+        # An empty pattern is in every text
+        if self.output[0]:
+            return True
+
+        # Local variables for faster access
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                return True
+
+        return False
+
+
+# A set of path prefixes, used for the excluded files
+# Checks if a path starts with one of the prefixes using a binary search instead of testing every prefix
+class PrefixSet:
+    def __init__(self, prefixes):
+        # All prefixes sorted, used to find the prefixes inside a directory
+        self.sorted_prefixes: list = sorted(set(prefixes))
+
+        # Removing prefixes, that start with another prefix, as they don't change the result.
+        # In the remaining sorted list the only prefix that can match a path
+        # is the largest one that is smaller than or equal to the path
+        self.minimal_prefixes: list = []
+        for prefix in self.sorted_prefixes:
+            if not (self.minimal_prefixes and prefix.startswith(self.minimal_prefixes[-1])):
+                self.minimal_prefixes.append(prefix)
+
+    def __bool__(self):
+        return bool(self.sorted_prefixes)
+
+    # Returns True if path starts with one of the prefixes, does the same as path.startswith(prefix) for every prefix
+    def match(self, path: str) -> bool:
+        index = bisect_right(self.minimal_prefixes, path) - 1
+        return index >= 0 and path.startswith(self.minimal_prefixes[index])
+
+    # Returns all prefixes, which start with directory (so are inside it)
+    def prefixes_starting_with(self, directory: str) -> list:
+        prefixes = []
+        # All strings starting with directory are next to each other in the sorted list
+        for index in range(bisect_left(self.sorted_prefixes, directory), len(self.sorted_prefixes)):
+            if not self.sorted_prefixes[index].startswith(directory):
+                break
+            prefixes.append(self.sorted_prefixes[index])
+        return prefixes
+
+
+# Rules of a single .gitignore or .ffignore file
+# Supports the same syntax as git: "#" comments, "!" negations, "/" anchors, "/" at the end for folders only,
+# and the wildcards "*", "?", "[seq]" and "**"
+class IgnoreRules:
+    def __init__(self, directory: str, lines):
+        # The directory with the ignore file, patterns with a "/" are relative to it
+        self.directory = directory
+        # A list of (compiled pattern, negated, only folders)
+        self.rules: list = []
+
+        for line in lines:
+            line = line.rstrip("\n").rstrip("\r")
+
+            # Removing trailing spaces, unless they are escaped with a backslash
+            while line.endswith(" ") and not line.endswith("\\ "):
+                line = line[:-1]
+
+            # Skipping empty lines and comments
+            if line == "" or line.startswith("#"):
+                continue
+
+            # Negation, files matching this are included again
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:]
+            # Escaped "#" or "!" at the beginning
+            elif line.startswith("\\#") or line.startswith("\\!"):
+                line = line[1:]
+
+            # A slash at the end means the pattern only matches folders
+            only_folders = line.endswith("/")
+            line = line.rstrip("/")
+            if line == "":
+                continue
+
+            self.rules.append((re.compile(self.translate(line)), negated, only_folders))
+
+    # Converting a pattern into a regular expression for the path relative to the directory, using "/"
+    @staticmethod
+    def translate(pattern: str) -> str:
+        # A pattern with a slash at the beginning or in the middle is relative to the directory,
+        # else it matches a name in every subfolder
+        if "/" in pattern:
+            regex = ""
+            pattern = pattern.lstrip("/")
+        else:
+            regex = "(?:.*/)?"
+
+        index = 0
+        while index < len(pattern):
+            char = pattern[index]
+
+            if pattern.startswith("**/", index) and (index == 0 or pattern[index - 1] == "/"):
+                # "**/" matches zero or more folders
+                regex += "(?:.*/)?"
+                index += 3
+                continue
+            elif pattern.startswith("**", index):
+                # "**" at the end (or not between slashes) matches everything
+                regex += ".*"
+                index += 2
+                continue
+            elif char == "*":
+                regex += "[^/]*"
+            elif char == "?":
+                regex += "[^/]"
+            elif char == "\\" and index + 1 < len(pattern):
+                index += 1
+                regex += re.escape(pattern[index])
+            elif char == "[":
+                # Finding the end of the character class
+                end = index + 1
+                if end < len(pattern) and pattern[end] in "!^":
+                    end += 1
+                if end < len(pattern) and pattern[end] == "]":
+                    end += 1
+                end = pattern.find("]", end)
+                if end == -1:
+                    regex += "\\["
+                else:
+                    char_class = pattern[index + 1:end].replace("\\", "\\\\")
+                    if char_class.startswith("!"):
+                        char_class = "^" + char_class[1:]
+                    regex += f"[{char_class}]"
+                    index = end
+            else:
+                regex += re.escape(char)
+            index += 1
+
+        return regex
+
+    # Returns True (ignored), False (included again with "!") or None if no rule matches
+    def match(self, path: str, is_folder: bool):
+        relative_path = path[len(self.directory):].lstrip(os.sep).replace(os.sep, "/")
+
+        # The last matching rule decides
+        for pattern, negated, only_folders in reversed(self.rules):
+            if only_folders and not is_folder:
+                continue
+            if pattern.fullmatch(relative_path):
+                return not negated
+        return None
+
+
+# Reading the ignore files while scanning with os.walk()
+# The rules of every folder are read once and passed on to all subfolders
+class IgnoreTree:
+    IGNORE_FILE_NAMES = (".gitignore", ".ffignore")
+
+    def __init__(self, search_from: str):
+        # The rules inherited from the parent folders, for every folder that wasn't scanned yet
+        self.inherited_rules: dict = {}
+
+        # Loading the ignore files of all parent folders, so searching in a subfolder of a project uses them too
+        parent_folders = []
+        folder = os.path.dirname(search_from)
+        while True:
+            parent_folders.append(folder)
+            if os.path.dirname(folder) == folder:
+                break
+            folder = os.path.dirname(folder)
+
+        rules = []
+        for folder in reversed(parent_folders):
+            rules = rules + self.read_rules(folder, self.IGNORE_FILE_NAMES)
+        self.inherited_rules[search_from] = rules
+
+    # Reading the ignore files in a folder
+    def read_rules(self, folder: str, files) -> list:
+        rules = []
+        for ignore_file_name in self.IGNORE_FILE_NAMES:
+            if ignore_file_name in files:
+                try:
+                    with open(os.path.join(folder, ignore_file_name), errors="replace") as ignore_file:
+                        ignore_rules = IgnoreRules(folder, ignore_file)
+                    if ignore_rules.rules:
+                        rules.append(ignore_rules)
+                except OSError:
+                    pass
+        return rules
+
+    @staticmethod
+    def is_ignored(rules: list, path: str, is_folder: bool) -> bool:
+        # Rules from deeper folders override the ones from higher folders
+        for ignore_rules in reversed(rules):
+            result = ignore_rules.match(path, is_folder)
+            if result is not None:
+                return result
+        return False
+
+    # Removing ignored files and folders from the lists of os.walk(),
+    # os.walk() doesn't go into the folders that are removed from dirs
+    def remove_ignored(self, root: str, files: list, dirs: list):
+        rules = self.inherited_rules.pop(root, []) + self.read_rules(root, files)
+
+        # Nothing to ignore
+        if not rules:
+            for directory in dirs:
+                self.inherited_rules[os.path.join(root, directory)] = rules
+            return files, dirs
+
+        kept_files = [file for file in files if not self.is_ignored(rules, os.path.join(root, file), False)]
+        kept_dirs = []
+        for directory in dirs:
+            path = os.path.join(root, directory)
+            if not self.is_ignored(rules, path, True):
+                kept_dirs.append(directory)
+                # The rules of this folder are passed on to its subfolders
+                self.inherited_rules[path] = rules
+
+        return kept_files, kept_dirs
@@ -26,10 +26,13 @@ from PySide6.QtWidgets import QFileDialog, QListWidget, QTreeWidget, QMenu, QPus
 
 # Projects Libraries
 import FF_Additional_UI
+import FF_Archive
 import FF_Compare
 import FF_Duplicated
 import FF_Files
+import FF_Index
 import FF_About_UI
+import FF_Scheduler
 import FF_Settings
 
 
@@ -51,15 +54,7 @@ class MenuBar:
         self.search_path = search_path
         self.search_path2 = search_path2
         self.window = window
-        self.cache_file_path = cache_file_path
-        if self.cache_file_path is not None:
-            # Getting the depth from the cache file's metadata brother
-            with open(FF_Files.get_metadata_file_from_cache_file(cache_file_path)) as depth_file:
-                try:
-                    self.search_depth = load(depth_file)["global_depth_limit"]
-                except FileNotFoundError:
-                    pass
-        self.matched_list = matched_list
+        self.set_search_results(matched_list, cache_file_path)
         self.duplicated_dict = duplicated_dict
         self.file_count_text = file_count_text
 
@@ -252,13 +247,13 @@ class MenuBar:
             # Compare Search
             compare_action = QAction("&Compare to other Search...", self.parent)
             compare_action.triggered.connect(lambda: FF_Compare.CompareSearches(
-                matched_list, search_path, cache_file_path, self.marked_files, self.parent))
+                self.matched_list, search_path, self.cache_file_path, self.marked_files, self.parent))
             compare_action.setShortcut("Ctrl+N")
 
             # Find duplicated
             duplicated_action = QAction("&Find duplicated files...", self.parent)
             duplicated_action.triggered.connect(
-                lambda: FF_Duplicated.DuplicatedSettings(parent, search_path, matched_list, cache_file_path,
+                lambda: FF_Duplicated.DuplicatedSettings(parent, search_path, self.matched_list, self.cache_file_path,
                                                          self.marked_files))
             duplicated_action.setShortcut("Ctrl+D")
 
@@ -270,6 +265,25 @@ class MenuBar:
 
             self.file_menu.addAction(duplicated_action)
 
+    # Setting the results and the cache file they are from, used when the results are only known after creating
+    # the menu-bar, for example when they were shown while searching
+    def set_search_results(self, matched_list, cache_file_path):
+        self.cache_file_path = cache_file_path
+        if self.cache_file_path is not None:
+            # Getting the depth from the cache file's metadata brother
+            with open(FF_Files.get_metadata_file_from_cache_file(cache_file_path)) as depth_file:
+                try:
+                    self.search_depth = load(depth_file)["global_depth_limit"]
+                except FileNotFoundError:
+                    pass
+        self.matched_list = matched_list
+
+    # Enabling or disabling the actions of the file, edit and tools menus
+    def set_actions_enabled(self, enabled: bool):
+        for menu in (self.file_menu, self.edit_menu, self.tools_menu):
+            for action in menu.actions():
+                action.setEnabled(enabled)
+
     # Options for files and folders
     # Prompts a user to select a new location for the file
     def move_file(self):
@@ -546,7 +560,8 @@ class MenuBar:
     # Open a file with the default app
     def open_file(self):
         # Selecting the highlighted item of the focused listbox
-        selected_file = self.get_current_item()
+        # Files in archives can't be opened directly, so the archive is opened
+        selected_file = FF_Archive.archive_of(self.get_current_item())
 
         return_code = -1
 
@@ -582,8 +597,8 @@ class MenuBar:
 
         # Tests if the user selected an app
         if selected_program != "":
-            # Get the selected file
-            selected_file = self.get_current_item()
+            # Get the selected file, or the archive it is in
+            selected_file = FF_Archive.archive_of(self.get_current_item())
             # Normalise the program path
             selected_program = os.path.normpath(selected_program)
 
@@ -646,7 +661,8 @@ class MenuBar:
     # Shows a file in finder
     def open_in_finder(self):
 
-        selected_file = self.get_current_item()
+        # Files in archives are revealed by showing the archive
+        selected_file = FF_Archive.archive_of(self.get_current_item())
 
         # If the file doesn't exist
         if not os.path.exists(selected_file):
@@ -829,7 +845,7 @@ class MenuBar:
             with open(cache_file_with_same_path) as search_file:
                 cached_files = load(search_file)
 
-            cached_files["found_path_set"].remove(file)
+            FF_Index.remove_from_cache(cached_files, [file])
 
             with open(cache_file_with_same_path, "w") as search_file:
                 dump(cached_files, search_file)
@@ -839,7 +855,7 @@ class MenuBar:
                 with open(self.cache_file_path) as upper_search_file:
                     cached_files = load(upper_search_file)
 
-                cached_files["found_path_set"].remove(file)
+                FF_Index.remove_from_cache(cached_files, [file])
 
                 with open(self.cache_file_path, "w") as upper_search_file:
                     dump(cached_files, upper_search_file)
@@ -907,7 +923,8 @@ class MenuBar:
                 # Creating a copy so that the list doesn't run out of index
                 parent_items_without_deleted_files = self.matched_list.copy()
                 for matched_file in self.matched_list:
-                    if not os.path.exists(matched_file):
+                    # Files in archives are kept as long as the archive exists
+                    if not os.path.exists(FF_Archive.archive_of(matched_file)):
                         # Remove file from widget if it doesn't exist
                         self.get_listbox().takeItem(parent_items_without_deleted_files.index(matched_file))
                         parent_items_without_deleted_files.remove(matched_file)
@@ -1032,15 +1049,10 @@ class MenuBar:
                 else:
                     different_cache_file = False
 
-                # Removing all deleted files from cache
-                for removed_file in removed_list:
-                    try:
-                        cached_file["found_path_set"].remove(removed_file)
-                        if different_cache_file:
-                            cached_home_file["found_path_set"].remove(removed_file)
-                    except (KeyError, ValueError):
-                        # File was already removed from cache
-                        pass
+                # Removing all deleted files from cache, files which were already removed are skipped
+                FF_Index.remove_from_cache(cached_file, removed_list)
+                if different_cache_file:
+                    FF_Index.remove_from_cache(cached_home_file, removed_list)
 
                 with open(FF_Files.path_to_cache_file(self.search_path, self.search_depth), "w") as search_file:
                     dump(cached_file, search_file)
@@ -1053,7 +1065,10 @@ class MenuBar:
                 # Run garbage collection
                 gc.collect()
 
-            QThreadPool(self.parent).start(modify_cache)
+            # Writing the cache is background work, so searches on the same drive are started first
+            FF_Scheduler.SCHEDULER.submit(
+                f"Updating cache of {self.search_path}", modify_cache, self.search_path,
+                FF_Scheduler.PRIORITY_BACKGROUND)
 
         except FileNotFoundError:
             FF_Additional_UI.PopUps.show_info_messagebox("Cache File not Found!",
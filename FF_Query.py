@@ -0,0 +1,528 @@
+# This source file is a part of File Find made by Pixel-Master
+#
+# Copyright 2022-2025 Pixel-Master
+#
+# This software is licensed under the "GPLv3" License as described in the "LICENSE" file,
+# which should be included with this package. The terms are also available at
+# http://www.gnu.org/licenses/gpl-3.0.html
+
+# This file contains the query language, which is parsed and compiled into a single predicate
+
+'''
+Query syntax:
+    A query consists of terms, which can be combined with AND, OR, NOT and parentheses.
+    Terms next to each other without an operator are combined with AND.
+
+    name:report.txt     File name is report.txt (supports the wildcards of name "is")
+    name:~report        File name contains report
+    name:^report        File name begins with report
+    name:$report.pdf    File name (including the extension) ends with report.pdf
+    report              Same as name:~report
+    path:/archive/      Path contains /archive/ (also supports ~, ^ and $)
+    ext:pdf,docx        File extension is pdf or docx
+    type:file           Only files (type:folder for only folders)
+    size>10MB           Size is larger than 10 MB (units: B, KB, MB, GB, TB)
+    mtime>2024-01-01    Modified after the first of January 2024, "mtime>-7d" means in the last seven days
+    ctime<2024-01-01    Created before the first of January 2024
+    depth<=1            At most in the first subfolder of the searched directory
+    content:"foo bar"   File contains foo bar (case-sensitive)
+
+    Comparisons (size, mtime, ctime and depth) support >, >=, <, <= and = (or :).
+    Values containing spaces or parentheses must be put in double quotes.
+    Name and path are matched ignoring case.
+
+Example: name:~report AND ext:pdf,docx AND NOT path:/archive/ AND size>10MB AND mtime>2024-01-01
+'''
+
+# Imports
+import os
+import re
+from datetime import date
+from fnmatch import fnmatch
+from sys import platform
+from time import mktime, time
+
+# Projects Libraries
+import FF_Content
+import FF_Files
+
+# Regular expression used for splitting a query into tokens
+TOKEN_REGEX = re.compile(
+    r'\s*(?:'
+    r'(?P<open>\()|'
+    r'(?P<close>\))|'
+    r'(?P<field>[a-zA-Z_]+)(?P<operator>>=|<=|[:<>=])(?P<value>"(?:[^"\\]|\\.)*"|[^\s()]*)|'
+    r'(?P<word>"(?:[^"\\]|\\.)*"|[^\s()]+)'
+    r')')
+
+# Fields which only support ":" and fields which can be compared
+TEXT_FIELDS = ("name", "path", "ext", "type", "content")
+COMPARISON_FIELDS = ("size", "mtime", "ctime", "depth")
+
+# Size units, using the same factors as the file size filter
+SIZE_UNIT_FACTORS = {"": 1, "b": 1, "byte": 1, "bytes": 1,
+                     "kb": 1000, "mb": 1000000, "gb": 1000000000, "tb": 1000000000000}
+
+# Costs of evaluating a term, used to evaluate cheap terms first
+# Terms that only need the path are free, terms that need to stat the file are more expensive
+# and reading the file content is the most expensive
+COST_PATH = 0
+COST_STAT = 1
+COST_CONTENT = 2
+
+
+# Raised if the query can't be parsed
+class QuerySyntaxError(ValueError):
+    pass
+
+
+# A single file, which is tested against the query.
+# Values which require accessing the disk are loaded on first use and then stored
+class QueryEntry:
+    __slots__ = ("path", "is_folder", "search_from_depth", "_stat", "_size")
+
+    def __init__(self, path: str, is_folder: bool, search_from_depth: int, stat=None, size=None):
+        self.path = path
+        self.is_folder = is_folder
+        self.search_from_depth = search_from_depth
+        # Archive members aren't on the disk, so their stats are passed in
+        self._stat = stat
+        # The size of folders can be passed in, if it is already known from the scan
+        if size is not None:
+            self._size = size
+        # Folders and links don't have a size in the range indexes
+        elif stat and stat.st_size >= 0:
+            self._size = stat.st_size
+        else:
+            self._size = None
+
+    def stat(self):
+        if self._stat is None:
+            try:
+                self._stat = os.stat(self.path)
+            except OSError:
+                # Using False, so it isn't tried again
+                self._stat = False
+        return self._stat
+
+    def size(self) -> int:
+        if self._size is None:
+            self._size = FF_Files.get_file_size(self.path)
+        return self._size
+
+
+# The size and dates of a path from the range indexes of the scan (see FF_Index.read_range_values()),
+# used instead of os.stat(), so the query uses the same values as the other filters and the folder aggregates
+class RangeStat:
+    __slots__ = ("st_size", "st_mtime", "st_ctime", "st_birthtime")
+
+    def __init__(self, size: float, m_time: float, c_time: float):
+        self.st_size = size
+        self.st_mtime = m_time
+        # The range indexes contain the date created of the platform (st_birthtime on macOS)
+        self.st_ctime = c_time
+        self.st_birthtime = c_time
+
+
+# Nodes of the syntax tree
+# Every node has a cost and can be compiled into a function, that takes a QueryEntry and returns a bool.
+# Every node can also be compiled into a function, that takes the FF_Index.DirectoryAggregate of a folder
+# and returns False if no file in the folder and its subfolders can match
+class QueryAnd:
+    def __init__(self, children: list):
+        # Evaluate cheap children first, so expensive ones are skipped if a cheap one doesn't match
+        self.children = sorted(children, key=lambda child: child.cost)
+        self.cost = max(child.cost for child in self.children)
+
+    def compile(self):
+        predicates = tuple(child.compile() for child in self.children)
+        return lambda entry: all(predicate(entry) for predicate in predicates)
+
+    def compile_subtree_check(self):
+        checks = tuple(child.compile_subtree_check() for child in self.children)
+        return lambda aggregate: all(check(aggregate) for check in checks)
+
+    def __repr__(self):
+        return f"AND{self.children}"
+
+
+class QueryOr:
+    def __init__(self, children: list):
+        self.children = sorted(children, key=lambda child: child.cost)
+        self.cost = max(child.cost for child in self.children)
+
+    def compile(self):
+        predicates = tuple(child.compile() for child in self.children)
+        return lambda entry: any(predicate(entry) for predicate in predicates)
+
+    def compile_subtree_check(self):
+        checks = tuple(child.compile_subtree_check() for child in self.children)
+        return lambda aggregate: any(check(aggregate) for check in checks)
+
+    def __repr__(self):
+        return f"OR{self.children}"
+
+
+class QueryNot:
+    def __init__(self, child):
+        self.child = child
+        self.cost = child.cost
+
+    def compile(self):
+        predicate = self.child.compile()
+        return lambda entry: not predicate(entry)
+
+    # The aggregates can only tell if no file can match, so a negation could always match
+    @staticmethod
+    def compile_subtree_check():
+        return lambda aggregate: True
+
+    def __repr__(self):
+        return f"NOT[{self.child}]"
+
+
+class QueryTerm:
+    def __init__(self, field: str, operator: str, value: str):
+        self.field = field
+        self.operator = operator
+        self.value = value
+
+        # Testing if the operator is allowed for the field
+        if field in TEXT_FIELDS:
+            if operator != ":":
+                raise QuerySyntaxError(f"\"{field}\" only supports \":\", not \"{operator}\"")
+        elif field in COMPARISON_FIELDS:
+            # ":" is the same as "="
+            if operator == ":":
+                self.operator = "="
+        else:
+            raise QuerySyntaxError(f"Unknown field \"{field}\"")
+
+        if value == "":
+            raise QuerySyntaxError(f"\"{field}{operator}\" needs a value")
+
+        # Setting the cost
+        if field == "content":
+            self.cost = COST_CONTENT
+        elif field in ("size", "mtime", "ctime"):
+            self.cost = COST_STAT
+        else:
+            self.cost = COST_PATH
+
+    def compile(self):
+        return getattr(self, f"compile_{self.field}")()
+
+    # Only extension, type, size and date modified are in the aggregates, all other terms could always match
+    def compile_subtree_check(self):
+        if self.field == "ext":
+            # The aggregates only contain the last part of extensions like "tar.gz"
+            extensions = tuple(extension.rpartition(".")[2] for extension in self.parse_extensions())
+            return lambda aggregate: not aggregate.extensions.isdisjoint(extensions)
+
+        elif self.field == "type":
+            # Files can't match "type:folder"
+            only_folders = self.parse_type()
+            return lambda aggregate: not only_folders
+
+        elif self.field == "size":
+            # No file can be larger than all files in the folder together
+            size = parse_size(self.value)
+            if self.operator == ">":
+                return lambda aggregate: aggregate.total_size > size
+            elif self.operator in (">=", "="):
+                return lambda aggregate: aggregate.total_size >= size
+            else:
+                return lambda aggregate: True
+
+        elif self.field == "mtime":
+            lower_limit, upper_limit = self.parse_date_limits()
+            # The range of the dates in the folder must overlap with the range of the term
+            return lambda aggregate: aggregate.max_m_time >= lower_limit and aggregate.min_m_time < upper_limit
+
+        else:
+            return lambda aggregate: True
+
+    # Compiling a text match for name and path, the first character of the value can change the mode
+    def compile_text_match(self, default_mode):
+        value = self.value.lower()
+        if value[0] in "~^$" and len(value) > 1:
+            mode, value = value[0], value[1:]
+        else:
+            mode = default_mode
+
+        if mode == "~":
+            return lambda text: value in text
+        elif mode == "^":
+            return lambda text: text.startswith(value)
+        elif mode == "$":
+            return lambda text: text.endswith(value)
+        else:
+            return lambda text: fnmatch(text, value)
+
+    def compile_name(self):
+        text_match = self.compile_text_match(default_mode="is")
+        return lambda entry: text_match(os.path.basename(entry.path).lower())
+
+    def compile_path(self):
+        text_match = self.compile_text_match(default_mode="~")
+        return lambda entry: text_match(entry.path.lower())
+
+    # Using the same format as the custom file types, returns the extensions without the leading dot
+    def parse_extensions(self) -> tuple:
+        return tuple(extension.strip().lstrip(".*").lower()
+                     for extension in self.value.split(",") if extension.strip() != "")
+
+    def compile_ext(self):
+        extensions = tuple(f".{extension}" for extension in self.parse_extensions())
+        return lambda entry: entry.path.lower().endswith(extensions)
+
+    # Returns True for folders and False for files
+    def parse_type(self) -> bool:
+        if self.value.lower() in ("folder", "folders", "dir", "directory"):
+            return True
+        elif self.value.lower() in ("file", "files"):
+            return False
+        else:
+            raise QuerySyntaxError(f"Unknown type \"{self.value}\", use \"file\" or \"folder\"")
+
+    def compile_type(self):
+        if self.parse_type():
+            return lambda entry: entry.is_folder
+        else:
+            return lambda entry: not entry.is_folder
+
+    def compile_content(self):
+        matcher = FF_Content.ContentMatcher(self.value)
+        return lambda entry: not entry.is_folder and FF_Content.find_in_file(entry.path, matcher) is not None
+
+    # Returns a function comparing a value to the value of the term
+    def compile_comparison(self, compare_to):
+        if self.operator == ">":
+            return lambda value: value > compare_to
+        elif self.operator == ">=":
+            return lambda value: value >= compare_to
+        elif self.operator == "<":
+            return lambda value: value < compare_to
+        elif self.operator == "<=":
+            return lambda value: value <= compare_to
+        else:
+            return lambda value: value == compare_to
+
+    def compile_size(self):
+        comparison = self.compile_comparison(parse_size(self.value))
+        return lambda entry: comparison(entry.size())
+
+    def compile_depth(self):
+        try:
+            depth = int(self.value)
+        except ValueError:
+            raise QuerySyntaxError(f"Invalid depth \"{self.value}\", must be a number")
+
+        comparison = self.compile_comparison(depth)
+        # 0 means directly in the searched directory
+        return lambda entry: comparison(entry.path.count(os.sep) - entry.search_from_depth - 1)
+
+    # A date covers a whole day, so the time has to be in the range from lower_limit to upper_limit
+    def parse_date_limits(self) -> tuple:
+        start_of_day, end_of_day = parse_date(self.value)
+        return {"=": (start_of_day, end_of_day),
+                ">": (end_of_day, float("inf")),
+                ">=": (start_of_day, float("inf")),
+                "<": (float("-inf"), start_of_day),
+                "<=": (float("-inf"), end_of_day)}[self.operator]
+
+    # Compiling mtime and ctime
+    def compile_date(self, get_time):
+        lower_limit, upper_limit = self.parse_date_limits()
+
+        def match(entry):
+            stat = entry.stat()
+            # File doesn't exist anymore
+            if not stat:
+                return False
+            return lower_limit <= get_time(stat) < upper_limit
+
+        return match
+
+    def compile_mtime(self):
+        return self.compile_date(lambda stat: stat.st_mtime)
+
+    def compile_ctime(self):
+        # On macOS using st_birthtime, because os.path.getctime returns a wrong date
+        if platform == "darwin":
+            return self.compile_date(lambda stat: stat.st_birthtime)
+        else:
+            return self.compile_date(lambda stat: stat.st_ctime)
+
+    def __repr__(self):
+        return f"{self.field}{self.operator}{self.value}"
+
+
+# Converting a size (like 10MB) into bytes
+def parse_size(size_string: str) -> float:
+    size_match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*([a-zA-Z]*)", size_string)
+    if size_match is None or size_match.group(2).lower() not in SIZE_UNIT_FACTORS:
+        raise QuerySyntaxError(f"Invalid size \"{size_string}\", use for example \"10MB\"")
+    return float(size_match.group(1)) * SIZE_UNIT_FACTORS[size_match.group(2).lower()]
+
+
+# Converting a date into the unix time of the start and end of the day
+# Supports ISO dates (2024-01-31) and relative dates (-7d for seven days ago, -12h for twelve hours ago)
+def parse_date(date_string: str) -> tuple:
+    relative_match = re.fullmatch(r"-(\d+)([dhw])", date_string)
+    if relative_match is not None:
+        # Relative dates are a point in time and not a day
+        factors = {"h": 3600, "d": FF_Files.SECONDS_OF_A_DAY, "w": FF_Files.SECONDS_OF_A_WEEK}
+        point_in_time = time() - int(relative_match.group(1)) * factors[relative_match.group(2)]
+        return point_in_time, point_in_time
+
+    date_match = re.fullmatch(r"(\d{4})-(\d{1,2})-(\d{1,2})", date_string)
+    if date_match is None:
+        raise QuerySyntaxError(f"Invalid date \"{date_string}\", use for example \"2024-01-31\" or \"-7d\"")
+    year, month, day = (int(part) for part in date_match.groups())
+    try:
+        # Testing if the date exists
+        date(year, month, day)
+        # Fill in hours, minutes and second with 0 like with the date filters
+        start_of_day = mktime((year, month, day, 0, 0, 0, 0, 0, -1))
+        end_of_day = mktime((year, month, day + 1, 0, 0, 0, 0, 0, -1))
+    except (OverflowError, ValueError):
+        raise QuerySyntaxError(f"Invalid date \"{date_string}\"")
+    return start_of_day, end_of_day
+
+
+# Removing the quotes of a value
+def unquote(value: str) -> str:
+    if len(value) >= 2 and value.startswith('"') and value.endswith('"'):
+        return re.sub(r"\\(.)", r"\1", value[1:-1])
+    return value
+
+
+# Splitting the query into tokens
+def tokenize(query: str) -> list:
+    tokens = []
+    position = 0
+    query = query.strip()
+    while position < len(query):
+        token_match = TOKEN_REGEX.match(query, position)
+        if token_match is None or token_match.end() == position:
+            raise QuerySyntaxError(f"Can't read query at \"{query[position:]}\"")
+        position = token_match.end()
+
+        if token_match.group("open") is not None:
+            tokens.append(("(", None))
+        elif token_match.group("close") is not None:
+            tokens.append((")", None))
+        elif token_match.group("field") is not None:
+            tokens.append(("term", QueryTerm(token_match.group("field").lower(),
+                                             token_match.group("operator"),
+                                             unquote(token_match.group("value")))))
+        else:
+            word = token_match.group("word")
+            if word.upper() in ("AND", "OR", "NOT"):
+                tokens.append((word.upper(), None))
+            else:
+                # A single word searches for names containing it
+                tokens.append(("term", QueryTerm("name", ":", f"~{unquote(word)}")))
+    return tokens
+
+
+# Recursive descent parser creating the syntax tree
+# query := or_expression
+# or_expression := and_expression (OR and_expression)*
+# and_expression := not_expression ([AND] not_expression)*
+# not_expression := NOT not_expression | "(" query ")" | term
+class QueryParser:
+    def __init__(self, tokens: list):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self):
+        if self.position < len(self.tokens):
+            return self.tokens[self.position][0]
+        return None
+
+    def take(self):
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            raise QuerySyntaxError("Query is empty")
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise QuerySyntaxError(f"Unexpected \"{self.peek()}\"")
+        return node
+
+    def parse_or(self):
+        children = [self.parse_and()]
+        while self.peek() == "OR":
+            self.take()
+            children.append(self.parse_and())
+        return children[0] if len(children) == 1 else QueryOr(children)
+
+    def parse_and(self):
+        children = [self.parse_not()]
+        while self.peek() in ("AND", "NOT", "(", "term"):
+            if self.peek() == "AND":
+                self.take()
+            children.append(self.parse_not())
+        return children[0] if len(children) == 1 else QueryAnd(children)
+
+    def parse_not(self):
+        token_type = self.peek()
+        if token_type == "NOT":
+            self.take()
+            return QueryNot(self.parse_not())
+        elif token_type == "(":
+            self.take()
+            node = self.parse_or()
+            if self.peek() != ")":
+                raise QuerySyntaxError("Missing \")\"")
+            self.take()
+            return node
+        elif token_type == "term":
+            return self.take()[1]
+        elif token_type is None:
+            raise QuerySyntaxError("Query ends unexpectedly")
+        else:
+            raise QuerySyntaxError(f"Unexpected \"{token_type}\"")
+
+
+# The compiled query
+class QueryPlan:
+    def __init__(self, query: str, search_from: str):
+        self.query = query
+        self.syntax_tree = QueryParser(tokenize(query)).parse()
+        self.predicate = self.syntax_tree.compile()
+        self.subtree_check = self.syntax_tree.compile_subtree_check()
+        # If sizes or dates are compared, they can be taken from the scan
+        self.uses_stat = any(term.field in ("size", "mtime", "ctime") for term in iter_terms(self.syntax_tree))
+        # Removing the trailing separator of the root directory
+        self.search_from_depth = search_from.rstrip(os.sep).count(os.sep)
+
+    # Testing a single file, stat can be given for files, which aren't on the disk, or from the scan (see RangeStat)
+    # and size for folders, whose size is already known
+    def match(self, path: str, is_folder: bool, stat=None, size=None) -> bool:
+        return self.predicate(QueryEntry(path, is_folder, self.search_from_depth, stat, size))
+
+    # Testing if any file in a folder and its subfolders can match, using its FF_Index.DirectoryAggregate
+    def subtree_may_match(self, directory_aggregate) -> bool:
+        return self.subtree_check(directory_aggregate)
+
+
+# Going through all terms of a syntax tree
+def iter_terms(node):
+    if isinstance(node, QueryTerm):
+        yield node
+    elif isinstance(node, QueryNot):
+        yield from iter_terms(node.child)
+    else:
+        for child in node.children:
+            yield from iter_terms(child)
+
+
+# Parse and compile a query, raises QuerySyntaxError if the query is invalid
+def compile_query(query: str, search_from: str) -> QueryPlan:
+    return QueryPlan(query, search_from)
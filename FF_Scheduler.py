@@ -0,0 +1,143 @@
+# This source file is a part of File Find made by Pixel-Master
+#
+# Copyright 2022-2025 Pixel-Master
+#
+# This software is licensed under the "GPLv3" License as described in the "LICENSE" file,
+# which should be included with this package. The terms are also available at
+# http://www.gnu.org/licenses/gpl-3.0.html
+
+# This file contains the scheduler, which runs searches and other tasks reading the disk in a shared thread pool
+
+# Imports
+import heapq
+import itertools
+import logging
+import os
+import threading
+
+# PySide6 Gui Imports
+from PySide6.QtCore import QThreadPool
+
+# The number of tasks running at once
+MAX_RUNNING_TASKS = 4
+# The number of tasks running at once on the same device, more tasks would make a hard drive jump between them
+MAX_TASKS_PER_DEVICE = 2
+
+# Tasks the user waits for (like searches) are started before background tasks.
+# Background tasks (like hashing for duplicated files) always leave a free place for them
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+
+# Getting the device a path is on, tasks on the same device wait in the same queue
+def get_device(path: str):
+    try:
+        return os.stat(path).st_dev
+    except OSError:
+        # The task itself will fail, no need to wait for other tasks
+        return path
+
+
+# A function waiting to be run by the scheduler, sorted by priority and then by the order they were added
+class Task:
+    def __init__(self, name: str, function, device, priority: int, number: int):
+        self.name = name
+        self.function = function
+        self.device = device
+        self.priority = priority
+        self.number = number
+
+    def __lt__(self, other):
+        return (self.priority, self.number) < (other.priority, other.number)
+
+
+class Scheduler:
+    def __init__(self):
+        # Tasks are added and removed from different threads
+        self.lock = threading.Lock()
+        # A heap of waiting tasks for every device
+        self.queues: dict = {}
+        # The number of running tasks by device and by priority
+        self.running_by_device: dict = {}
+        self.running = 0
+        self.task_numbers = itertools.count()
+        # Created with the first task, as QThreadPool needs Qt to be set up
+        self.thread_pool = None
+
+    # Adding a task, which reads from the device of path.
+    # Returns True if the task was started immediately and False if it has to wait
+    def submit(self, name: str, function, path: str, priority: int = PRIORITY_INTERACTIVE) -> bool:
+        task = Task(name, function, get_device(path), priority, next(self.task_numbers))
+
+        with self.lock:
+            heapq.heappush(self.queues.setdefault(task.device, []), task)
+            started_tasks = self.take_startable_tasks()
+        self.start(started_tasks)
+
+        if task not in started_tasks:
+            # Debug
+            logging.info(f"Queued {name}, {self.queued_count()} tasks are waiting")
+            return False
+        return True
+
+    # The number of tasks waiting to be started
+    def queued_count(self) -> int:
+        with self.lock:
+            return sum(len(queue) for queue in self.queues.values())
+
+    # Testing if a task can be started now, must be called with the lock
+    def can_start(self, task: Task) -> bool:
+        running_on_device = self.running_by_device.get(task.device, [0, 0])
+        if sum(running_on_device) >= MAX_TASKS_PER_DEVICE:
+            return False
+        # Background tasks leave a free place on their device and in the pool, for the tasks the user waits for
+        if task.priority == PRIORITY_BACKGROUND:
+            return (sum(running_on_device) < MAX_TASKS_PER_DEVICE - 1 and
+                    self.running < MAX_RUNNING_TASKS - 1)
+        return True
+
+    # Taking the tasks, which can be started, the first task of every device is compared, as the tasks of a
+    # device are sorted. Must be called with the lock
+    def take_startable_tasks(self) -> list:
+        started_tasks = []
+        while self.running < MAX_RUNNING_TASKS:
+            startable_tasks = [queue[0] for queue in self.queues.values() if self.can_start(queue[0])]
+            if not startable_tasks:
+                break
+
+            task = min(startable_tasks)
+            heapq.heappop(self.queues[task.device])
+            if not self.queues[task.device]:
+                del self.queues[task.device]
+
+            self.running += 1
+            self.running_by_device.setdefault(task.device, [0, 0])[task.priority] += 1
+            started_tasks.append(task)
+        return started_tasks
+
+    def start(self, tasks: list):
+        if tasks and self.thread_pool is None:
+            self.thread_pool = QThreadPool()
+            self.thread_pool.setMaxThreadCount(MAX_RUNNING_TASKS)
+
+        for task in tasks:
+            # Debug
+            logging.debug(f"Starting {task.name}")
+            self.thread_pool.start(lambda run_task=task: self.run(run_task))
+
+    # Running a task and starting the next ones after it finished
+    def run(self, task: Task):
+        try:
+            task.function()
+        finally:
+            with self.lock:
+                self.running -= 1
+                self.running_by_device[task.device][task.priority] -= 1
+                if not any(self.running_by_device[task.device]):
+                    del self.running_by_device[task.device]
+                started_tasks = self.take_startable_tasks()
+            self.start(started_tasks)
+
+
+# The scheduler used by all windows
+SCHEDULER = Scheduler()
@@ -6,72 +6,31 @@
 # which should be included with this package. The terms are also available at
 # http://www.gnu.org/licenses/gpl-3.0.html
 
-# This file contains the code for the search engine
+# This file contains the code for starting searches from the user-interface and loading saved searches,
+# the search itself runs in FF_Engine
 
 # Imports
 import logging
 import os
-import re
-import time
-from unicodedata import normalize
-from fnmatch import fnmatch
-from json import dump, load
+from json import dump, load, JSONDecodeError
 from sys import platform
-from time import perf_counter, mktime
-import difflib
 
 # PySide6 Gui Imports
-from PySide6.QtCore import QThreadPool, Signal, QObject, QDate, Qt
+from PySide6.QtCore import Signal, QObject, QDate, Qt
 from PySide6.QtWidgets import QWidget
 
 # Projects Libraries
 import FF_Additional_UI
+import FF_Cancel
+import FF_Content
+import FF_Engine
 import FF_Files
+import FF_Index
 import FF_Main_UI
+import FF_Scheduler
 import FF_Search_UI
 import FF_Settings
-
-
-# Sorting algorithms
-class Sort:
-
-    # Sort by Size
-    @staticmethod
-    def size(file):
-        return FF_Files.get_file_size(file)
-
-    # Sort by Name
-    @staticmethod
-    def name(file):
-        try:
-            return os.path.basename(file)
-        except FileNotFoundError:
-            return -1
-
-    # Sort by Date Modified
-    @staticmethod
-    def m_date(file):
-        try:
-            return os.path.getmtime(file)
-        except FileNotFoundError:
-            return -1
-
-    # Sort by Date Created on macOS
-    @staticmethod
-    def c_date_mac(file):
-        try:
-            # Using os.stat because os.path.getctime returns a wrong date
-            return os.stat(file).st_birthtime
-        except FileNotFoundError:
-            return -1
-
-    # Sort by Date Created on Windows
-    @staticmethod
-    def c_date_win(file):
-        try:
-            return os.path.getctime(file)
-        except FileNotFoundError:
-            return -1
+import FF_SortKeys
 
 
 # Loading a saved search
@@ -95,7 +54,8 @@ class LoadSearch:
                 # Dictionary which is going to be dumped into the cache file
                 dump_dict = {"VERSION": FF_Files.FF_CACHE_VERSION,
                              "found_path_set": saved_file_content["matched_list"],
-                             "type_dict": {}}
+                             "type_dict": {},
+                             "archive_members": {}}
 
                 # Getting types
                 for cache_file in saved_file_content["matched_list"]:
@@ -104,6 +64,23 @@ class LoadSearch:
                     else:
                         dump_dict["type_dict"][cache_file] = "file"
 
+                # Creating the index of all file extensions
+                dump_dict["extension_index"] = FF_Index.dump_extension_index(
+                    FF_Index.build_extension_index(saved_file_content["matched_list"]),
+                    set(saved_file_content["matched_list"]))
+
+                # Creating the range indexes of the sizes and dates,
+                # the files are read in parallel and the values are kept as sort keys for the windows of the search
+                key_cache = FF_SortKeys.get_key_cache(FF_Files.path_to_cache_file(load_file, -1))
+                key_cache.read_missing(saved_file_content["matched_list"])
+                dump_dict["found_path_set"], dump_dict["range_indexes"] = FF_Index.dump_range_indexes(
+                    FF_Index.build_range_indexes(
+                        [key_cache.get_values(cache_file) for cache_file in saved_file_content["matched_list"]]),
+                    saved_file_content["matched_list"], set(saved_file_content["matched_list"]))
+
+                # Saved searches only contain the found files, so there are no aggregates of the folders
+                dump_dict["directory_aggregates"] = None
+
                 # Create a new cache file
                 with open(FF_Files.path_to_cache_file(load_file, -1), "w") as cached_search:
                     # Dump the content of the save into the cache with JSON into the file
@@ -149,14 +126,15 @@ class LoadSearch:
                                     FF_Files.path_to_cache_file(load_file, -1), parent])
 
 
-# The Search Engine
+# The Search Engine, running FF_Engine.SearchEngine with the input of the main window and showing the results
 class Search:
     def __init__(self, data_name, data_name_specifier, data_consider_case, data_similarity, data_filetype,
                  data_file_size_min, data_file_size_max,
                  data_file_size_min_unit, data_file_size_max_unit, data_library,
                  data_search_for, data_search_from_valid, data_search_from_unchecked, data_content, data_date_edits,
                  data_sort_by, data_reverse_sort, data_file_group, data_file_type_mode, data_folder_depth,
-                 data_folder_depth_custom, parent: QWidget, new_cache_file=False):
+                 data_folder_depth_custom, parent: QWidget, new_cache_file=False, data_query="",
+                 data_content_binary=False, data_content_mode=FF_Content.CONTENT_MODE_TEXT, data_result_limit=0):
         # Debug
         logging.debug("Converting Date-times...")
 
@@ -187,13 +165,20 @@ class Search:
             # Saving the time
             unix_time_list[time_drop_down[0]] = time_to_add_to_time_list
 
+        # The dates are only filtered, if they aren't the default dates
+        for date_type in ("c_date", "m_date"):
+            if unix_time_list[f"{date_type}_from"] == self.DEFAULT_TIME_INPUT[f"{date_type}_from"] and \
+                    unix_time_list[f"{date_type}_to"] == self.DEFAULT_TIME_INPUT[f"{date_type}_to"]:
+                unix_time_list[f"{date_type}_from"] = None
+                unix_time_list[f"{date_type}_to"] = None
+
         # Convert file size values to bytes and test if file size numbers are valid
         try:
             if data_file_size_min_unit == "No Limit" and data_file_size_min_unit == "No Limit":
                 # Store data
                 size_data = "unused"
-                data_file_size_max = ""
-                data_file_size_min = ""
+                data_file_size_max = None
+                data_file_size_min = None
             else:
                 # Replacing No Limit with fixed values
                 if data_file_size_min_unit == "No Limit":
@@ -203,56 +188,55 @@ class Search:
                     # Using 1 Petabyte as the upper limit
                     data_file_size_max = 1e15
 
-                size_unit_factors = {"No Limit": 1, "Bytes": 1, "KB": 1000, "MB": 1000000, "GB": 1000000000}
-
-                # Adjust units
-                data_file_size_min = float(data_file_size_min) * size_unit_factors[data_file_size_min_unit]
-                data_file_size_max = float(data_file_size_max) * size_unit_factors[data_file_size_max_unit]
-
-                # Testing if may is larger than min other
-                if data_file_size_min <= data_file_size_max:
-                    size_data = "valid"
-                else:
-                    # Max is smaller than min
-                    size_data = "invalid"
+                # Adjust units, the engine tests if max is larger than min
+                data_file_size_min = float(data_file_size_min) * FF_Engine.SIZE_UNIT_FACTORS[data_file_size_min_unit]
+                data_file_size_max = float(data_file_size_max) * FF_Engine.SIZE_UNIT_FACTORS[data_file_size_max_unit]
+                size_data = "valid"
 
         except ValueError:
             size_data = "invalid"
 
         logging.debug(f"{size_data=}, {data_file_size_min=}, {data_file_size_max=}")
 
-        # Loading excluded files
-        data_excluded_files = FF_Settings.SettingsWindow.load_setting("excluded_files")
-
-        # Checking if the search scope is an excluded directory
-        excluded_files_block_search = False
-        for excluded_file in data_excluded_files:
-            if data_search_from_valid.startswith(excluded_file):
-                excluded_files_block_search = True
-                break
+        # Checked while searching, cancelled with the "Cancel" action of the menu bar log
+        self.cancel_token = FF_Cancel.CancelToken()
+
+        # Creating the search engine, which tests the filters
+        query_error = None
+        search_engine = None
+        if size_data != "invalid":
+            try:
+                search_engine = FF_Engine.SearchEngine(
+                    FF_Engine.SearchQuery(
+                        search_from=data_search_from_valid,
+                        name=data_name, name_specifier=data_name_specifier, consider_case=data_consider_case,
+                        similarity=data_similarity,
+                        file_type_mode=data_file_type_mode, file_group=data_file_group, filetype=data_filetype,
+                        search_for=data_search_for, library=data_library,
+                        folder_depth=data_folder_depth, folder_depth_custom=data_folder_depth_custom,
+                        file_size_min=data_file_size_min, file_size_max=data_file_size_max,
+                        c_date_from=unix_time_list["c_date_from"], c_date_to=unix_time_list["c_date_to"],
+                        m_date_from=unix_time_list["m_date_from"], m_date_to=unix_time_list["m_date_to"],
+                        content=data_content, content_mode=data_content_mode, content_binary=data_content_binary,
+                        query=data_query,
+                        sort_by=data_sort_by, reverse_sort=data_reverse_sort, result_limit=data_result_limit,
+                        new_cache_file=new_cache_file,
+                        excluded_files=FF_Settings.SettingsWindow.load_setting("excluded_files"),
+                        use_ignore_files=FF_Settings.SettingsWindow.load_setting("use_ignore_files"),
+                        search_in_archives=FF_Settings.SettingsWindow.load_setting("search_in_archives"),
+                        content_index=FF_Settings.SettingsWindow.load_setting("content_index")),
+                    # Sending every stage to the signal with the same name
+                    progress=lambda stage: getattr(self.signals, stage).emit(),
+                    # Showing the results in the search window while scanning, if activated in the settings
+                    stream=(lambda streamed_results: self.signals.streamed_results.emit(streamed_results))
+                    if FF_Settings.SettingsWindow.load_setting("stream_results") else None,
+                    cancel_token=self.cancel_token)
+            except FF_Engine.QueryError as search_query_error:
+                query_error = search_query_error
 
         # Fetching Errors
-        # Testing if file ending, file groups or name contains are used together with name,
-        # because if they do no file will be found
-        # Also testing if wildcard syntax is used in data_name,
-        # because wildcard is supported and so no error should appear
-        wildcard_used = ("[" in data_name) or ("?" in data_name) or ("*" in data_name)
-        file_types_used = (
-                (data_file_type_mode == "custom" and data_filetype != "") or
-                (data_file_type_mode == "predefined" and data_file_group != list(FF_Files.FILE_FORMATS.keys())))
-        if data_name != "" and file_types_used and not wildcard_used and data_name_specifier == "is:":
-            # Debug
-            logging.error("File name \"is\" can't be used together with file type")
-
-            # Show Popup
-            FF_Additional_UI.PopUps.show_critical_messagebox(
-                "NAME ERROR!",
-                "Name Error!\n\nFile name \"is\" can't be used together with file type"
-                " as there would be no files found",
-                parent=None)
-
         # Directory not valid
-        elif data_search_from_valid != data_search_from_unchecked and not os.path.isdir(data_search_from_unchecked):
+        if data_search_from_valid != data_search_from_unchecked and not os.path.isdir(data_search_from_unchecked):
             # Debug
             logging.error("Directory Error! Given directory is not a valid folder!")
 
@@ -262,7 +246,7 @@ class Search:
                 "Directory Error!\n\nGiven directory is not a valid folder!",
                 parent=None)
 
-        # File Size max must be larger than File Size min
+        # File Size isn't a number
         elif size_data == "invalid":
             # Debug
             logging.error("Size Error! File Size min is larger than File Size max or one of them is invalid!")
@@ -273,57 +257,10 @@ class Search:
                 "Size Error!\n\nFile size min is larger than file size max or one of them is invalid!",
                 parent=None)
 
-        # First Date must be earlier than second Date
-        elif unix_time_list["c_date_from"] >= unix_time_list["c_date_to"] or \
-                unix_time_list["m_date_from"] >= unix_time_list["m_date_to"]:
-            # Debug
-            logging.error("Date Error! First Date is later than second Date!")
-
-            # Show Popup
-            FF_Additional_UI.PopUps.show_critical_messagebox("DATE ERROR!",
-                                                             "Date Error!\n\n"
-                                                             "First date must be earlier than second date!\n\n"
-                                                             "e.g.:\nvalid: 15.Feb.2022 - 17.Feb.2023\n"
-                                                             "invalid: 17.Feb.2023 - 15.Feb.2022",
-                                                             parent=None)
-
-        # Search in System Files disabled, but Search path is in library Folder
-        elif ((not data_library) and ("/Library" in data_search_from_valid)) or \
-                (not data_library) and (data_search_from_valid.startswith("/System")):
-            # Debug
-            logging.error("System Files Error! Search in System Files disabled, but Directory is in Library Folder")
-
-            # Show Popup
-            FF_Additional_UI.PopUps.show_critical_messagebox("System Files Error!",
-                                                             "System Files Error!\n\nActivate Search in System Files!\n"
-                                                             "Search in system files disabled"
-                                                             " but search directory is in library folder!",
-                                                             parent=None)
-
-        # If data_file_group is an empty list (no files would be found)
-        elif not data_file_group and data_file_type_mode == "predefined":
-            # Debug
-            logging.error("File Types Error! No File Types are selected")
-
+        # The engine found an error in the filters, it's already logged
+        elif query_error is not None:
             # Show Popup
-            FF_Additional_UI.PopUps.show_critical_messagebox("File Types Error!",
-                                                             "File Types Error!\n\nSelect a file type!\n"
-                                                             "No files would be found, because no file type "
-                                                             "category is selected.",
-                                                             parent=None)
-
-        # If the search scope is an excluded file
-        elif excluded_files_block_search:
-            # Debug
-            logging.error("Directory Error! Search in directory is in an excluded directory")
-
-            # Show Popup
-            FF_Additional_UI.PopUps.show_critical_messagebox(
-                "Directory Error!",
-                "Directory Error!\n\n"
-                "The directory you searched in is in an excluded folder.\n\n"
-                "You can edit the excluded folders in the File Find Settings. \n(File Find > Preferences...)",
-                parent=None)
+            FF_Additional_UI.PopUps.show_critical_messagebox(query_error.title, query_error.message, parent=None)
 
         # Start Searching
         else:
@@ -333,7 +270,7 @@ class Search:
             ACTIVE_SEARCH_THREADS += 1
 
             # Defining menu bar log
-            self.ui_logger = FF_Main_UI.SearchUpdate(data_search_from_valid)
+            self.ui_logger = FF_Main_UI.SearchUpdate(data_search_from_valid, self.cancel_token)
 
             # Testing Cache
             FF_Files.cache_test(is_launching=False)
@@ -342,9 +279,9 @@ class Search:
             logging.info("Starting Search...")
             logging.debug(f"Running Threads: {ACTIVE_SEARCH_THREADS}")
 
-            # Setting up QThreadPool
+            # Setting up the thread
             self.ui_logger.update("Setting up Thread...")
-            logging.debug("Setting up QThreadPool...")
+            logging.debug("Setting up the thread...")
 
             # Creating Qt Signal
             class SignalClass(QObject):
@@ -362,33 +299,58 @@ class Search:
                 indexing_m_date = Signal()
                 indexing_file_size = Signal()
                 indexing_file_content = Signal()
+                indexing_query = Signal()
+                indexing_columns = Signal()
+                scanning_archives = Signal()
+                updating_content_index = Signal()
                 sorting_name = Signal()
                 sorting_size = Signal()
                 sorting_c_date = Signal()
                 sorting_m_date = Signal()
                 sorting_path = Signal()
                 sorting_reversed = Signal()
+                sorting_limited = Signal()
+                streamed_results = Signal(list)
                 caching = Signal()
                 building_ui = Signal()
 
-                finished = Signal()
+                finished = Signal(FF_Engine.SearchResult)
+                cancelled = Signal()
                 waiting = Signal()
-
-            # Defining thread
-            self.thread = QThreadPool(parent)
+                waiting_for_scan = Signal()
 
             # Setup Qt6 Signal
             self.signals = SignalClass()
             # Displaying "Please Wait"
             self.signals.waiting.connect(lambda: FF_Main_UI.MainWindow.update_search_status_label(ui_building=True))
             # Debug
-            self.signals.finished.connect(lambda: logging.info("Finished Search Thread!\n"))
-            # Launching UI
-            self.signals.finished.connect(lambda: FF_Search_UI.SearchWindow(*SEARCH_OUTPUT))
+            self.signals.finished.connect(lambda search_result: logging.info("Finished Search Thread!\n"))
+            # The search window showing the results found while scanning, it is created with the first results
+            self.streaming_window = None
+
+            def show_streamed_results(streamed_results: list):
+                if self.streaming_window is None:
+                    self.streaming_window = FF_Search_UI.SearchWindow(
+                        None, [], data_search_from_valid, None, parent, streaming=True)
+                self.streaming_window.add_streamed_results(streamed_results)
+
+            self.signals.streamed_results.connect(show_streamed_results)
+
+            # Launching UI, or replacing the streamed results with the sorted ones
+            def show_search_results(search_result: FF_Engine.SearchResult):
+                if self.streaming_window is None:
+                    FF_Search_UI.SearchWindow(*search_result.window_arguments(parent))
+                else:
+                    self.streaming_window.finish_streaming(*search_result.window_arguments(parent))
+
+            self.signals.finished.connect(show_search_results)
 
             # Connecting the menu-bar log to the signals
             self.signals.starting.connect(lambda: self.ui_logger.update("Starting Search..."))
             self.signals.scanning.connect(lambda: self.ui_logger.update("Scanning..."))
+            self.signals.waiting_for_scan.connect(
+                lambda: self.ui_logger.update("Waiting for the scan of another search..."))
+            self.signals.scanning_archives.connect(lambda: self.ui_logger.update("Reading archives..."))
             self.signals.indexing.connect(lambda: self.ui_logger.update("Indexing..."))
             self.signals.indexing_name.connect(
                 lambda: self.ui_logger.update(f"Indexing Name {data_name_specifier.rstrip(':')}..."))
@@ -402,6 +364,9 @@ class Search:
             self.signals.indexing_m_date.connect(lambda: self.ui_logger.update("Indexing date modified..."))
             self.signals.indexing_file_size.connect(lambda: self.ui_logger.update("Indexing file size..."))
             self.signals.indexing_file_content.connect(lambda: self.ui_logger.update("Indexing file contains..."))
+            self.signals.indexing_query.connect(lambda: self.ui_logger.update("Filtering with query..."))
+            self.signals.indexing_columns.connect(lambda: self.ui_logger.update("Filtering sizes and dates..."))
+            self.signals.updating_content_index.connect(lambda: self.ui_logger.update("Updating content index..."))
             self.signals.sorting_name.connect(lambda: self.ui_logger.update("Sorting results by name..."))
             self.signals.sorting_size.connect(lambda: self.ui_logger.update("Sorting results by size..."))
             self.signals.sorting_c_date.connect(lambda: self.ui_logger.update("Sorting results by creation date..."))
@@ -409,765 +374,183 @@ class Search:
                                                 self.ui_logger.update("Sorting results by modification date..."))
             self.signals.sorting_path.connect(lambda: self.ui_logger.update("Sorting results by path..."))
             self.signals.sorting_reversed.connect(lambda: self.ui_logger.update("Reversing results..."))
+            self.signals.sorting_limited.connect(
+                lambda: self.ui_logger.update(f"Sorting the first {data_result_limit} results..."))
             self.signals.caching.connect(lambda: self.ui_logger.update("Caching search results..."))
             self.signals.building_ui.connect(lambda: self.ui_logger.update("Building UI..."))
-            self.signals.finished.connect(lambda: self.ui_logger.close())
-
-            # Starting the Thread
-            self.thread.start(
-                lambda: self.searching(
-                    data_name=data_name, data_name_specifier=data_name_specifier, data_consider_case=data_consider_case,
-                    data_similarity=data_similarity,
-                    data_filetype=data_filetype, data_file_group=data_file_group,
-                    data_file_type_mode=data_file_type_mode,
-                    data_file_size_min=data_file_size_min, data_file_size_max=data_file_size_max,
-                    data_search_from=data_search_from_valid,
-                    data_search_for=data_search_for, data_library=data_library,
-                    data_folder_depth=data_folder_depth, data_folder_depth_custom=data_folder_depth_custom,
-                    data_content=data_content,
-                    data_time=unix_time_list,
-                    data_sort_by=data_sort_by, data_reverse_sort=data_reverse_sort,
-                    data_excluded_files=data_excluded_files, new_cache_file=new_cache_file, parent=parent))
-
-            # Debug
-            logging.debug("Finished Setting up QThreadPool!")
-
-    # The search engine
-    def searching(self, data_name, data_name_specifier, data_consider_case, data_similarity, data_filetype,
-                  data_file_size_min, data_file_size_max, data_library,
-                  data_search_from, data_search_for, data_content, data_time, data_sort_by, data_reverse_sort,
-                  data_file_group, data_file_type_mode, data_folder_depth,
-                  data_folder_depth_custom, data_excluded_files, new_cache_file, parent):
-        # Debug
-        logging.info("Starting Search...")
-        self.signals.starting.emit()
-
-        # Saving time before scanning
-        time_before_start = perf_counter()
-
-        # Remove the "." and any star because they are added later
-        data_filetype = data_filetype.lstrip(".*")
-
-        # Lower Arguments to remove case sensitivity
-        if not data_consider_case or data_name_specifier == "is similar to:":
-            data_name: str = data_name.lower()
-        # Convert percentage to ratio
-        data_similarity /= 100
-        data_filetype = data_filetype.lower()
-
-        '''
-        There are multiple possibilities in unicode on how to display some characters (for example ä, ü, ö).
-        A decomposed form NFD (normal form D) ä = a + ¨
-        and a composed one NFC (normal form C) ä = ä
-        On macOS the filesystem returns the names for files created locally as NFD while everyone else does NFC.
-        It is possible to place NFC characters in macOS file names. But not for a normal user.
-
-        If you have problems on macOS with composed/decomposed unicode character remove the four lines of code below.
-        '''
-        # Normalising arguments (see above)
-        if platform == "darwin":
-            data_name = normalize("NFD", data_name)
-            data_filetype = normalize("NFD", data_filetype)
-
-        # Checking if created time checking is needed
-        if data_time["c_date_from"] == self.DEFAULT_TIME_INPUT["c_date_from"] and \
-                data_time["c_date_to"] == self.DEFAULT_TIME_INPUT["c_date_to"]:
-            data_c_time_needed = False
-            logging.debug("Created time checking is NOT needed")
-
-        else:
-            logging.debug("Created time checking is needed")
-            data_c_time_needed = True
-
-        # Checking if modified time checking is needed
-        if data_time["m_date_from"] == self.DEFAULT_TIME_INPUT["m_date_from"] and \
-                data_time["m_date_to"] == self.DEFAULT_TIME_INPUT["m_date_to"]:
-            data_m_time_needed = False
-            logging.debug("Modified time checking is NOT needed")
-
-        else:
-            logging.debug("Modified time checking is needed")
-            data_m_time_needed = True
-
-        # Checking if data_search_for is needed
-        if data_search_for == "All Files and Folders":
-            # needed
-            logging.debug("Files and folders checking is needed")
-            data_search_for_needed = False
-        else:
-            # not needed
-            logging.debug("Files and folders checking is NOT needed")
-            data_search_for_needed = True
-
-        # Testing if one of the excluded folder is in the search scope, if not checking isn't necessary
-        exclude_file_in_scope = False
-        for excluded_test_file in data_excluded_files:
-            if excluded_test_file.startswith(data_search_from):
-                exclude_file_in_scope = True
-                break
-
-        # If data_excluded_files is an empty list or no file in the excluded list is in the search scope
-        if not data_excluded_files or not exclude_file_in_scope:
-            # If the list is empty
-            logging.debug("Excluded files checking is NOT needed")
-            data_excluded_files_needed = False
-
-        else:
-            logging.debug("Excluded files checking is needed")
-            data_excluded_files_needed = True
-
-        # Checking if check for file type is needed
-        if ((set(data_file_group) != set(FF_Files.FILE_FORMATS.keys()) and data_file_type_mode == "predefined") or
-                (data_filetype != "" and data_file_type_mode == "custom")):
-            logging.debug("File type checking is needed")
-
-            # Creating a set and adding every needed file format to it
-            allowed_filetypes_set = set()
-            disallowed_filetypes_set = set()  # Needed if "other" is activated and user chose "predefined"
-
-            if data_file_type_mode == "predefined":
-                # Iterating through the list of file group type
-                for file_group in FF_Files.FILE_FORMATS.keys():
-                    # Needing two lists because of "other",
-                    # when it's activated all groups, which are not allowed are collected
-                    # Else all allowed groups are collected
-                    # This is because "other" is everything else, which isn't in a group.
-                    if file_group in data_file_group:
-                        for file in FF_Files.FILE_FORMATS[file_group]:
-                            allowed_filetypes_set.add(file)
-                    else:
-                        for file in FF_Files.FILE_FORMATS[file_group]:
-                            disallowed_filetypes_set.add(file)
-
-            elif data_file_type_mode == "custom":
-                # Semicolons can be used for entering multiple possible file types,
-                # removing all spaces as filetypes have none (at least sane people don't use them)
-                # removing all the dots (the most left on already has been removed)
-                allowed_filetypes_set = data_filetype.replace(" ", "").replace(";.", ";").split(";")
-
-            # Making tuples out of the sets for better performance
-            allowed_filetypes = tuple(allowed_filetypes_set)
-            disallowed_filetypes = tuple(disallowed_filetypes_set)
-
-        else:
-            logging.debug("File type checking is NOT needed")
-            # Because checking isn't needed and wwe don't want automated tools to flag this as "possibly unassigned"
-            allowed_filetypes = None
-            disallowed_filetypes = None
-
-        # Processing folder depth input
-        if data_folder_depth == "Unlimited":
-            # folder_depth_global_limit is basically just the amount of "/" (on macOS)
-            # that are allowed in the path of a file
-            # -1 means infinite
-            folder_depth_global_limit = -1
-        elif data_folder_depth == "No subfolders":
-            folder_depth_global_limit = data_search_from.count(os.sep)
-        elif data_folder_depth == "Custom":
-            # Using data_search_from.count(os.sep) as the depth is relative to the directory that is searched in
-            folder_depth_global_limit = data_search_from.count(os.sep) + data_folder_depth_custom
-        else:
-            # Shouldn't be reached
-            logging.fatal("Error in code while processing folder depth limit")
-            raise ValueError
-
-        # Debug
-        logging.info("Starting Scanning...")
-        # Update the menu-bar status
-        self.signals.scanning.emit()
-
-        '''Checking, if a Cache File exists in any fitting directory'''
-        newest_fitting_cache_file = None
-        newest_fitting_cache_file_c_date = 0
+            self.signals.finished.connect(lambda search_result: self.ui_logger.close())
 
-        # On Windows the "C:\" has to be stripped
-        if platform == "win32" or platform == "cyqwin":
-            comparable_data_search_from = data_search_from[2:].replace(os.sep, "-") + "-"
-        else:
-            comparable_data_search_from = data_search_from.replace(os.sep, "-") + "-"
-
-        for cache_file in os.listdir(FF_Files.CACHED_SEARCHES_FOLDER):
-            # Looks if there is a cache file for a higher directory add a folder separator ("-") so that files
-            # from the same directory with a similar name aren't mistaken for files from a parent directory
-            # A dollar sign marks the beginning of the absolute depth limit of the cache file
-            # "-" marks a folder separator
-            # comparable_cache_file is basically the original search path but all "/" are replaced with "-"
-            comparable_cache_file = ((cache_file.removesuffix(".FFCache")[:cache_file.rfind("$")]) + "-")
-
-            if comparable_data_search_from.startswith(comparable_cache_file):
-                # Date created and global folder depth (which must match) from separate file
-                with open(os.path.join(FF_Files.CACHE_METADATA_FOLDER, cache_file)) as time_file:
-                    metadata = load(time_file)
-                    cache_file_c_date = metadata["c_time"]
-                    cache_file_depth = metadata["global_depth_limit"]
-
-                # Looks if the creation time is newer than the current best fitting file
-                # Also check if the global depth matches up
-                if ((cache_file_c_date > newest_fitting_cache_file_c_date) and
-                        (cache_file_depth == folder_depth_global_limit)):
-                    newest_fitting_cache_file_c_date = cache_file_c_date
-                    newest_fitting_cache_file = os.path.join(FF_Files.CACHED_SEARCHES_FOLDER, cache_file)
-
-        # If there is a fitting cache file and user didn't request new cache file to be created
-        if newest_fitting_cache_file is not None and not new_cache_file:
-            # Debug
-            logging.info(f"Scanning using cached data from {newest_fitting_cache_file}"
-                         f" created at {time.ctime(newest_fitting_cache_file_c_date)}")
-
-            used_cache = True
-            # Load cache
-            with open(newest_fitting_cache_file) as search_results:
-                load_input = load(search_results)
-
-            # If the found cache file is form the same directory as the one the search was for
-            if newest_fitting_cache_file == FF_Files.path_to_cache_file(data_search_from, folder_depth_global_limit):
-                # Debug
-                logging.debug("Cache file from the same directory as search")
-
-                found_path_set = set(load_input["found_path_set"])
-                type_dict = load_input["type_dict"]
-
-            # If it's a cache file from a parent dir
-            else:
-                # Debug
-                logging.debug("Cache file from an higher directory, sorting out unnecessary files")
+            # Closing everything if the search was cancelled
+            def search_cancelled():
+                self.ui_logger.close()
+                FF_Main_UI.MainWindow.update_search_status_label()
+                if self.streaming_window is not None:
+                    self.streaming_window.Search_Results_Window.close()
 
-                found_path_set = set(load_input["found_path_set"])
-                type_dict = load_input["type_dict"]
+            self.signals.cancelled.connect(search_cancelled)
 
-                keep_time = time.perf_counter()
-
-                # Remove irrelevant paths
-                for found_item in found_path_set.copy():
-                    if not found_item.startswith(data_search_from):
-                        found_path_set.remove(found_item)
-                        del type_dict[found_item]
-
-                # make sure the path isn't in the list
-                try:
-                    found_path_set.remove(data_search_from)
-                except (KeyError, NameError):
-                    pass
+            # Running the search, a cancelled search stops with FF_Cancel.SearchCancelled
+            def run_search():
+                global ACTIVE_SEARCH_THREADS
+                search_result = None
                 try:
-                    del type_dict[data_search_from]
-                except KeyError:
-                    pass
-
-                logging.debug(f"Sorting out unnecessary files took {perf_counter() - keep_time} sec.")
-
-        # If there is no newer cache file
-        else:
-
-            # Create empty lists for the files
-            found_path_set: set = set()
-            type_dict: dict = {}
-
-            used_cache = False
-
-            # Going through every file and every folder using the os.walk() method
-            # Saving every file to found_path_set and the type (file or folder) to found_path_dict
-            # Only running this if folder_depth_global_limit == -1 which means that the folder depth is unlimited
-            if folder_depth_global_limit == -1:
-                # Not putting this into its own function as it would be noticeably slower
-                for (root, dirs, files) in os.walk(data_search_from):
-                    for file in files:
-                        # Saving types to the dictionaries
-                        type_dict[os.path.join(root, file)] = "file"
-                        # Saving the path to a list for fast access
-                        found_path_set.add(os.path.join(root, file))
-
-                    for directory in dirs:
-                        # Saving types to the dictionaries
-                        type_dict[os.path.join(root, directory)] = "folder"
-
-                        # Saving the path to a list for fast access
-                        found_path_set.add(os.path.join(root, directory))
-            # If folder depth is used
-            else:
-                # Not putting this into its own function as it would be noticeably slower
-                for (root, dirs, files) in os.walk(data_search_from):
-                    if root.count(os.sep) <= folder_depth_global_limit:
-                        # If depth is in range
-                        for file in files:
-                            # Saving types to the dictionaries
-                            type_dict[os.path.join(root, file)] = "file"
-                            # Saving the path to a list for fast access
-                            found_path_set.add(os.path.join(root, file))
-                        for directory in dirs:
-                            # Saving types to the dictionaries
-                            type_dict[os.path.join(root, directory)] = "folder"
-
-                            # Saving the path to a list for fast access
-                            found_path_set.add(os.path.join(root, directory))
+                    search_result = search_engine.run()
+
+                    # Updating search status indicator
+                    self.signals.waiting.emit()
+                    self.signals.building_ui.emit()
+                except FF_Cancel.SearchCancelled:
+                    # Debug
+                    logging.info("Search was cancelled!\n")
+                finally:
+                    # Updating Thread count, also if the search failed
+                    ACTIVE_SEARCH_THREADS -= 1
+                    if search_result is None:
+                        # Closing the menu-bar log, if the search was cancelled or failed
+                        self.signals.cancelled.emit()
                     else:
-                        # Removing element from this list prevent python from visiting these directories
-                        for directory in dirs:
-                            dirs.remove(directory)
-
-        # Saving time
-        time_after_searching = perf_counter() - time_before_start
-
-        # Debug
-        logging.info("Starting Indexing...")
-        # Update the menu-bar status
-        self.signals.indexing.emit()
-
-        # Creating a copy because items can't be removed while iterating over a set
-        copy_found_path_set = found_path_set.copy()
-        original_found_path_set = found_path_set.copy()
-
-        # Applies filters, when they don't match the function remove them from the found_path_dict
-        # Name
-        logging.info(f"Indexing Name \"{data_name_specifier}\"...")
-        self.signals.indexing_name.emit()
-        if data_name != "":
-            # Name is equal
-            # Ignoring case
-            if data_name_specifier == "is:" and not data_consider_case:
-                # Scan every file
-                for name_file in found_path_set:
-                    if not fnmatch(os.path.basename(name_file).lower(), data_name):
-                        copy_found_path_set.remove(name_file)
-            # Considering case
-            if data_name_specifier == "is:" and data_consider_case:
-                for name_file in found_path_set:
-                    if not fnmatch(os.path.basename(name_file), data_name):
-                        copy_found_path_set.remove(name_file)
-
-            # Name contains
-            elif data_name_specifier == "contains:" and not data_consider_case:
-                for name_file in found_path_set:
-                    if not (data_name in os.path.basename(name_file).lower()):
-                        copy_found_path_set.remove(name_file)
-            elif data_name_specifier == "contains:" and data_consider_case:
-                for name_file in found_path_set:
-                    if not (data_name in os.path.basename(name_file)):
-                        copy_found_path_set.remove(name_file)
-
-            # Name starts with
-            elif data_name_specifier == "begins with:" and not data_consider_case:
-                for name_file in found_path_set:
-                    if not os.path.basename(name_file).lower().startswith(data_name):
-                        copy_found_path_set.remove(name_file)
-            elif data_name_specifier == "begins with:" and data_consider_case:
-                for name_file in found_path_set:
-                    if not os.path.basename(name_file).startswith(data_name):
-                        copy_found_path_set.remove(name_file)
-
-            # Name (without file extension) ends with
-            elif data_name_specifier == "ends with:" and not data_consider_case:
-                for name_file in found_path_set:
-                    # Splitting the name so the file extension doesn't matter
-                    if not os.path.basename(name_file)[
-                           :os.path.basename(name_file).find(".")].lower().endswith(data_name):
-                        copy_found_path_set.remove(name_file)
-            elif data_name_specifier == "ends with:" and data_consider_case:
-                for name_file in found_path_set:
-                    # Splitting the name so the file extension doesn't matter
-                    if not os.path.basename(name_file)[:os.path.basename(name_file).find(".")].endswith(data_name):
-                        copy_found_path_set.remove(name_file)
-
-            # Fuzzy search
-            elif data_name_specifier == "is similar to:":
-                for name_file in found_path_set:
-                    # Using difflib.SequenceMatcher to get a matching ratio,
-                    # based on the gestalt pattern matching algorithm.
-                    if difflib.SequenceMatcher(
-                            None, data_name, os.path.basename(name_file).lower()).ratio() < data_similarity:
-                        copy_found_path_set.remove(name_file)
-
-            # Doesn't contain
-            elif data_name_specifier == "doesn't contain:" and not data_consider_case:
-                # Scan every file
-                for name_file in found_path_set:
-                    if data_name in os.path.basename(name_file).lower():
-                        copy_found_path_set.remove(name_file)
-            elif data_name_specifier == "doesn't contain:" and data_consider_case:
-                # Scan every file
-                for name_file in found_path_set:
-                    if data_name in os.path.basename(name_file):
-                        copy_found_path_set.remove(name_file)
-
-            # RegEx
-            elif data_name_specifier == "in RegEx:":
-                if data_consider_case:
-                    re_flags = 0
-                else:
-                    re_flags = re.IGNORECASE
-                for name_file in found_path_set:
-                    # re is the python RegEx module
-                    if not re.match(data_name, os.path.basename(name_file), re_flags):
-                        copy_found_path_set.remove(name_file)
-
-        # Making the copy and the original the same
-        found_path_set = copy_found_path_set.copy()
-
-        # Search in System Files
-        logging.info("Indexing System Files...")
-        self.signals.indexing_system_files.emit()
-        if not data_library:
-            if platform == "darwin":
-                # Scan every file
-                for library_file in found_path_set:
-                    if (library_file.startswith("/private")
-                            or library_file.startswith("/var")
-                            or library_file.startswith("/System")
-                            or "/Library" in library_file
-                            or "/." in library_file):
-                        # Remove the file
-                        copy_found_path_set.remove(library_file)
-            elif platform == "win32" or platform == "cygwin":
-                # Scan every file
-                for library_file in found_path_set:
-                    if (library_file.startswith("C:\\Windows")
-                            or library_file.startswith("C:\\ProgramData")
-                            or "\\AppData" in library_file):
-                        # Remove the file
-                        copy_found_path_set.remove(library_file)
-            elif platform == "linux":
-                # Scan every file
-                for library_file in found_path_set:
-                    if (library_file.startswith("/var")
-                            or library_file.startswith("/lib")
-                            or "/." in library_file):
-                        # Remove the file
-                        copy_found_path_set.remove(library_file)
-            else:
-                logging.fatal("OS not supported")
-
-        # Making the copy and the original the same
-        found_path_set = copy_found_path_set.copy()
-
-        # Exclude or Include Folders or Files
-        logging.info("Indexing Exclude or Include Folders or Files...")
-        self.signals.indexing_files_folders.emit()
-        if data_search_for_needed:
-
-            # Checks for File
-            if data_search_for == "only Files":
-                for file_file in found_path_set:
-                    if type_dict[file_file] != "file":
-                        copy_found_path_set.remove(file_file)
-            # Checks for Directories
-            elif data_search_for == "only Folders":
-                for folder_file in found_path_set:
-                    if type_dict[folder_file] != "folder":
-                        copy_found_path_set.remove(folder_file)
-
-        # Making the copy and the original the same
-        found_path_set = copy_found_path_set.copy()
-        # Filter some unnecessary System Files
-        logging.info("Filtering for file types...")
-        self.signals.indexing_file_groups.emit()
-
-        # Checking is not needed
-        if allowed_filetypes is not None:
-            # if "other" files is activated
-            if "*" in allowed_filetypes:
-                for file_type_file in found_path_set:
-                    for file_ending in disallowed_filetypes:
-                        if file_type_file.lower().endswith(f".{file_ending}"):
-                            copy_found_path_set.remove(file_type_file)
-
-            else:
-                for file_type_file in found_path_set:
-                    for file_ending in allowed_filetypes:
-                        if file_type_file.lower().endswith(f".{file_ending}"):
-                            break
-                        else:
-                            pass
-                    else:
-                        copy_found_path_set.remove(file_type_file)
-
-        # Making the copy and the original the same
-        found_path_set = copy_found_path_set.copy()
-
-        # Filter some unnecessary System Files
-        logging.info("Removing dump files...")
-        self.signals.indexing_dump_files.emit()
-
-        for system_file in found_path_set:
-            basename = os.path.basename(system_file).lower()
-            if basename in (".ds_store", ".localized", "desktop.ini", "thumbs.db"):
-                copy_found_path_set.remove(system_file)
-
-        # Making the copy and the original the same
-        found_path_set = copy_found_path_set.copy()
-
-        # Excluded Files
-        logging.info("Filtering excluded files...")
-        self.signals.indexing_excluded.emit()
-        if data_excluded_files_needed:
-            for test_file in found_path_set:
-                for excluded_file in data_excluded_files:
-                    if test_file.startswith(excluded_file):
-                        copy_found_path_set.remove(test_file)
-
-        # Making the copy and the original the same
-        found_path_set = copy_found_path_set.copy()
-
-        # Checking for Date Created
-        # Checking if File Date is between Filter Dates
-        logging.info("Indexing Date created...")
-        self.signals.indexing_c_date.emit()
-        if data_c_time_needed:
-
-            # On Windows and Linux
-            # (On Linux this currently returns the modification date,
-            # because it's impossible to access with pure python)
-            if platform == "win32" or platform == 'cygwin' or platform == "linux":
-
-                # Looping through every file
-                for c_date_file in found_path_set:
-                    # Using os.stat because os.path.getctime returns a wrong date
-                    try:
-                        file_c_time = os.path.getctime(c_date_file)
-
-                        # Checking for file time and which values in data_time are modified
-                        if not (data_time["c_date_from"] <= file_c_time <= data_time["c_date_to"]):
-                            copy_found_path_set.remove(c_date_file)
-
-                    except FileNotFoundError:
-                        copy_found_path_set.remove(c_date_file)
-            # On Mac
-            elif platform == "darwin":
-
-                # Looping through every file
-                for c_date_file in found_path_set:
-                    # Using os.stat because os.path.getctime returns a wrong date
-                    try:
-                        file_c_time = os.stat(c_date_file).st_birthtime
-
-                        # Checking for file time and which values in data_time are modified
-                        if not (data_time["c_date_from"] <= file_c_time <= data_time["c_date_to"]):
-                            copy_found_path_set.remove(c_date_file)
-
-                    except FileNotFoundError:
-                        copy_found_path_set.remove(c_date_file)
-
-            # If platform is unknown
-            else:
-                # Debug
-                logging.error(f"While trying to test cache, unrecognised platform: {platform}")
-
-        # Making the copy and the original the same
-        found_path_set = copy_found_path_set.copy()
+                        # Building the UI with emitting the signal
+                        self.signals.finished.emit(search_result)
 
-        # Checking for Date Modified
-        logging.info("Indexing date modified...")
-        self.signals.indexing_m_date.emit()
-        if data_m_time_needed:
+            # Starting the Thread with the scheduler, it waits if too many searches run on the same drive
+            if not FF_Scheduler.SCHEDULER.submit(
+                    f"Search in {data_search_from_valid}", run_search, data_search_from_valid,
+                    FF_Scheduler.PRIORITY_INTERACTIVE):
+                self.ui_logger.update("Waiting for other searches on the same drive...")
 
-            # Looping through every file
-            for m_date_file in found_path_set:
-                # Using os.stat because os.path.getctime returns a wrong date
-                try:
-                    file_m_time = os.path.getmtime(m_date_file)
-
-                    # Checking for file time and which values in data_time are modified
-                    if not (data_time["m_date_from"] <= file_m_time <= data_time["m_date_to"]):
-                        copy_found_path_set.remove(m_date_file)
-
-                except OSError:
-                    copy_found_path_set.remove(m_date_file)
+            # Debug
+            logging.debug("Finished Setting up the thread!")
 
-        # Making the copy and the original the same
-        found_path_set = copy_found_path_set.copy()
+    """
+    Converting Date-times
+    Converting the output of QDateEdit into the unix time by first using QDateEdit.date() to get
+    something like this: QDate(1,3,2000), after that using QDate.toString with the conversion of to
+    ISO standard Date to get this: 2024-01-26
+    than we can use .split("-") to convert 2024-01-26 into a list [2024,1,26], after that we use time.mktime
+    to get the unix time format that means something like, that: 946854000.0, only to match this with
+    os.getctime, what we can use to get the creation date of a file.
 
-        # File Size
-        logging.info("Indexing file size...")
-        self.signals.indexing_file_size.emit()
-        if data_file_size_min != "" and data_file_size_max != "":
+    Yes it would be easier if Qt had a function to get the unix time
+    """
 
-            # Looping through every file
-            for size_file in found_path_set:
-                if not data_file_size_max >= FF_Files.get_file_size(size_file) >= data_file_size_min:
-                    # Remove file
-                    copy_found_path_set.remove(size_file)
+    @staticmethod
+    def conv_qdate_to_unix_time(input_edit: QDate, expand_days_num: int = 1):
+        # Expand days on the second date of the range because if input is 1.Jan.2024 - 1.Jan-2024 there will be no files
+        return FF_Engine.convert_iso_date(str(input_edit.toString(Qt.DateFormat.ISODate)), expand_days_num)
 
-        # Making the copy and the original the same
-        found_path_set = copy_found_path_set.copy()
 
-        # File contains
-        logging.info("Indexing file contains...")
-        self.signals.indexing_file_content.emit()
-        if data_content != "":
+# Searching with multiple filter presets, which are searched one after the other with the same scan
+# (see FF_Engine.BatchSearch), the results of every preset are shown in their own search window
+class SearchPresets:
+    def __init__(self, preset_paths: list, parent: QWidget):
+        # Checked while searching, cancelled with the "Cancel" action of the menu bar log
+        self.cancel_token = FF_Cancel.CancelToken()
 
-            # Looping through every file
-            for content_file in found_path_set:
-                does_contain = False
-                try:
-                    # Opening every file in read mode
-                    with open(content_file) as opened_content_file:
-                        for line in opened_content_file:
-                            if data_content in line:
-                                does_contain = True
-                                break
-                    if not does_contain:
-                        copy_found_path_set.remove(content_file)
-                except (UnicodeDecodeError, OSError):
-                    copy_found_path_set.remove(content_file)
-                else:
-                    if os.path.isdir(content_file):
-                        copy_found_path_set.remove(content_file)
+        # Loading the presets, the settings are used like with the filters of the main window
+        try:
+            queries = {}
+            for preset_path in preset_paths:
+                # The name of the preset, or the path if two presets have the same name
+                preset_name = os.path.splitext(os.path.basename(preset_path))[0]
+                if preset_name in queries:
+                    preset_name = preset_path
+
+                with open(preset_path) as preset_file:
+                    query_fields = FF_Engine.query_fields_from_filter(load(preset_file))
+                queries[preset_name] = FF_Engine.SearchQuery(
+                    **query_fields,
+                    excluded_files=FF_Settings.SettingsWindow.load_setting("excluded_files"),
+                    use_ignore_files=FF_Settings.SettingsWindow.load_setting("use_ignore_files"),
+                    search_in_archives=FF_Settings.SettingsWindow.load_setting("search_in_archives"),
+                    content_index=FF_Settings.SettingsWindow.load_setting("content_index"))
+
+            batch_search = FF_Engine.BatchSearch(
+                queries,
+                # Showing the preset, which is searched
+                progress=lambda name, stage: self.signals.searching.emit(name) if stage == "starting" else None,
+                cancel_token=self.cancel_token)
+
+        except (OSError, JSONDecodeError) as preset_error:
+            # Debug
+            logging.error(f"Filter Error! Could not read the filter preset: {preset_error}")
 
-        # Making the copy and the original the same and deleting the copy
-        found_path_set = copy_found_path_set.copy()
-        del copy_found_path_set
+            # Show Popup
+            FF_Additional_UI.PopUps.show_critical_messagebox(
+                "Filter Error!", f"Filter Error!\n\nCould not read the filter preset: {preset_error}", parent=None)
+            return
 
-        # Prints out files found
-        logging.info(f"Found {len(found_path_set)} Files and Folders")
+        # The engine found an error in the filters, it's already logged
+        except FF_Engine.QueryError as query_error:
+            # Show Popup
+            FF_Additional_UI.PopUps.show_critical_messagebox(query_error.title, query_error.message, parent=None)
+            return
 
-        # Creating a list for sorting from set and creating a backup for caching
-        found_path_list = list(found_path_set)
+        # Updating ACTIVE_SEARCH_THREADS
+        global ACTIVE_SEARCH_THREADS
+        ACTIVE_SEARCH_THREADS += 1
 
-        # Saving time
-        time_after_indexing = perf_counter() - (time_after_searching + time_before_start)
+        # Defining menu bar log
+        self.ui_logger = FF_Main_UI.SearchUpdate(f"{len(queries)} filter presets", self.cancel_token)
 
-        # Sorting
-        if data_sort_by == "File Name":
-            logging.info("Sorting list by name...")
-            self.signals.sorting_name.emit()
-            found_path_list.sort(key=Sort.name, reverse=data_reverse_sort)
+        # Testing Cache
+        FF_Files.cache_test(is_launching=False)
 
-        elif data_sort_by == "File Size":
-            logging.info("Sorting list by size...")
-            self.signals.sorting_size.emit()
-            found_path_list.sort(key=Sort.size, reverse=not data_reverse_sort)
+        # Creating Qt Signal
+        class SignalClass(QObject):
+            searching = Signal(str)
+            finished = Signal(dict)
+            cancelled = Signal()
 
-        elif data_sort_by == "Date Created":
-            logging.info(f"Sorting list by creation date on {platform}...")
-            self.signals.sorting_c_date.emit()
+        self.signals = SignalClass()
 
-            # On Windows and Linux
-            # (On Linux this currently returns the modification date,
-            # because it's impossible to access with pure python)
-            if platform == "win32" or platform == 'cygwin' or platform == "linux":
-                found_path_list.sort(key=Sort.c_date_win, reverse=not data_reverse_sort)
+        # Connecting the menu-bar log to the signals
+        self.signals.searching.connect(
+            lambda name: self.ui_logger.update(
+                f"Searching with {name} ({list(queries.keys()).index(name) + 1}/{len(queries)})..."))
 
-            # On Mac
-            if platform == "darwin":
-                found_path_list.sort(key=Sort.c_date_mac, reverse=not data_reverse_sort)
+        # Launching a window for every preset
+        def show_search_results(search_results: dict):
+            self.ui_logger.close()
+            for name, search_result in search_results.items():
+                search_window = FF_Search_UI.SearchWindow(*search_result.window_arguments(parent))
+                search_window.Search_Results_Window.setWindowTitle(
+                    f"File Find Search Results | {name} | {FF_Files.display_path(search_result.search_from)}")
 
-        elif data_sort_by == "Date Modified":
-            logging.info("Sorting list by modification date...")
-            self.signals.sorting_m_date.emit()
-            found_path_list.sort(key=Sort.m_date, reverse=not data_reverse_sort)
+        self.signals.finished.connect(show_search_results)
 
-        elif data_sort_by == "Path":
-            logging.info("Sorting list by path...")
-            self.signals.sorting_path.emit()
-            found_path_list.sort(key=lambda sort_file: sort_file.lower(), reverse=data_reverse_sort)
+        # Closing everything if the search was cancelled
+        def search_cancelled():
+            self.ui_logger.close()
+            FF_Main_UI.MainWindow.update_search_status_label()
 
-        else:
-            logging.info("Skipping Sorting")
-            if data_reverse_sort:
-                logging.debug("Reversing Results...")
-                self.signals.sorting_reversed.emit()
-                found_path_list = list(reversed(found_path_list))
-
-        # Caching Results with json
-        # Testing if cache file exist, if it doesn't or isn't from the exact directory exist it caches scanned files
-        if (not used_cache or
-                newest_fitting_cache_file != FF_Files.path_to_cache_file(data_search_from, folder_depth_global_limit)):
-            # Debug and menu-bar log
-            logging.info("Caching Search Results...")
-            self.signals.caching.emit()
-
-            # Creating file
-            with open(FF_Files.path_to_cache_file(data_search_from, folder_depth_global_limit), "w") as result_file:
-                # Dumping with json
-                dump({
-                    "found_path_set": list(original_found_path_set),
-                    "type_dict": type_dict}, result_file)
-
-            # Saving the cache creation time in a separate file for faster access
-            with open(FF_Files.path_to_cache_file(data_search_from, folder_depth_global_limit, metadata=True),
-                      "w") as time_write_file:
-                if used_cache:
-                    # Determining the number of parent directories by counting the default separators in the path
-                    # and then adding this value to the c_Time so the more specified cache gets used rather than
-                    # the broader cache which originated from the broader one.
-                    # Dividing by 10 so to only add fractions of a seconds to the c_time as
-                    # to not get ranked over newer caches.
-                    # Doing this so the already specialized cache gets used preferably
-                    c_time_adjust = data_search_from.count(os.sep) / 10
-                    logging.debug(f"Cache time {newest_fitting_cache_file_c_date} + adjuster: {c_time_adjust} "
-                                  f"= {newest_fitting_cache_file_c_date + c_time_adjust}")
-
-                    # Used old cache, save old time
-                    dump({"c_time": newest_fitting_cache_file_c_date + c_time_adjust,
-                          "cache_version": FF_Files.FF_CACHE_VERSION,
-                          "original_cache_file": newest_fitting_cache_file,
-                          "global_depth_limit": folder_depth_global_limit,
-                          "path": data_search_from}, time_write_file)
+        self.signals.cancelled.connect(search_cancelled)
 
+        # Running the searches, a cancelled search stops with FF_Cancel.SearchCancelled
+        def run_searches():
+            global ACTIVE_SEARCH_THREADS
+            search_results = None
+            try:
+                search_results = batch_search.run()
+            except FF_Cancel.SearchCancelled:
+                # Debug
+                logging.info("Search was cancelled!\n")
+            finally:
+                # Updating Thread count, also if a search failed
+                ACTIVE_SEARCH_THREADS -= 1
+                if search_results is None:
+                    # Closing the menu-bar log, if the searches were cancelled or failed
+                    self.signals.cancelled.emit()
                 else:
-                    logging.debug("Created brand new cache..")
-                    # New cache created
-                    dump({"c_time": time.time(),
-                          "cache_version": FF_Files.FF_CACHE_VERSION,
-                          "original_cache_file": FF_Files.path_to_cache_file(data_search_from,
-                                                                             folder_depth_global_limit),
-                          "global_depth_limit": folder_depth_global_limit,
-                          "path": data_search_from}, time_write_file)
-                    newest_fitting_cache_file = FF_Files.path_to_cache_file(data_search_from, folder_depth_global_limit)
-
-        else:
-            logging.info("Cache file already exist, skipping caching...")
+                    # Building the UI with emitting the signal
+                    self.signals.finished.emit(search_results)
 
-        # Updating search status indicator
-        self.signals.waiting.emit()
-
-        # Calculating time
-        time_after_sorting = perf_counter() - (time_after_indexing + time_after_searching + time_before_start)
-        time_total = perf_counter() - time_before_start
-
-        # Cleaning Memory
-        del type_dict, found_path_set, original_found_path_set
-
-        # Debug
-        logging.info("Finished Searching!")
-        self.signals.building_ui.emit()
-
-        # The parameter passed on to the UI builder
-        global SEARCH_OUTPUT
-        SEARCH_OUTPUT = [{"time_total": time_total,
-                          "time_searching": time_after_searching,
-                          "time_indexing": time_after_indexing,
-                          "time_sorting": time_after_sorting},
-                         found_path_list, data_search_from, newest_fitting_cache_file, parent]
-
-        # Updating Thread count
-        global ACTIVE_SEARCH_THREADS
-        ACTIVE_SEARCH_THREADS -= 1
-        # Building the UI with emitting the signal
-        self.signals.finished.emit()
-
-    """
-    Converting Date-times
-    Converting the output of QDateEdit into the unix time by first using QDateEdit.date() to get
-    something like this: QDate(1,3,2000), after that using QDate.toString with the conversion of to
-    ISO standard Date to get this: 2024-01-26
-    than we can use .split("-") to convert 2024-01-26 into a list [2024,1,26], after that we use time.mktime
-    to get the unix time format that means something like, that: 946854000.0, only to match this with
-    os.getctime, what we can use to get the creation date of a file.
-
-    Yes it would be easier if Qt had a function to get the unix time
-    """
-
-    @staticmethod
-    def conv_qdate_to_unix_time(input_edit: QDate, expand_days_num: int = 1):
-        # Expand days on the second date of the range because if input is 1.Jan.2024 - 1.Jan-2024 there will be no files
-        time_string = str(input_edit.toString(Qt.DateFormat.ISODate))
-        time_list = time_string.split("-")
-        # Fill in hours, minutes and second with 0 because we don't have them
-        unix_time = mktime(
-            (int(time_list[0]), int(time_list[1]), int(time_list[2]) + expand_days_num, 0, 0, 0, 0, 0, 0))
-        return unix_time
+        # Starting the Thread with the scheduler, the presets are searched in the same thread
+        search_from = min((query.search_from for query in queries.values()), key=lambda path: path.count(os.sep))
+        if not FF_Scheduler.SCHEDULER.submit(
+                f"Search with {len(queries)} filter presets", run_searches, search_from,
+                FF_Scheduler.PRIORITY_INTERACTIVE):
+            self.ui_logger.update("Waiting for other searches on the same drive...")
 
 
 # Global Variables for Search Threads
-SEARCH_OUTPUT: ({str: float}, list, str, str, QWidget)
-
 ACTIVE_SEARCH_THREADS: int = 0
@@ -30,7 +30,10 @@ import FF_Menubar
 
 
 class SearchWindow:
-    def __init__(self, time_dict, matched_list, search_path, cache_file_path, parent):
+    # With streaming=True the window is created while searching, the results found so far are added with
+    # add_streamed_results() and replaced by the sorted results with finish_streaming()
+    def __init__(self, time_dict, matched_list, search_path, cache_file_path, parent, content_matches=None,
+                 more_results=None, streaming=False):
         # Debug
         logging.info("Setting up Search UI...")
 
@@ -38,9 +41,13 @@ class SearchWindow:
         self.search_path = search_path
         self.matched_list = matched_list.copy()
         del matched_list
+        self.time_dict = time_dict
+        self.cache_file_path = cache_file_path
+        self.content_matches = content_matches
 
         # Saves Time
-        time_dict["time_before_building"] = perf_counter()
+        if not streaming:
+            time_dict["time_before_building"] = perf_counter()
 
         # Window setup
         # Define the window
@@ -75,18 +82,18 @@ class SearchWindow:
         # Btw, You can fix it with disabling Pythons garbage collection.
 
         # Seconds needed Label
-        seconds_text = QLabel(self.Search_Results_Window)
+        self.seconds_text = QLabel(self.Search_Results_Window)
         # Setting a Font
-        seconds_text.setFont(FF_Additional_UI.BOLD_QT_FONT)
+        self.seconds_text.setFont(FF_Additional_UI.BOLD_QT_FONT)
         # Displaying
-        self.Search_Results_Layout.addWidget(seconds_text, 0, 0)
+        self.Search_Results_Layout.addWidget(self.seconds_text, 0, 0)
 
         # Files found label
-        objects_text = QLabel(self.Search_Results_Window)
-        objects_text.setText(f"Files found: {len(self.matched_list)}")
-        objects_text.setFont(FF_Additional_UI.BOLD_QT_FONT)
+        self.objects_text = QLabel(self.Search_Results_Window)
+        self.objects_text.setText(f"Files found: {len(self.matched_list)}")
+        self.objects_text.setFont(FF_Additional_UI.BOLD_QT_FONT)
         # Displaying
-        self.Search_Results_Layout.addWidget(objects_text, 0, 2)
+        self.Search_Results_Layout.addWidget(self.objects_text, 0, 2)
 
         '''Creating a QScrollArea in which the QListWidget is put. This is because QListWidget.setUniformItemSizes(True)
         allows for insane speed gains (up to 100x), but it makes all item the same size (if they are too long it will
@@ -110,7 +117,7 @@ class SearchWindow:
             logging.debug("Displaying time stats.")
 
             # Getting the creation time of the cache file which is stored separately
-            with open(FF_Files.get_metadata_file_from_cache_file(cache_file_path)) as time_file:
+            with open(FF_Files.get_metadata_file_from_cache_file(self.cache_file_path)) as time_file:
                 # Load time
                 cache_created_time = ctime(load(time_file)["c_time"])
 
@@ -120,12 +127,12 @@ class SearchWindow:
             FF_Additional_UI.PopUps.show_info_messagebox(
                 "Time Stats",
                 "Time needed:\n"
-                f"Scanning: {round(time_dict['time_searching'], 3)}s\n"
-                f"Indexing: {round(time_dict['time_indexing'], 3)}s\n"
-                f"Sorting: {round(time_dict['time_sorting'], 3)}s\n"
-                f"Creating UI: {round(time_dict['time_building'], 3)}s\n"
+                f"Scanning: {round(self.time_dict['time_searching'], 3)}s\n"
+                f"Indexing: {round(self.time_dict['time_indexing'], 3)}s\n"
+                f"Sorting: {round(self.time_dict['time_sorting'], 3)}s\n"
+                f"Creating UI: {round(self.time_dict['time_building'], 3)}s\n"
                 "---------\n"
-                f"Total: {round(time_dict['time_total'] + time_dict['time_building'], 3)}s\n\n\n"
+                f"Total: {round(self.time_dict['time_total'] + self.time_dict['time_building'], 3)}s\n\n\n"
                 ""
                 "Timestamps:\n"
                 f"Cache (basis for search results) created:\n{cache_created_time}\n"
@@ -171,10 +178,11 @@ class SearchWindow:
             window="search",
             matched_list=self.matched_list,
             search_path=search_path,
-            file_count_text=objects_text,
+            file_count_text=self.objects_text,
             save_search=save_search,
             cache_file_path=cache_file_path,
             bottom_layout=self.Bottom_Layout)
+        self.menu_bar = menu_bar
 
         # Debug
         logging.info("Finished Setting up menu-bar")
@@ -205,8 +213,8 @@ class SearchWindow:
         options_menu_compare_action = options_menu.addAction(
             "&Compare to other Search...")
         options_menu_compare_action.triggered.connect(
-            lambda: FF_Compare.CompareSearches(self.matched_list, search_path, cache_file_path, menu_bar.marked_files,
-                                               self.Search_Results_Window))
+            lambda: FF_Compare.CompareSearches(self.matched_list, search_path, self.cache_file_path,
+                                               menu_bar.marked_files, self.Search_Results_Window))
         # Separator
         options_menu.addSeparator()
         # Duplicated Action
@@ -214,7 +222,7 @@ class SearchWindow:
             "&Find duplicated...")
         options_menu_duplicated_action.triggered.connect(
             lambda: FF_Duplicated.DuplicatedSettings(self.Search_Results_Window, search_path, self.matched_list,
-                                                     cache_file_path, menu_bar.marked_files))
+                                                     self.cache_file_path, menu_bar.marked_files))
 
         # More Options Button
         options_button = menu_bar.generate_button(
@@ -234,8 +242,8 @@ class SearchWindow:
         # Compare Button
         compare_button = menu_bar.generate_button(
             None,
-            lambda: FF_Compare.CompareSearches(self.matched_list, search_path, cache_file_path, menu_bar.marked_files,
-                                               self.Search_Results_Window),
+            lambda: FF_Compare.CompareSearches(self.matched_list, search_path, self.cache_file_path,
+                                               menu_bar.marked_files, self.Search_Results_Window),
             icon=os.path.join(FF_Files.ASSETS_FOLDER, "Compare_files_img_small.png"))
         # Icon size
         compare_button.setIconSize(QSize(50, 50))
@@ -250,7 +258,7 @@ class SearchWindow:
         duplicated_button = menu_bar.generate_button(
             None,
             lambda: FF_Duplicated.DuplicatedSettings(self.Search_Results_Window, search_path, self.matched_list,
-                                                     cache_file_path, menu_bar.marked_files),
+                                                     self.cache_file_path, menu_bar.marked_files),
             icon=os.path.join(FF_Files.ASSETS_FOLDER, "Duplicated_files_img_small.png"))
         # Icon size
         duplicated_button.setIconSize(QSize(50, 50))
@@ -261,18 +269,6 @@ class SearchWindow:
         # Add to Layout
         self.Search_Results_Layout.addWidget(duplicated_button, 0, 4)
 
-        # Adding every object from matched_list to self.result_listview
-        logging.debug("Adding Files to Listbox...")
-        # If there was no file found and the list is empty
-        if not self.matched_list:
-            self.result_listbox.setDisabled(True)
-            self.result_listbox.addItem("No file of directory found")
-        else:
-            # If there is at least one file
-            self.result_listbox.addItems(self.matched_list)
-            # Setting the row to the first
-            self.result_listbox.setCurrentRow(0)
-
         # Improvements for a faster QListWidget
         '''Created a QScrollArea in which the QListWidget was put. This is because QListWidget.setUniformItemSizes(True)
             allows for insane speed gains (up to 100x), but it makes all item the same length (if they are too long it
@@ -284,12 +280,6 @@ class SearchWindow:
             ScrollArea in the main layout. (A bit of a dirty solution)'''
         self.result_area.setWidgetResizable(True)
         self.result_listbox.setUniformItemSizes(True)
-        try:
-            # Get the longest file, fails if there is no item, and then multiply by font size to get the length
-            self.result_listbox.setMinimumWidth(
-                len(max(self.matched_list, key=len)) * self.result_listbox.font().pointSize())
-        except ValueError:
-            pass
         # Setting all the Scrollbars
         self.result_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
         self.result_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
@@ -300,16 +290,141 @@ class SearchWindow:
 
         # Action, user choice, on double click
         self.result_listbox.itemDoubleClicked.connect(menu_bar.double_clicking_item)
+
+        # Everything, that needs the final results, is disabled while streaming
+        self.result_widgets = [show_time, options_button, compare_button, duplicated_button]
+        self.result_widgets.extend(self.Bottom_Layout.itemAt(index).widget() for index in
+                                   range(self.Bottom_Layout.count()) if self.Bottom_Layout.itemAt(index).widget())
+
+        if streaming:
+            # Debug
+            logging.info("Showing the results while searching...")
+
+            self.objects_text.setText("Files found so far: 0")
+            self.streamed_count = 0
+            self.set_results_enabled(False)
+        else:
+            self.show_results(more_results)
+
+    # Enabling or disabling everything, that needs the final results
+    def set_results_enabled(self, enabled: bool):
+        for widget in self.result_widgets:
+            widget.setEnabled(enabled)
+        self.menu_bar.set_actions_enabled(enabled)
+
+    # Adding results found while searching, they aren't sorted yet
+    def add_streamed_results(self, streamed_results: list):
+        self.result_listbox.addItems(streamed_results)
+        self.streamed_count += len(streamed_results)
+        self.objects_text.setText(f"Files found so far: {self.streamed_count}")
+        self.update_minimum_width(streamed_results)
+
+    # Replacing the results found while searching with the sorted results,
+    # takes the same arguments as creating the window
+    def finish_streaming(self, time_dict, matched_list, search_path, cache_file_path, parent, content_matches=None,
+                         more_results=None):
+        # Debug
+        logging.info("Replacing the streamed results...")
+
+        # Saves Time
+        time_dict["time_before_building"] = perf_counter()
+
+        self.matched_list = matched_list.copy()
+        del matched_list
+        self.time_dict = time_dict
+        self.cache_file_path = cache_file_path
+        self.content_matches = content_matches
+        self.menu_bar.set_search_results(self.matched_list, cache_file_path)
+
+        self.result_listbox.clear()
+        self.set_results_enabled(True)
+        self.show_results(more_results)
+
+    # Using the length of the longest path and the font size as the minimum width of the listbox,
+    # so the QScrollArea can scroll horizontally
+    def update_minimum_width(self, paths: list):
+        try:
+            self.result_listbox.setMinimumWidth(max(
+                self.result_listbox.minimumWidth(),
+                len(max(paths, key=len)) * self.result_listbox.font().pointSize()))
+        except ValueError:
+            pass
+
+    # Showing the first match of "File contains" as a tooltip, saved while searching
+    def add_content_tooltips(self, first_row: int):
+        if self.content_matches:
+            for row in range(first_row, self.result_listbox.count()):
+                try:
+                    offset, line, snippet = self.content_matches[self.result_listbox.item(row).text()]
+                except KeyError:
+                    continue
+                self.result_listbox.item(row).setToolTip(f"Line {line} (byte {offset}):\n{snippet}")
+
+    # Adding the sorted results to the listbox
+    def show_results(self, more_results):
+        self.objects_text.setText(f"Files found: {len(self.matched_list)}")
+
+        # Adding every object from matched_list to self.result_listview
+        logging.debug("Adding Files to Listbox...")
+        # If there was no file found and the list is empty
+        if not self.matched_list:
+            self.result_listbox.setDisabled(True)
+            self.result_listbox.addItem("No file of directory found")
+        else:
+            # If there is at least one file
+            self.result_listbox.addItems(self.matched_list)
+            self.add_content_tooltips(0)
+            # Setting the row to the first
+            self.result_listbox.setCurrentRow(0)
+
+        # With a result limit, the other results are sorted and added when clicking "Load more"
+        if more_results:
+            # The same number of results as shown first is loaded every time
+            result_limit = len(self.matched_list)
+
+            def load_more_results():
+                # Debug
+                logging.debug(f"Loading {result_limit} more results...")
+
+                first_new_row = self.result_listbox.count()
+                new_results = more_results.take(result_limit)
+                self.matched_list.extend(new_results)
+                # The menu-bar has its own list after reloading
+                if self.menu_bar.matched_list is not self.matched_list:
+                    self.menu_bar.matched_list.extend(new_results)
+                self.result_listbox.addItems(new_results)
+                self.add_content_tooltips(first_new_row)
+                self.update_minimum_width(new_results)
+
+                # Update the labels
+                self.objects_text.setText(f"Files found: {len(self.menu_bar.matched_list)}")
+                if more_results:
+                    load_more_button.setText(f"Load more ({len(more_results)} not shown)")
+                else:
+                    load_more_button.hide()
+
+            load_more_button = self.menu_bar.generate_button(
+                f"Load more ({len(more_results)} not shown)", load_more_results)
+            # Tooltip
+            load_more_button.setToolTip("Sort and show the next results..")
+            # Add to Layout
+            self.Bottom_Layout.addWidget(load_more_button)
+
+        # Get the longest file, and then multiply by font size to get the length
+        self.update_minimum_width(self.matched_list)
+
         # Mark the files that need to be marked
-        menu_bar.mark_marked_files()
+        self.menu_bar.mark_marked_files()
 
         # The final action run when the UI is build, to measure time properly
         def finish():
+            time_dict = self.time_dict
+
             # Update Seconds needed Label
-            seconds_text.setText(
+            self.seconds_text.setText(
                 "Time needed: "
                 f"{round(time_dict['time_total'] + (perf_counter() - time_dict['time_before_building']), 3)}s")
-            seconds_text.adjustSize()
+            self.seconds_text.adjustSize()
 
             # Time building UI
             time_dict["time_building"] = perf_counter() - time_dict['time_before_building']
@@ -326,7 +441,7 @@ class SearchWindow:
 
             # Push Notification
             FF_Main_UI.menu_bar_icon.showMessage(
-                "File Find - Search finished!", f"Your Search finished!\nin {search_path}",
+                "File Find - Search finished!", f"Your Search finished!\nin {self.search_path}",
                 QIcon(os.path.join(FF_Files.ASSETS_FOLDER, "Find_button_img_small.png")),
                 100000)
             # Update Search indicator
@@ -0,0 +1,220 @@
+# This source file is a part of File Find made by Pixel-Master
+#
+# Copyright 2022-2025 Pixel-Master
+#
+# This software is licensed under the "GPLv3" License as described in the "LICENSE" file,
+# which should be included with this package. The terms are also available at
+# http://www.gnu.org/licenses/gpl-3.0.html
+
+# This file contains the query server, which keeps the cache in memory and answers searches over a Unix socket,
+# run with "File-Find.py --server"
+#
+# A client sends one JSON object in one line:
+#   {"filter": {...}, "options": {...}}
+# "filter" contains filters like a .FFFilter preset and "options" fields of FF_Engine.SearchQuery, which replace them.
+# The server answers with one JSON object per line, first the results like "File-Find.py --cli --format jsonl":
+#   {"path": "/folder/file.txt", "type": "file", "size": 1024, "mtime": 1706227200.0}
+# and then {"status": "finished", "found": 1, "time": {...}}
+# or {"status": "error", "title": "...", "message": "..."}
+
+# Imports
+import argparse
+import logging
+import os
+import select
+import signal
+import socket
+import socketserver
+import sys
+import threading
+from json import dumps, loads, JSONDecodeError
+
+# Projects Libraries
+import FF_Cancel
+import FF_CLI
+import FF_Engine
+import FF_Files
+
+# The cache files loaded by the searches of all clients
+CACHE_STORE = FF_Engine.CacheStore()
+
+# How often the connection is tested while searching, in seconds
+WATCH_INTERVAL = 0.2
+
+# The options loaded from the settings, if the client doesn't send them
+SETTINGS_OPTIONS = ("excluded_files", "use_ignore_files", "search_in_archives", "content_index")
+
+
+# Creating the query from a request, raises QueryError if the request is invalid
+def create_query(request) -> FF_Engine.SearchQuery:
+    try:
+        query_fields = {option: FF_Files.load_setting(option) for option in SETTINGS_OPTIONS}
+        if "filter" in request:
+            query_fields.update(FF_Engine.query_fields_from_filter(request["filter"]))
+        query_fields.update(request.get("options", {}))
+        return FF_Engine.SearchQuery(**query_fields)
+
+    except (TypeError, KeyError, ValueError, AttributeError, IndexError) as request_error:
+        # Debug
+        logging.error(f"Request Error! Invalid request: {request_error!r}")
+        raise FF_Engine.QueryError("Request Error!", f"Request Error!\n\nInvalid request: {request_error!r}")
+
+
+# Answering the requests of one client, every client has its own thread
+class QueryHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        output = self.connection.makefile("w", encoding="utf-8")
+        try:
+            try:
+                request = loads(self.rfile.readline())
+            except (JSONDecodeError, UnicodeDecodeError) as json_error:
+                # Debug
+                logging.error(f"Request Error! The request isn't JSON: {json_error}")
+                raise FF_Engine.QueryError("Request Error!", f"Request Error!\n\nThe request isn't JSON: {json_error}")
+
+            # Debug
+            logging.info(f"Received request: {request}")
+            search_query = create_query(request)
+
+            # Testing if the cache is outdated, before every search as the server runs for a long time
+            FF_Files.cache_test(is_launching=False)
+
+            # Cancelled if the client disconnects, also while sorting or searching in the content of files,
+            # when no results are sent
+            cancel_token = FF_Cancel.CancelToken()
+            watcher = threading.Thread(target=self.watch_connection, args=(cancel_token,), daemon=True)
+            watcher.start()
+
+            result_writer = FF_CLI.ResultWriter("jsonl", output)
+            try:
+                search_result = FF_Engine.SearchEngine(
+                    search_query,
+                    stream=result_writer.write_streamed if FF_CLI.is_unordered(search_query) else None,
+                    cancel_token=cancel_token,
+                    cache_store=CACHE_STORE).run()
+            finally:
+                self.search_finished.set()
+            result_writer.write_result(search_result)
+            self.send(output, {"status": "finished",
+                               "found": len(result_writer.written_paths),
+                               "time": search_result.time_dict})
+
+        # The error was already logged
+        except FF_Engine.QueryError as query_error:
+            self.send(output, {"status": "error", "title": query_error.title, "message": query_error.message})
+
+        # The client disconnected before the search finished
+        except (BrokenPipeError, ConnectionResetError, FF_Cancel.SearchCancelled):
+            # Debug
+            logging.info("Client disconnected")
+
+        # The search failed, the client gets the error and the server keeps running
+        except Exception as search_error:
+            # Debug
+            logging.exception(f"Search Error! {search_error!r}")
+            self.send(output, {"status": "error", "title": "Search Error!",
+                               "message": f"Search Error!\n\n{search_error!r}"})
+
+        finally:
+            # Results, which couldn't be sent, are dropped
+            try:
+                output.close()
+            except OSError:
+                pass
+
+    def setup(self):
+        super().setup()
+        # Stops watch_connection()
+        self.search_finished = threading.Event()
+
+    # Cancelling the search, when the client closed the connection.
+    # Only a closed connection is reported as POLLHUP, a client can still stop sending after the request
+    def watch_connection(self, cancel_token: FF_Cancel.CancelToken):
+        poller = select.poll()
+        # POLLHUP and POLLERR are always reported
+        poller.register(self.connection, 0)
+        while not self.search_finished.is_set():
+            # The client closes the connection after the search finished too
+            if poller.poll(WATCH_INTERVAL * 1000) and not self.search_finished.is_set():
+                # Debug
+                logging.info("Client disconnected, cancelling the search...")
+                cancel_token.cancel()
+                return
+
+    @staticmethod
+    def send(output, response: dict):
+        try:
+            output.write(dumps(response) + "\n")
+            output.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # Debug
+            logging.info("Client disconnected")
+
+
+# Testing if a server is listening on the socket
+def is_running(socket_path: str) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+# Running the query server until it's stopped with Ctrl+C or SIGTERM, returns the exit code
+def main(argv: list) -> int:
+    parser = argparse.ArgumentParser(
+        prog="File-Find.py --server",
+        description="Keep the cache of File Find in memory and answer searches over a Unix socket, "
+                    "search with it using \"File-Find.py --cli --use-server\".")
+    parser.add_argument("--socket", default=FF_Files.SERVER_SOCKET,
+                        help=f"the path of the socket (default: {FF_Files.SERVER_SOCKET})")
+    parser.add_argument("--verbose", action="store_true", help="log every step of the searches")
+    arguments = parser.parse_args(argv)
+
+    # Logging to stderr
+    logging.basicConfig(level=logging.DEBUG if arguments.verbose else logging.INFO,
+                        format="File Find Server at %(asctime)s, %(levelname)s: %(message)s",
+                        stream=sys.stderr, force=True)
+
+    if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+        # Debug
+        logging.error("The query server needs Unix sockets, which aren't supported on this platform")
+        return FF_CLI.EXIT_ERROR
+
+    # File Operation
+    FF_Files.setup()
+    FF_Files.cache_test(is_launching=False)
+
+    if os.path.exists(arguments.socket):
+        if is_running(arguments.socket):
+            # Debug
+            logging.error(f"Another query server is already running on {arguments.socket}")
+            return FF_CLI.EXIT_ERROR
+        # Left behind by a server, which didn't stop normally
+        os.remove(arguments.socket)
+
+    # Only the user can connect to the socket, as the results contain their files
+    previous_umask = os.umask(0o077)
+    try:
+        server = socketserver.ThreadingUnixStreamServer(arguments.socket, QueryHandler)
+    finally:
+        os.umask(previous_umask)
+    # Running searches don't keep the server from stopping
+    server.daemon_threads = True
+
+    # Stopping like with Ctrl+C, when the server is stopped by the system or a service manager
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    # Debug
+    logging.info(f"Listening on {arguments.socket}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        # Debug
+        logging.info("Stopping...")
+    finally:
+        server.server_close()
+        os.remove(arguments.socket)
+
+    return 0
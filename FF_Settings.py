@@ -72,7 +72,7 @@ class SettingsWindow:
         self.Central_Widget.setLayout(self.Settings_Layout)
 
         # # Spacer for prettier ui
-        self.Settings_Layout.addItem(QSpacerItem(10, 30, hData=QSizePolicy.Policy.Maximum), 8, 0)
+        self.Settings_Layout.addItem(QSpacerItem(10, 30, hData=QSizePolicy.Policy.Maximum), 11, 0)
 
         # Excluded Files
         # Define the Label
@@ -80,7 +80,7 @@ class SettingsWindow:
         # Change Font
         exclude_label.setFont(FF_Additional_UI.DEFAULT_QT_FONT)
         # Display the Label
-        self.Settings_Layout.addWidget(exclude_label, 9, 0)
+        self.Settings_Layout.addWidget(exclude_label, 12, 0)
 
         def generate_button(text, command, width: int | None = 30):
             button = QPushButton(self.Settings_Window)
@@ -95,7 +95,7 @@ class SettingsWindow:
         # Resize the List-widget
         excluded_listbox.resize(200, 130)
         # Place
-        self.Settings_Layout.addWidget(excluded_listbox, 9, 1, 11, 3)
+        self.Settings_Layout.addWidget(excluded_listbox, 12, 1, 12, 3)
 
         # Load values
         for file in self.load_setting("excluded_files"):
@@ -142,14 +142,14 @@ class SettingsWindow:
                 remove_button.setDisabled(False)
 
         remove_button = generate_button("-", remove_file)
-        self.Settings_Layout.addWidget(remove_button, 11, 0, Qt.AlignmentFlag.AlignRight)
+        self.Settings_Layout.addWidget(remove_button, 14, 0, Qt.AlignmentFlag.AlignRight)
 
         # Disable button if there are no files
         if excluded_listbox.count() == 0:
             remove_button.setDisabled(True)
 
         add_button = generate_button("+", add_file)
-        self.Settings_Layout.addWidget(add_button, 12, 0, Qt.AlignmentFlag.AlignRight)
+        self.Settings_Layout.addWidget(add_button, 15, 0, Qt.AlignmentFlag.AlignRight)
 
         # Ask before deleting
         # Define the Label
@@ -409,6 +409,97 @@ class SettingsWindow:
         # Display
         self.Settings_Layout.addWidget(menu_bar_icon_checkbox, 6, 1)
 
+        # Ignore files Settings
+        # Define the Label
+        ignore_files_label = QLabel("Skip files in .gitignore and .ffignore:", parent=self.Settings_Window)
+        ignore_files_label.setToolTip(
+            "Files and folders listed in a .gitignore or .ffignore file are skipped while scanning.\n"
+            "Useful to not scan generated folders like node_modules, build or .venv.")
+        # Change Font
+        ignore_files_label.setFont(FF_Additional_UI.DEFAULT_QT_FONT)
+        # Display the Label
+        self.Settings_Layout.addWidget(ignore_files_label, 7, 0)
+
+        # Ignore files Checkbox
+        ignore_files_checkbox = QCheckBox(self.Settings_Window)
+        ignore_files_checkbox.setChecked(self.load_setting("use_ignore_files"))
+
+        # Connecting the checkbox to update the setting
+        ignore_files_checkbox.toggled.connect(
+            lambda: self.update_setting("use_ignore_files", ignore_files_checkbox.isChecked()))
+
+        # Display
+        self.Settings_Layout.addWidget(ignore_files_checkbox, 7, 1)
+
+        # Content index Settings
+        # Define the Label
+        content_index_label = QLabel("Index file contents:", parent=self.Settings_Window)
+        content_index_label.setToolTip(
+            "Saves the words of all searched files, so \"File contains\" only has to read files,\n"
+            "which contain all words of the input. Only new or changed files are read again.\n"
+            "The first search in a directory takes longer and the index needs disk space.")
+        # Change Font
+        content_index_label.setFont(FF_Additional_UI.DEFAULT_QT_FONT)
+        # Display the Label
+        self.Settings_Layout.addWidget(content_index_label, 8, 0)
+
+        # Content index Checkbox
+        content_index_checkbox = QCheckBox(self.Settings_Window)
+        content_index_checkbox.setChecked(self.load_setting("content_index"))
+
+        # Connecting the checkbox to update the setting
+        content_index_checkbox.toggled.connect(
+            lambda: self.update_setting("content_index", content_index_checkbox.isChecked()))
+
+        # Display
+        self.Settings_Layout.addWidget(content_index_checkbox, 8, 1)
+
+        # Archive Settings
+        # Define the Label
+        archives_label = QLabel("Search in zip and tar archives:", parent=self.Settings_Window)
+        archives_label.setToolTip(
+            "Lists the files in zip and tar archives (also compressed ones like .tar.gz) while scanning,\n"
+            "so they can be found by name, type, size and date without extracting the archive.\n"
+            "They are shown as archive.zip!/folder/file. Their content can't be searched.")
+        # Change Font
+        archives_label.setFont(FF_Additional_UI.DEFAULT_QT_FONT)
+        # Display the Label
+        self.Settings_Layout.addWidget(archives_label, 9, 0)
+
+        # Archive Checkbox
+        archives_checkbox = QCheckBox(self.Settings_Window)
+        archives_checkbox.setChecked(self.load_setting("search_in_archives"))
+
+        # Connecting the checkbox to update the setting
+        archives_checkbox.toggled.connect(
+            lambda: self.update_setting("search_in_archives", archives_checkbox.isChecked()))
+
+        # Display
+        self.Settings_Layout.addWidget(archives_checkbox, 9, 1)
+
+        # Streaming Settings
+        # Define the Label
+        stream_results_label = QLabel("Show results while searching:", parent=self.Settings_Window)
+        stream_results_label.setToolTip(
+            "Opens the search window with the first results while scanning a folder without cache.\n"
+            "The results are sorted and completed when the search finished.\n"
+            "Doesn't work with \"File contains\".")
+        # Change Font
+        stream_results_label.setFont(FF_Additional_UI.DEFAULT_QT_FONT)
+        # Display the Label
+        self.Settings_Layout.addWidget(stream_results_label, 10, 0)
+
+        # Streaming Checkbox
+        stream_results_checkbox = QCheckBox(self.Settings_Window)
+        stream_results_checkbox.setChecked(self.load_setting("stream_results"))
+
+        # Connecting the checkbox to update the setting
+        stream_results_checkbox.toggled.connect(
+            lambda: self.update_setting("stream_results", stream_results_checkbox.isChecked()))
+
+        # Display
+        self.Settings_Layout.addWidget(stream_results_checkbox, 10, 1)
+
         # Menu-bar
         FF_Menubar.MenuBar(self.Settings_Window, "settings", )
 
@@ -436,12 +527,7 @@ class SettingsWindow:
     # Loading the value of setting, can be used everywhere
     @staticmethod
     def load_setting(setting_key):
-        # Loading Settings
-        with open(os.path.join(FF_Files.FF_LIB_FOLDER, "Settings")) as read_file:
-            # Loading Settings with JSON
-            setting_value = load(read_file)[setting_key]
-
-        return setting_value
+        return FF_Files.load_setting(setting_key)
 
 
 settings_window_global = None
@@ -0,0 +1,81 @@
+# This source file is a part of File Find made by Pixel-Master
+#
+# Copyright 2022-2025 Pixel-Master
+#
+# This software is licensed under the "GPLv3" License as described in the "LICENSE" file,
+# which should be included with this package. The terms are also available at
+# http://www.gnu.org/licenses/gpl-3.0.html
+
+# This file contains the scans, which are currently running,
+# so a search in the same or a lower directory waits for them instead of scanning again
+
+# Imports
+import logging
+import os
+import threading
+
+# How often a waiting search tests, if it was cancelled, in seconds
+WAIT_INTERVAL = 0.1
+
+# The running scans, searches are started in different threads
+IN_FLIGHT_SCANS: list = []
+IN_FLIGHT_SCANS_LOCK = threading.Lock()
+
+
+# A scan of a search (the leader), other searches (the subscribers) wait for its result
+class SharedScan:
+    def __init__(self, search_from: str, depth_limit: int, use_ignore_files: bool, search_in_archives: bool,
+                 excluded_files: list):
+        self.search_from = search_from
+        self.depth_limit = depth_limit
+        self.use_ignore_files = use_ignore_files
+        self.search_in_archives = search_in_archives
+        self.excluded_files = excluded_files
+
+        # Set when the scan finished or failed
+        self.done = threading.Event()
+        # A dict with the scan and the cache file it was saved in, None if the scan failed or was cancelled
+        self.result = None
+
+    # Testing if the scan contains everything a search needs, with the same rules as for using a cache file
+    def covers(self, search_from: str, depth_limit: int, use_ignore_files: bool, search_in_archives: bool,
+               excluded_files) -> bool:
+        return ((search_from == self.search_from or search_from.startswith(os.path.join(self.search_from, ""))) and
+                depth_limit == self.depth_limit and
+                use_ignore_files == self.use_ignore_files and
+                search_in_archives == self.search_in_archives and
+                all(excluded_files.match(excluded_file) for excluded_file in self.excluded_files))
+
+    # Waiting for the result, cancel_token is a FF_Cancel.CancelToken
+    def wait(self, cancel_token):
+        while not self.done.wait(WAIT_INTERVAL):
+            cancel_token.check()
+        return self.result
+
+
+# Getting a running scan, which covers the search, or registering a new one if there is none.
+# Returns the scan and True if the caller has to scan (is the leader)
+def find_or_start(search_from: str, depth_limit: int, use_ignore_files: bool, search_in_archives: bool,
+                  excluded_files, scanned_excluded_files: list) -> (SharedScan, bool):
+    with IN_FLIGHT_SCANS_LOCK:
+        for shared_scan in IN_FLIGHT_SCANS:
+            if shared_scan.covers(search_from, depth_limit, use_ignore_files, search_in_archives, excluded_files):
+                # Debug
+                logging.info(f"Waiting for the running scan of {shared_scan.search_from}")
+                return shared_scan, False
+
+        shared_scan = SharedScan(search_from, depth_limit, use_ignore_files, search_in_archives,
+                                 scanned_excluded_files)
+        IN_FLIGHT_SCANS.append(shared_scan)
+        return shared_scan, True
+
+
+# Removing a scan and sending the result to the waiting searches, only the first call counts
+def finish(shared_scan: SharedScan, result: dict | None = None):
+    with IN_FLIGHT_SCANS_LOCK:
+        if shared_scan in IN_FLIGHT_SCANS:
+            IN_FLIGHT_SCANS.remove(shared_scan)
+        if shared_scan.done.is_set():
+            return
+        shared_scan.result = result
+        shared_scan.done.set()
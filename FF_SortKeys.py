@@ -0,0 +1,159 @@
+# This source file is a part of File Find made by Pixel-Master
+#
+# Copyright 2022-2025 Pixel-Master
+#
+# This software is licensed under the "GPLv3" License as described in the "LICENSE" file,
+# which should be included with this package. The terms are also available at
+# http://www.gnu.org/licenses/gpl-3.0.html
+
+# This file contains the cache of the sort keys, shared by the search results, duplicated and compare windows
+
+# Imports
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from json import load
+
+# Projects Libraries
+import FF_Files
+import FF_Index
+
+# Reading the size and dates of files is mostly waiting for the disk, so more threads than cores are used
+READ_THREADS = 16
+# Number of paths read by a thread at once
+READ_CHUNK_SIZE = 1000
+
+# The number of key caches kept, the oldest one is removed first
+MAX_KEY_CACHES = 8
+
+# The key caches by the cache file of the search
+KEY_CACHES = {}
+
+
+# The sizes and dates of paths, taken from the range indexes of the search (see FF_Index.read_range_values()),
+# so sorting the results doesn't need to read the files again
+class SortKeyCache:
+    def __init__(self, cache_file: str | None = None):
+        # A tuple of (size, date modified, date created) by path
+        self.values = {}
+        # Sizes of folders and links, as they aren't in the range indexes
+        self.calculated_sizes = {}
+        # The cache file, from which missing values are loaded the first time
+        self.cache_file = cache_file
+
+    # Adding the values of the range indexes of a search, which refer to the positions in path_list
+    def add_range_indexes(self, path_list: list, range_indexes: dict, paths):
+        sizes, m_times, c_times = (range_indexes[field].values_by_position()
+                                   for field in FF_Index.RANGE_INDEX_FIELDS)
+        for path_id, path in enumerate(path_list):
+            if path in paths:
+                self.values[path] = (sizes[path_id], m_times[path_id], c_times[path_id])
+
+    # Adding the size of a folder, if it is already known (for example from the directory aggregates)
+    def add_size(self, path: str, size: int):
+        self.calculated_sizes[path] = size
+
+    # Making sure, that the values of all paths are cached.
+    # The values are taken from the cache file first and the remaining paths are read in parallel.
+    # The cancel_token (see FF_Cancel.CancelToken) is checked after every chunk
+    def read_missing(self, paths, cancel_token=None):
+        missing_paths = [path for path in paths if path not in self.values]
+        if not missing_paths:
+            return
+
+        if self.cache_file is not None:
+            try:
+                with open(self.cache_file) as cache_file:
+                    cached_content = load(cache_file)
+                self.add_range_indexes(cached_content["found_path_set"],
+                                       FF_Index.load_range_indexes(cached_content["range_indexes"]),
+                                       set(missing_paths))
+                del cached_content
+                missing_paths = [path for path in missing_paths if path not in self.values]
+            except (OSError, ValueError, KeyError) as error:
+                # Debug
+                logging.debug(f"Could not load the sort keys from {self.cache_file}: {error}")
+            # Only trying once
+            self.cache_file = None
+
+        if missing_paths:
+            # Debug
+            logging.debug(f"Reading the sizes and dates of {len(missing_paths)} paths...")
+
+            chunks = [missing_paths[chunk_start:chunk_start + READ_CHUNK_SIZE]
+                      for chunk_start in range(0, len(missing_paths), READ_CHUNK_SIZE)]
+            with ThreadPoolExecutor(READ_THREADS) as executor:
+                for chunk, chunk_values in zip(chunks, executor.map(
+                        lambda read_chunk: [FF_Index.read_range_values(path) for path in read_chunk], chunks)):
+                    self.values.update(zip(chunk, chunk_values))
+                    if cancel_token is not None and cancel_token.is_cancelled():
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        cancel_token.check()
+
+    # Getting the values of a single path, reading them if they aren't cached
+    def get_values(self, path: str) -> tuple:
+        try:
+            return self.values[path]
+        except KeyError:
+            path_values = self.values[path] = FF_Index.read_range_values(path)
+            return path_values
+
+    # The keys, like FF_Files.get_file_size() a size of -1 means that the file doesn't exist
+    def size(self, path: str):
+        size = self.get_values(path)[0]
+        if size == -1:
+            # Folders, links and special files
+            try:
+                return self.calculated_sizes[path]
+            except KeyError:
+                size = self.calculated_sizes[path] = FF_Files.get_file_size(path)
+        elif size == FF_Index.MISSING_VALUE:
+            return -1
+        return int(size)
+
+    def m_time(self, path: str):
+        m_time = self.get_values(path)[1]
+        return -1 if m_time == FF_Index.MISSING_VALUE else m_time
+
+    # (On Linux this currently returns the date of the last change of the metadata,
+    # because it's impossible to access with pure python)
+    def c_time(self, path: str):
+        c_time = self.get_values(path)[2]
+        return -1 if c_time == FF_Index.MISSING_VALUE else c_time
+
+    # Getting the key function for a sorting mode, the values of all paths are read first if needed
+    def sort_key(self, sort_by: str, paths):
+        if sort_by == "File Name":
+            return os.path.basename
+        elif sort_by == "Path":
+            return str.lower
+
+        self.read_missing(paths)
+        if sort_by == "File Size":
+            return self.size
+        elif sort_by == "Date Modified":
+            return self.m_time
+        elif sort_by == "Date Created":
+            return self.c_time
+        else:
+            raise ValueError(f"Unknown sorting mode: {sort_by}")
+
+
+# Getting the key cache of a search, creating it if it doesn't exist
+def get_key_cache(cache_file: str) -> SortKeyCache:
+    try:
+        return KEY_CACHES[cache_file]
+    except KeyError:
+        return set_key_cache(cache_file, SortKeyCache(cache_file))
+
+
+# Saving the key cache of a search, replacing the one of an older search with the same cache file
+def set_key_cache(cache_file: str, key_cache: SortKeyCache) -> SortKeyCache:
+    KEY_CACHES.pop(cache_file, None)
+    KEY_CACHES[cache_file] = key_cache
+
+    # Removing the oldest key caches
+    while len(KEY_CACHES) > MAX_KEY_CACHES:
+        del KEY_CACHES[next(iter(KEY_CACHES))]
+
+    return key_cache
@@ -13,6 +13,7 @@ import logging
 import gc
 import os
 import sys
+from multiprocessing import freeze_support
 from sys import platform
 
 # PySide6 Gui Imports
@@ -21,12 +22,24 @@ from PySide6.QtGui import QFileOpenEvent, QIcon
 from PySide6.QtWidgets import QApplication
 
 # Projects Library
+import FF_CLI
 import FF_Files
 import FF_Additional_UI
 import FF_Main_UI
 import FF_Search
+import FF_Server
 
 if __name__ == "__main__":
+    # Needed for the processes used by the content search, when File Find is built as an executable
+    freeze_support()
+
+    # Searching from the command-line, without the user-interface
+    if "--cli" in sys.argv[1:]:
+        sys.exit(FF_CLI.main([argument for argument in sys.argv[1:] if argument != "--cli"]))
+    # Running the query server, which answers searches of the command-line
+    if "--server" in sys.argv[1:]:
+        sys.exit(FF_Server.main([argument for argument in sys.argv[1:] if argument != "--server"]))
+
     # Setup Logging
     logging.basicConfig(level=logging.DEBUG,
                         format="File Find [%(pathname)s] at %(asctime)s, %(levelname)s: %(message)s",